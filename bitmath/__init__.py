@@ -34,58 +34,44 @@ http://physics.nist.gov/cuu/Units/binary.html
 
 decimal and binary prefixes:
 man 7 units (from the Linux Documentation Project 'man-pages' package)
-
-
-BEFORE YOU GET HASTY WITH EXCLUDING CODE FROM COVERAGE: If you
-absolutely need to skip code coverage because of a strange Python 2.x
-vs 3.x thing, use the fancy environment substitution stuff from the
-.coverage RC file. In review:
-
-* If you *NEED* to skip a statement because of Python 2.x issues add the following::
-
-      # pragma: PY2X no cover
-
-* If you *NEED* to skip a statement because of Python 3.x issues add the following::
-
-      # pragma: PY3X no cover
-
-In this configuration, statements which are skipped in 2.x are still
-covered in 3.x, and the reverse holds true for tests skipped in 3.x.
 """
 
-from __future__ import print_function
+from __future__ import print_function, division
 
-import argparse
+import bisect
+import collections
 import contextlib
-import fnmatch
+import contextvars
+import functools
 import math
 import numbers
+import operator
 import os
 import os.path
-import platform
+import re
+import string
 import sys
+import time
 
-# For device capacity reading in query_device_capacity(). Only supported
-# on posix systems for now. Will be addressed in issue #52 on GitHub.
-if os.name == 'posix':
-    import stat
-    import fcntl
-    import struct
+# Modules only the command line tool, the filesystem helpers or
+# query_device_capacity() need (argparse, concurrent.futures, fnmatch,
+# heapq, platform, stat, and the posix only fcntl and struct) are
+# imported by the functions which use them, so that ``import bitmath``
+# stays quick. See tests/benchmarks/bench_import.py.
 
 
 __all__ = ['Bit', 'Byte', 'KiB', 'MiB', 'GiB', 'TiB', 'PiB', 'EiB',
            'kB', 'MB', 'GB', 'TB', 'PB', 'EB', 'ZB', 'YB', 'Kib',
            'Mib', 'Gib', 'Tib', 'Pib', 'Eib', 'kb', 'Mb', 'Gb', 'Tb',
-           'Pb', 'Eb', 'Zb', 'Yb', 'getsize', 'listdir', 'format',
+           'Pb', 'Eb', 'Zb', 'Yb', 'convert', 'getsize', 'listdir', 'du', 'largest', 'format',
            'format_string', 'format_plural', 'parse_string', 'parse_string_unsafe',
+           'parse_many', 'iterparse', 'parse_cache_info', 'parse_cache_clear',
+           'parse_cache_resize', 'PARSE_CACHE_SIZE', 'Formatter',
+           'format_many', 'SizeHistogram', 'query_all_device_capacities',
+           'fs_usage', 'all_mounts_usage', 'FsUsage',
            'ALL_UNIT_TYPES', 'NIST', 'NIST_PREFIXES', 'NIST_STEPS',
            'SI', 'SI_PREFIXES', 'SI_STEPS']
 
-# Python 3.x compat
-if sys.version > '3':
-    long = int  # pragma: PY2X no cover
-    unicode = str  # pragma: PY2X no cover
-
 #: A list of all the valid prefix unit types. Mostly for reference,
 #: also used by the CLI tool as valid types
 ALL_UNIT_TYPES = ['Bit', 'Byte', 'kb', 'kB', 'Mb', 'MB', 'Gb', 'GB', 'Tb',
@@ -152,6 +138,21 @@ format_string = "{value} {unit}"
 #: Pluralization behavior
 format_plural = False
 
+# The settings of the innermost bitmath.format() context manager, as
+# a (fmt_str, plural, bestprefix) tuple, or None outside of one. A
+# context variable, so that every thread and every asyncio task sees
+# only its own. A fmt_str of None, or plural of False, means the
+# module level default above is used.
+_format_context = contextvars.ContextVar('bitmath_format', default=None)
+
+
+def _is_fraction(value):
+    """True if `value` is a fractions.Fraction. Checked without importing
+:py:mod:`fractions` (and :py:mod:`decimal` with it) for everyone: there
+can't be a Fraction unless the caller imported it already."""
+    fractions = sys.modules.get('fractions')
+    return fractions is not None and isinstance(value, fractions.Fraction)
+
 
 def os_name():
     # makes unittesting platform specific code easier
@@ -173,8 +174,45 @@ def capitalize_first(s):
 class Bitmath(object):
     """The base class for all the other prefix classes"""
 
-    # All the allowed input types
-    valid_types = (int, float, long)
+    # Instances store nothing but their size, measured in bits. What
+    # describes the unit itself (base, power, names) is the same for
+    # every instance of a class, so that lives on the class instead.
+    #
+    # The number of bits is kept exact whenever the input was exact:
+    # an int (or Fraction) value gives an int (or Fraction) number of
+    # bits. Only float inputs are stored as floats.
+    __slots__ = ('_bit_value',)
+
+    # All the allowed input types. fractions.Fraction is allowed too,
+    # see _is_fraction()
+    valid_types = (int, float)
+
+    # Description of the unit. Every prefix class sets these. Byte and
+    # Bit also set _fundamental_bits, the number of bits in one
+    # Byte/Bit.
+    #
+    # `_base` is the numeric base which when raised to `_power` is
+    # equivalent to 1 unit of the corresponding prefix. I.e., base=2,
+    # power=10 represents 2^10, which is the NIST Binary Prefix for 1
+    # Kibibyte. Likewise, for the SI prefix classes `_base` will be 10,
+    # and the `_power` for the Kilobyte is 3.
+    _base = None
+    _power = None
+    _name_singular = None
+    _name_plural = None
+    _fundamental_bits = None
+
+    # Computed by __init_subclass__ from the above. The number of
+    # Bytes/Bits in 1 unit, and the number of bits in 1 unit.
+    _unit_value = None
+    _unit_bits = None
+
+    def __init_subclass__(cls, **kwargs):
+        """Compute the per-unit constants once, when a class is defined,
+rather than every time an instance is created."""
+        super(Bitmath, cls).__init_subclass__(**kwargs)
+        cls._unit_value = cls._base ** cls._power
+        cls._unit_bits = cls._unit_value * cls._fundamental_bits
 
     def __init__(self, value=0, bytes=None, bits=None):
         """Instantiate with `value` by the unit, in plain bytes, or
@@ -204,64 +242,80 @@ only setting bits: assert value == 0 and bytes is None
         if _raise:
             raise ValueError("Only one parameter of: value, bytes, or bits is allowed")
 
-        self._do_setup()
+        if self._unit_bits is None:
+            raise NotImplementedError("The base 'bitmath.Bitmath' class can not be used directly")
+
         if bytes:
-            # We were provided with the fundamental base unit, no need
-            # to normalize
-            self._byte_value = bytes
-            self._bit_value = bytes * 8.0
+            # We were *ALMOST* given the fundamental unit. Translate
+            # it into bits.
+            _set_bit_value(self, self._check_number(bytes) * 8)
         elif bits:
-            # We were *ALMOST* given the fundamental base
-            # unit. Translate it into the fundamental unit then
-            # normalize.
-            self._byte_value = bits / 8.0
-            self._bit_value = bits
+            # We were provided with the fundamental unit, no need to
+            # normalize
+            _set_bit_value(self, self._check_number(bits))
         else:
             # We were given a value representative of this *prefix
-            # unit*. We need to normalize it into the number of bytes
+            # unit*. We need to normalize it into the number of bits
             # it represents.
             self._norm(value)
 
-        # We have the fundamental unit figured out. Set the 'pretty' unit
-        self._set_prefix_value()
+    @classmethod
+    def _from_bits_unchecked(cls, bits):
+        """Internal constructor. Return a new instance of ``cls`` holding
+``bits`` bits.
+
+This skips the argument checking and normalization done in
+``__init__``, so it is only meant for callers which already have a
+valid number of bits in hand: the arithmetic operators, the ``to_*``
+converters, :meth:`from_other`, :meth:`best_prefix`, etc.
+        """
+        inst = object.__new__(cls)
+        _set_bit_value(inst, bits)
+        return inst
 
-    def _set_prefix_value(self):
-        self.prefix_value = self._to_prefix_value(self._byte_value)
+    ##################################################################
+    # Instances are immutable. That makes them safe to hash, and to
+    # share (see the parse cache).
 
-    def _to_prefix_value(self, value):
-        """Return the number of bits/bytes as they would look like if we
-converted *to* this unit"""
-        return value / float(self._unit_value)
+    def __setattr__(self, name, value):
+        raise AttributeError("bitmath instances are immutable, can not set '%s'" % name)
 
-    def _setup(self):
-        raise NotImplementedError("The base 'bitmath.Bitmath' class can not be used directly")
+    def __delattr__(self, name):
+        raise AttributeError("bitmath instances are immutable, can not delete '%s'" % name)
 
-    def _do_setup(self):
-        """Setup basic parameters for this class.
+    def __reduce__(self):
+        # The default pickle/copy support would restore the _bit_value
+        # slot through setattr()
+        return (type(self), (0, None, self._bit_value))
 
-`base` is the numeric base which when raised to `power` is equivalent
-to 1 unit of the corresponding prefix. I.e., base=2, power=10
-represents 2^10, which is the NIST Binary Prefix for 1 Kibibyte.
+    def __copy__(self):
+        return self
 
-Likewise, for the SI prefix classes `base` will be 10, and the `power`
-for the Kilobyte is 3.
-"""
-        (self._base, self._power, self._name_singular, self._name_plural) = self._setup()
-        self._unit_value = self._base ** self._power
+    def __deepcopy__(self, memo):
+        return self
 
     def _norm(self, value):
-        """Normalize the input value into the fundamental unit for this prefix
-type.
+        """Normalize the input value into the fundamental unit (bits)
 
    :param number value: The input value to be normalized
    :raises ValueError: if the input value is not a type of real number
 """
-        if isinstance(value, self.valid_types):
-            self._byte_value = value * self._unit_value
-            self._bit_value = self._byte_value * 8.0
+        _set_bit_value(self, self._check_number(value) * self._unit_bits)
+
+    def _check_number(self, value):
+        """Return the input value as a number a bitmath instance can hold.
+Other integer types, numpy's for instance, are turned into ``int``.
+
+   :param number value: The input value to be checked
+   :raises ValueError: if the input value is not a type of real number
+"""
+        if isinstance(value, self.valid_types) or _is_fraction(value):
+            return value
+        elif isinstance(value, numbers.Integral):
+            return operator.index(value)
         else:
             raise ValueError("Initialization value '%s' is of an invalid type: %s. "
-                             "Must be one of %s" % (
+                             "Must be one of %s, <class 'fractions.Fraction'>" % (
                                  value,
                                  type(value),
                                  ", ".join(str(x) for x in self.valid_types)))
@@ -289,8 +343,15 @@ That leading ``0b`` is normal. That's how Python represents binary.
     #: The number of bits in an instance
     bits = property(lambda s: s._bit_value)
 
-    #: The number of bytes in an instance
-    bytes = property(lambda s: s._byte_value)
+    @property
+    def bytes(self):
+        """The number of bytes in an instance. This is an ``int`` when the
+instance holds a whole number of bytes and was created from exact
+(integer) input."""
+        bits = self._bit_value
+        if type(bits) is int and not bits & 7:  # pylint: disable=unidiomatic-typecheck
+            return bits >> 3
+        return bits / 8
 
     #: The mathematical power of an instance
     power = property(lambda s: s._power)
@@ -325,12 +386,16 @@ For example:
    >>> Gb(2).unit == 'Gbs'
 
         """
-        global format_plural
-
         if self.prefix_value == 1:
             # If it's a '1', return it singular, no matter what
             return self._name_singular
-        elif format_plural:
+
+        context = _format_context.get()
+        if context is None or context[1] is None:
+            plural = format_plural
+        else:
+            plural = context[1]
+        if plural:
             # Pluralization requested
             return self._name_plural
         else:
@@ -364,8 +429,19 @@ For example:
         """
         return self._name_singular
 
-    #: The "prefix" value of an instance
-    value = property(lambda s: s.prefix_value)
+    @property
+    def prefix_value(self):
+        """The "prefix" value of an instance, computed from the number of
+bits when it is read. Always a ``float``, use :attr:`bits` or
+:attr:`bytes` for the exact size."""
+        value = self._bit_value / self._unit_bits
+        if type(value) is float:  # pylint: disable=unidiomatic-typecheck
+            return value
+        # Fraction input
+        return float(value)
+
+    #: Alias for :attr:`prefix_value`
+    value = prefix_value
 
     @classmethod
     def from_other(cls, item):
@@ -392,7 +468,7 @@ instantiate the class ahead of time.
 
         """
         if isinstance(item, Bitmath):
-            return cls(bits=item.bits)
+            return cls._from_bits_unchecked(item.bits)
         else:
             raise ValueError("The provided items must be a valid bitmath class: %s" %
                              str(item.__class__))
@@ -405,32 +481,25 @@ instantiate the class ahead of time.
     def __repr__(self):
         """Representation of this object as you would expect to see in an
 interpreter"""
-        global _FORMAT_REPR
-        return self.format(_FORMAT_REPR)
+        return _REPR_FORMATTER.format(self)
 
     def __str__(self):
         """String representation of this object"""
-        global format_string
-        return self.format(format_string)
+        context = _format_context.get()
+        if context is None:
+            return _compile_format(format_string).format(self)
+
+        fmt_str, _, bestprefix = context
+        if bestprefix:
+            return self.best_prefix().format(fmt_str or format_string)
+        return self.format(fmt_str or format_string)
 
     def format(self, fmt):
         """Return a representation of this instance formatted with user
-supplied syntax"""
-        _fmt_params = {
-            'base': self.base,
-            'bin': self.bin,
-            'binary': self.binary,
-            'bits': self.bits,
-            'bytes': self.bytes,
-            'power': self.power,
-            'system': self.system,
-            'unit': self.unit,
-            'unit_plural': self.unit_plural,
-            'unit_singular': self.unit_singular,
-            'value': self.value
-        }
-
-        return fmt.format(**_fmt_params)
+supplied syntax. `fmt` may be a format string or a :class:`Formatter`."""
+        if not isinstance(fmt, Formatter):
+            fmt = _compile_format(fmt)
+        return fmt.format(self)
 
     ##################################################################
     # Guess the best human-readable prefix unit for representation
@@ -448,282 +517,119 @@ Base-case, does it need converting?
 If the instance is less than one Byte, return the instance as a Bit
 instance.
 
-Else, begin by recording the unit system the instance is defined
-by. This determines which steps (NIST_STEPS/SI_STEPS) we iterate over.
-
-If the instance is not already a ``Byte`` instance, convert it to one.
+Else, take the whole number of bytes in the instance (ignoring the
+sign). This is exact for every instance, no matter how large, so
+there is no rounding at the unit boundaries.
 
-NIST units step up by powers of 1024, SI units step up by powers of
-1000.
+NIST units step up by powers of 1024, that is, by 10 binary digits.
+The number of binary digits in the byte count (int.bit_length())
+divided by 10 picks the prefix:
 
-Take integer value of the log(base=STEP_POWER) of the instance's byte
-value. E.g.:
-
-    >>> int(math.log(Gb(100).bytes, 1000))
+    >>> (Gb(100).bytes.bit_length() - 1) // 10
     3
 
-This will return a value >= 0. The following determines the 'best
-prefix unit' for representation:
+SI units step up by powers of 1000. The byte count is looked up in the
+list of the sizes where each SI prefix starts (bisect).
 
-* result == 0, best represented as a Byte
-* result >= len(SYSTEM_STEPS), best represented as an Exbi/Exabyte
-* 0 < result < len(SYSTEM_STEPS), best represented as SYSTEM_PREFIXES[result-1]
+Either way the result, a value >= 0, indexes the units of that system,
+from Byte up:
 
+* result == 0, best represented as a Byte
+* result >= the number of prefixes, best represented as an
+  Exbi/Yottabyte (the largest unit available)
         """
 
+        bits = self._bit_value
+
         # Use absolute value so we don't return Bit's for *everything*
         # less than Byte(1). From github issue #55
-        if abs(self) < Byte(1):
-            return Bit.from_other(self)
-        else:
-            if type(self) is Byte:  # pylint: disable=unidiomatic-typecheck
-                _inst = self
-            else:
-                _inst = Byte.from_other(self)
+        if -8 < bits < 8:
+            return Bit._from_bits_unchecked(bits)
 
         # Which table to consult? Was a preferred system provided?
         if system is None:
-            # No preference. Use existing system
-            if self.system == 'NIST':
-                _STEPS = NIST_PREFIXES
-                _BASE = 1024
-            elif self.system == 'SI':
-                _STEPS = SI_PREFIXES
-                _BASE = 1000
-            # Anything else would have raised by now
+            # No preference. Use existing system. The values of the
+            # NIST and SI constants are the bases of their units
+            system = self._base
+        elif system != NIST and system != SI:
+            raise ValueError("Invalid value given for 'system' parameter."
+                             " Must be one of NIST or SI")
+
+        units = _BEST_PREFIX_UNITS[system]
+        nbytes = int(abs(bits)) >> 3
+        if system == NIST:
+            index = (nbytes.bit_length() - 1) // 10
         else:
-            # Preferred system provided.
-            if system == NIST:
-                _STEPS = NIST_PREFIXES
-                _BASE = 1024
-            elif system == SI:
-                _STEPS = SI_PREFIXES
-                _BASE = 1000
-            else:
-                raise ValueError("Invalid value given for 'system' parameter."
-                                 " Must be one of NIST or SI")
+            index = bisect.bisect_right(_SI_PREFIX_BYTES, nbytes)
 
-        # Index of the string of the best prefix in the STEPS list
-        _index = int(math.log(abs(_inst.bytes), _BASE))
-
-        # Recall that the log() function returns >= 0. This doesn't
-        # map to the STEPS list 1:1. That is to say, 0 is handled with
-        # special care. So if the _index is 1, we actually want item 0
-        # in the list.
-
-        if _index == 0:
-            # Already a Byte() type, so return it.
-            return _inst
-        elif _index >= len(_STEPS):
+        if index >= len(units):
             # This is a really big number. Use the biggest prefix we've got
-            _best_prefix = _STEPS[-1]
-        elif 0 < _index < len(_STEPS):
-            # There is an appropriate prefix unit to represent this
-            _best_prefix = _STEPS[_index - 1]
-
-        _conversion_method = getattr(
-            self,
-            'to_%sB' % _best_prefix)
-
-        return _conversion_method()
-
-    ##################################################################
-
-    def to_Bit(self):
-        return Bit(self._bit_value)
-
-    def to_Byte(self):
-        return Byte(self._byte_value / float(NIST_STEPS['Byte']))
-
-    # Properties
-    Bit = property(lambda s: s.to_Bit())
-    Byte = property(lambda s: s.to_Byte())
-
-    ##################################################################
-
-    def to_KiB(self):
-        return KiB(bits=self._bit_value)
-
-    def to_Kib(self):
-        return Kib(bits=self._bit_value)
-
-    def to_kB(self):
-        return kB(bits=self._bit_value)
-
-    def to_kb(self):
-        return kb(bits=self._bit_value)
-
-    # Properties
-    KiB = property(lambda s: s.to_KiB())
-    Kib = property(lambda s: s.to_Kib())
-    kB = property(lambda s: s.to_kB())
-    kb = property(lambda s: s.to_kb())
-
-    ##################################################################
-
-    def to_MiB(self):
-        return MiB(bits=self._bit_value)
-
-    def to_Mib(self):
-        return Mib(bits=self._bit_value)
-
-    def to_MB(self):
-        return MB(bits=self._bit_value)
-
-    def to_Mb(self):
-        return Mb(bits=self._bit_value)
-
-    # Properties
-    MiB = property(lambda s: s.to_MiB())
-    Mib = property(lambda s: s.to_Mib())
-    MB = property(lambda s: s.to_MB())
-    Mb = property(lambda s: s.to_Mb())
-
-    ##################################################################
-
-    def to_GiB(self):
-        return GiB(bits=self._bit_value)
-
-    def to_Gib(self):
-        return Gib(bits=self._bit_value)
-
-    def to_GB(self):
-        return GB(bits=self._bit_value)
-
-    def to_Gb(self):
-        return Gb(bits=self._bit_value)
-
-    # Properties
-    GiB = property(lambda s: s.to_GiB())
-    Gib = property(lambda s: s.to_Gib())
-    GB = property(lambda s: s.to_GB())
-    Gb = property(lambda s: s.to_Gb())
-
-    ##################################################################
-
-    def to_TiB(self):
-        return TiB(bits=self._bit_value)
-
-    def to_Tib(self):
-        return Tib(bits=self._bit_value)
-
-    def to_TB(self):
-        return TB(bits=self._bit_value)
-
-    def to_Tb(self):
-        return Tb(bits=self._bit_value)
-
-    # Properties
-    TiB = property(lambda s: s.to_TiB())
-    Tib = property(lambda s: s.to_Tib())
-    TB = property(lambda s: s.to_TB())
-    Tb = property(lambda s: s.to_Tb())
-
-    ##################################################################
-
-    def to_PiB(self):
-        return PiB(bits=self._bit_value)
-
-    def to_Pib(self):
-        return Pib(bits=self._bit_value)
-
-    def to_PB(self):
-        return PB(bits=self._bit_value)
-
-    def to_Pb(self):
-        return Pb(bits=self._bit_value)
-
-    # Properties
-    PiB = property(lambda s: s.to_PiB())
-    Pib = property(lambda s: s.to_Pib())
-    PB = property(lambda s: s.to_PB())
-    Pb = property(lambda s: s.to_Pb())
+            index = -1
+        return units[index]._from_bits_unchecked(bits)
 
     ##################################################################
-
-    def to_EiB(self):
-        return EiB(bits=self._bit_value)
-
-    def to_Eib(self):
-        return Eib(bits=self._bit_value)
-
-    def to_EB(self):
-        return EB(bits=self._bit_value)
-
-    def to_Eb(self):
-        return Eb(bits=self._bit_value)
-
-    # Properties
-    EiB = property(lambda s: s.to_EiB())
-    Eib = property(lambda s: s.to_Eib())
-    EB = property(lambda s: s.to_EB())
-    Eb = property(lambda s: s.to_Eb())
-
-    ##################################################################
-    # The SI units go beyond the NIST units. They also have the Zetta
-    # and Yotta prefixes.
-
-    def to_ZB(self):
-        return ZB(bits=self._bit_value)
-
-    def to_Zb(self):
-        return Zb(bits=self._bit_value)
-
-    # Properties
-    ZB = property(lambda s: s.to_ZB())
-    Zb = property(lambda s: s.to_Zb())
-
-    ##################################################################
-
-    def to_YB(self):
-        return YB(bits=self._bit_value)
-
-    def to_Yb(self):
-        return Yb(bits=self._bit_value)
-
-    #: A new object representing this instance as a Yottabyte
-    YB = property(lambda s: s.to_YB())
-    Yb = property(lambda s: s.to_Yb())
+    # The to_Bit(), ..., to_Yb() converters and the Bit, ..., Yb
+    # properties are generated from _CONVERSION_FACTORS below, once
+    # all of the unit classes exist.
 
     ##################################################################
     # Rich comparison operations
     ##################################################################
 
     def __lt__(self, other):
-        if isinstance(other, numbers.Number):
+        if isinstance(other, Bitmath):
+            return self._bit_value < other._bit_value
+        elif isinstance(other, numbers.Number):
             return self.prefix_value < other
-        else:
-            return self._byte_value < other.bytes
+        return NotImplemented
 
     def __le__(self, other):
-        if isinstance(other, numbers.Number):
+        if isinstance(other, Bitmath):
+            return self._bit_value <= other._bit_value
+        elif isinstance(other, numbers.Number):
             return self.prefix_value <= other
-        else:
-            return self._byte_value <= other.bytes
+        return NotImplemented
 
     def __eq__(self, other):
-        if isinstance(other, numbers.Number):
+        if isinstance(other, Bitmath):
+            return self._bit_value == other._bit_value
+        elif isinstance(other, numbers.Number):
             return self.prefix_value == other
-        else:
-            return self._byte_value == other.bytes
+        return NotImplemented
 
     def __ne__(self, other):
-        if isinstance(other, numbers.Number):
+        if isinstance(other, Bitmath):
+            return self._bit_value != other._bit_value
+        elif isinstance(other, numbers.Number):
             return self.prefix_value != other
-        else:
-            return self._byte_value != other.bytes
+        return NotImplemented
 
     def __gt__(self, other):
-        if isinstance(other, numbers.Number):
+        if isinstance(other, Bitmath):
+            return self._bit_value > other._bit_value
+        elif isinstance(other, numbers.Number):
             return self.prefix_value > other
-        else:
-            return self._byte_value > other.bytes
+        return NotImplemented
 
     def __ge__(self, other):
-        if isinstance(other, numbers.Number):
+        if isinstance(other, Bitmath):
+            return self._bit_value >= other._bit_value
+        elif isinstance(other, numbers.Number):
             return self.prefix_value >= other
-        else:
-            return self._byte_value >= other.bytes
+        return NotImplemented
+
+    def __hash__(self):
+        """Instances which compare equal hash the same, no matter their
+unit. I.e., ``hash(KiB(1)) == hash(Byte(1024))``. The hash is that of
+the number of bits, and Python hashes equal ints, floats and Fractions
+the same way.
+
+Note that comparing an instance to a plain *number* compares the
+prefix value, not the size, so ``KiB(1) == 1`` even though their
+hashes differ. Don't mix bitmath instances and plain numbers as keys
+of the same dict or set.
+        """
+        return hash(self._bit_value)
 
     ##################################################################
     # Basic math operations
@@ -749,13 +655,16 @@ is to be supported.object.__complex__(self)
 - bm + num = num
 - num + bm = num (see radd)
 """
-        if isinstance(other, numbers.Number):
+        # Test for bitmath operands first, isinstance() against the
+        # numbers.Number ABC is much slower
+        if isinstance(other, Bitmath):
+            # bm + bm
+            total_bits = self._bit_value + other._bit_value
+            return type(self)._from_bits_unchecked(total_bits)
+        elif isinstance(other, numbers.Number):
             # bm + num
             return other + self.value
-        else:
-            # bm + bm
-            total_bytes = self._byte_value + other.bytes
-            return (type(self))(bytes=total_bytes)
+        return NotImplemented
 
     def __sub__(self, other):
         """Subtraction: Supported operations with result types:
@@ -764,13 +673,14 @@ is to be supported.object.__complex__(self)
 - bm - num = num
 - num - bm = num (see rsub)
 """
-        if isinstance(other, numbers.Number):
+        if isinstance(other, Bitmath):
+            # bm - bm
+            total_bits = self._bit_value - other._bit_value
+            return type(self)._from_bits_unchecked(total_bits)
+        elif isinstance(other, numbers.Number):
             # bm - num
             return self.value - other
-        else:
-            # bm - bm
-            total_bytes = self._byte_value - other.bytes
-            return (type(self))(bytes=total_bytes)
+        return NotImplemented
 
     def __mul__(self, other):
         """Multiplication: Supported operations with result types:
@@ -779,15 +689,16 @@ is to be supported.object.__complex__(self)
 - bm * num = bm
 - num * bm = num (see rmul)
 """
-        if isinstance(other, numbers.Number):
-            # bm * num
-            result = self._byte_value * other
-            return (type(self))(bytes=result)
-        else:
+        if isinstance(other, Bitmath):
             # bm1 * bm2
             _other = other.value * other.base ** other.power
             _self = self.prefix_value * self._base ** self._power
-            return (type(self))(bytes=_other * _self)
+            return type(self)._from_bits_unchecked(_other * _self * 8)
+        elif isinstance(other, numbers.Number):
+            # bm * num
+            result = self._bit_value * other
+            return type(self)._from_bits_unchecked(result)
+        return NotImplemented
 
     """The division operator (/) is implemented by these methods. The
 __truediv__() method is used when __future__.division is in effect,
@@ -802,13 +713,14 @@ context; TypeError will be raised instead."""
 - bm / num = bm
 - num / bm = num (see rdiv)
 """
-        if isinstance(other, numbers.Number):
-            # bm / num
-            result = self._byte_value / other
-            return (type(self))(bytes=result)
-        else:
+        if isinstance(other, Bitmath):
             # bm1 / bm2
-            return self._byte_value / float(other.bytes)
+            return self._bit_value / other._bit_value
+        elif isinstance(other, numbers.Number):
+            # bm / num
+            result = self._bit_value / other
+            return type(self)._from_bits_unchecked(result)
+        return NotImplemented
 
     def __truediv__(self, other):
         # num / bm
@@ -863,16 +775,15 @@ RTYPE. E.g., 3 * MiB(3), or 10 / GB(42)
         return other / float(self.value)
 
     """Called to implement the built-in functions complex(), int(),
-long(), and float(). Should return a value of the appropriate type.
+and float(). Should return a value of the appropriate type.
 
 If one of those methods does not support the operation with the
 supplied arguments, it should return NotImplemented.
 
-For bitmath purposes, these methods return the int/long/float
+For bitmath purposes, these methods return the int/float
 equivalent of the this instances prefix Unix value. That is to say:
 
     - int(KiB(3.336)) would return 3
-    - long(KiB(3.336)) would return 3L
     - float(KiB(3.336)) would return 3.336
 """
 
@@ -880,10 +791,6 @@ equivalent of the this instances prefix Unix value. That is to say:
         """Return this instances prefix unit as an integer"""
         return int(self.prefix_value)
 
-    def __long__(self):
-        """Return this instances prefix unit as a long integer"""
-        return long(self.prefix_value)  # pragma: PY3X no cover
-
     def __float__(self):
         """Return this instances prefix unit as a floating point number"""
         return float(self.prefix_value)
@@ -896,17 +803,16 @@ equivalent of the this instances prefix Unix value. That is to say:
         """Left shift, ex: 100 << 2
 
 A left shift by n bits is equivalent to multiplication by pow(2,
-n). A long integer is returned if the result exceeds the range of
-plain integers."""
+n)."""
         shifted = int(self.bits) << other
-        return type(self)(bits=shifted)
+        return type(self)._from_bits_unchecked(shifted)
 
     def __rshift__(self, other):
         """Right shift, ex: 100 >> 2
 
 A right shift by n bits is equivalent to division by pow(2, n)."""
         shifted = int(self.bits) >> other
-        return type(self)(bits=shifted)
+        return type(self)._from_bits_unchecked(shifted)
 
     def __and__(self, other):
         """"Bitwise and, ex: 100 & 2
@@ -914,7 +820,7 @@ A right shift by n bits is equivalent to division by pow(2, n)."""
 bitwise and". Each bit of the output is 1 if the corresponding bit
 of x AND of y is 1, otherwise it's 0."""
         andd = int(self.bits) & other
-        return type(self)(bits=andd)
+        return type(self)._from_bits_unchecked(andd)
 
     def __xor__(self, other):
         """Bitwise xor, ex: 100 ^ 2
@@ -923,7 +829,7 @@ Does a "bitwise exclusive or". Each bit of the output is the same
 as the corresponding bit in x if that bit in y is 0, and it's the
 complement of the bit in x if that bit in y is 1."""
         xord = int(self.bits) ^ other
-        return type(self)(bits=xord)
+        return type(self)._from_bits_unchecked(xord)
 
     def __or__(self, other):
         """Bitwise or, ex: 100 | 2
@@ -931,19 +837,19 @@ complement of the bit in x if that bit in y is 1."""
 Does a "bitwise or". Each bit of the output is 0 if the corresponding
 bit of x AND of y is 0, otherwise it's 1."""
         ord = int(self.bits) | other
-        return type(self)(bits=ord)
+        return type(self)._from_bits_unchecked(ord)
 
     ##################################################################
 
     def __neg__(self):
         """The negative version of this instance"""
-        return (type(self))(-abs(self.prefix_value))
+        return type(self)._from_bits_unchecked(-abs(self._bit_value))
 
     def __pos__(self):
-        return (type(self))(abs(self.prefix_value))
+        return type(self)._from_bits_unchecked(abs(self._bit_value))
 
     def __abs__(self):
-        return (type(self))(abs(self.prefix_value))
+        return type(self)._from_bits_unchecked(abs(self._bit_value))
 
     # def __invert__(self):
     #     """Called to implement the unary arithmetic operations (-, +, abs()
@@ -951,61 +857,199 @@ bit of x AND of y is 0, otherwise it's 1."""
     #     return NotImplemented
 
 
+# Bitmath.__setattr__ refuses all assignments. Instances are built by
+# setting the _bit_value slot through its descriptor directly.
+_set_bit_value = Bitmath._bit_value.__set__
+
+
+######################################################################
+# Formatting
+
+# The instance attributes a format string may refer to, and how to
+# get each of them
+_FORMAT_FIELDS = dict(
+    (name, getattr(Bitmath, name).fget) for name in (
+        'base', 'bin', 'binary', 'bits', 'bytes', 'power', 'system', 'unit',
+        'unit_plural', 'unit_singular', 'value'))
+
+# The attribute name at the start of a replacement field, as in
+# 'value' of '{value.real}' or '{value[0]}'
+_FIELD_NAME_RE = re.compile(r'[^.[]*')
+
+_string_formatter = string.Formatter()
+
+
+def _index_fields(fmt, names):
+    """Return `fmt` with the name of each field it refers to (including
+fields nested in format specs) replaced by the index of that name in
+the list `names`. New names are appended to `names`."""
+    parts = []
+    for literal, field_name, format_spec, conversion in _string_formatter.parse(fmt):
+        parts.append(literal.replace('{', '{{').replace('}', '}}'))
+        if field_name is None:
+            continue
+        name = _FIELD_NAME_RE.match(field_name).group()
+        if name not in names:
+            names.append(name)
+        parts.append('{%d%s' % (names.index(name), field_name[len(name):]))
+        if conversion:
+            parts.append('!' + conversion)
+        if format_spec:
+            parts.append(':' + _index_fields(format_spec, names))
+        parts.append('}')
+    return ''.join(parts)
+
+
+class Formatter(object):
+    """A format string for bitmath instances, parsed once so it can be
+reused for any number of instances.
+
+``fmt`` uses the same syntax as :meth:`Bitmath.format`. Only the
+instance attributes which ``fmt`` refers to are computed when an
+instance is formatted.
+
+   >>> fmt = bitmath.Formatter("{value:.2f} {unit}")
+   >>> fmt.format(bitmath.KiB(1.5))
+   '1.50 KiB'
+
+   :raises ValueError: if ``fmt`` is not a valid format string
+    """
+    __slots__ = ('fmt', 'fields', '_names', '_template', '_getters')
+
+    def __init__(self, fmt):
+        names = []
+        template = _index_fields(fmt, names)
+        #: The format string
+        self.fmt = fmt
+        #: The names of the fields ``fmt`` refers to
+        self.fields = frozenset(names)
+        self._names = tuple(names)
+        if all(name in _FORMAT_FIELDS for name in names):
+            # Fields are passed by position, that's quicker for
+            # str.format() to look up
+            self._template = template
+            self._getters = tuple(_FORMAT_FIELDS[name] for name in names)
+        else:
+            # Positional or unknown fields. Format by keyword, so they
+            # fail just the way str.format() fails
+            self._template = None
+            self._getters = tuple((name, _FORMAT_FIELDS[name])
+                                  for name in names if name in _FORMAT_FIELDS)
+
+    def format(self, instance):
+        """Return `instance` formatted with this format string"""
+        if self._template is not None:
+            return self._template.format(*[getter(instance) for getter in self._getters])
+        return self.fmt.format(**{name: getter(instance) for (name, getter) in self._getters})
+
+    __call__ = format
+
+    def __repr__(self):
+        return "Formatter(%r)" % (self.fmt,)
+
+
+# Bitmath.format() and str() compile each format string they see once
+_compile_format = functools.lru_cache(maxsize=256)(Formatter)
+
+_REPR_FORMATTER = Formatter(_FORMAT_REPR)
+
+
+def _get_formatter(fmt):
+    """Return a Formatter for `fmt`, a format string or a Formatter. For
+None, that's the format str() would use right now."""
+    if fmt is None:
+        context = _format_context.get()
+        fmt = (context is not None and context[0]) or format_string
+    if isinstance(fmt, Formatter):
+        return fmt
+    return _compile_format(fmt)
+
+
+def _format_plural():
+    """Is pluralization enabled right now?"""
+    context = _format_context.get()
+    if context is None or context[1] is None:
+        return format_plural
+    return context[1]
+
+
 ######################################################################
 # First, the bytes...
 
 class Byte(Bitmath):
     """Byte based types fundamentally operate on self._bit_value"""
-    def _setup(self):
-        return (2, 0, 'Byte', 'Bytes')
+    __slots__ = ()
+    _base = 2
+    _power = 0
+    _name_singular = 'Byte'
+    _name_plural = 'Bytes'
+    _fundamental_bits = 8
 
 ######################################################################
 # NIST Prefixes for Byte based types
 
 
 class KiB(Byte):
-    def _setup(self):
-        return (2, 10, 'KiB', 'KiBs')
+    __slots__ = ()
+    _base = 2
+    _power = 10
+    _name_singular = 'KiB'
+    _name_plural = 'KiBs'
 
 
 Kio = KiB
 
 
 class MiB(Byte):
-    def _setup(self):
-        return (2, 20, 'MiB', 'MiBs')
+    __slots__ = ()
+    _base = 2
+    _power = 20
+    _name_singular = 'MiB'
+    _name_plural = 'MiBs'
 
 
 Mio = MiB
 
 
 class GiB(Byte):
-    def _setup(self):
-        return (2, 30, 'GiB', 'GiBs')
+    __slots__ = ()
+    _base = 2
+    _power = 30
+    _name_singular = 'GiB'
+    _name_plural = 'GiBs'
 
 
 Gio = GiB
 
 
 class TiB(Byte):
-    def _setup(self):
-        return (2, 40, 'TiB', 'TiBs')
+    __slots__ = ()
+    _base = 2
+    _power = 40
+    _name_singular = 'TiB'
+    _name_plural = 'TiBs'
 
 
 Tio = TiB
 
 
 class PiB(Byte):
-    def _setup(self):
-        return (2, 50, 'PiB', 'PiBs')
+    __slots__ = ()
+    _base = 2
+    _power = 50
+    _name_singular = 'PiB'
+    _name_plural = 'PiBs'
 
 
 Pio = PiB
 
 
 class EiB(Byte):
-    def _setup(self):
-        return (2, 60, 'EiB', 'EiBs')
+    __slots__ = ()
+    _base = 2
+    _power = 60
+    _name_singular = 'EiB'
+    _name_plural = 'EiBs'
 
 
 Eio = EiB
@@ -1014,64 +1058,88 @@ Eio = EiB
 ######################################################################
 # SI Prefixes for Byte based types
 class kB(Byte):
-    def _setup(self):
-        return (10, 3, 'kB', 'kBs')
+    __slots__ = ()
+    _base = 10
+    _power = 3
+    _name_singular = 'kB'
+    _name_plural = 'kBs'
 
 
 ko = kB
 
 
 class MB(Byte):
-    def _setup(self):
-        return (10, 6, 'MB', 'MBs')
+    __slots__ = ()
+    _base = 10
+    _power = 6
+    _name_singular = 'MB'
+    _name_plural = 'MBs'
 
 
 Mo = MB
 
 
 class GB(Byte):
-    def _setup(self):
-        return (10, 9, 'GB', 'GBs')
+    __slots__ = ()
+    _base = 10
+    _power = 9
+    _name_singular = 'GB'
+    _name_plural = 'GBs'
 
 
 Go = GB
 
 
 class TB(Byte):
-    def _setup(self):
-        return (10, 12, 'TB', 'TBs')
+    __slots__ = ()
+    _base = 10
+    _power = 12
+    _name_singular = 'TB'
+    _name_plural = 'TBs'
 
 
 To = TB
 
 
 class PB(Byte):
-    def _setup(self):
-        return (10, 15, 'PB', 'PBs')
+    __slots__ = ()
+    _base = 10
+    _power = 15
+    _name_singular = 'PB'
+    _name_plural = 'PBs'
 
 
 Po = PB
 
 
 class EB(Byte):
-    def _setup(self):
-        return (10, 18, 'EB', 'EBs')
+    __slots__ = ()
+    _base = 10
+    _power = 18
+    _name_singular = 'EB'
+    _name_plural = 'EBs'
 
 
 Eo = EB
 
 
 class ZB(Byte):
-    def _setup(self):
-        return (10, 21, 'ZB', 'ZBs')
+    __slots__ = ()
+    _base = 10
+    _power = 21
+    _name_singular = 'ZB'
+    _name_plural = 'ZBs'
 
 
 Zo = ZB
 
 
 class YB(Byte):
-    def _setup(self):
-        return (10, 24, 'YB', 'YBs')
+    __slots__ = ()
+    _base = 10
+    _power = 24
+    _name_singular = 'YB'
+    _name_plural = 'YBs'
 
 
 Yo = YB
@@ -1081,96 +1149,258 @@ Yo = YB
 # And now the bit types
 class Bit(Bitmath):
     """Bit based types fundamentally operate on self._bit_value"""
-
-    def _set_prefix_value(self):
-        self.prefix_value = self._to_prefix_value(self._bit_value)
-
-    def _setup(self):
-        return (2, 0, 'Bit', 'Bits')
-
-    def _norm(self, value):
-        """Normalize the input value into the fundamental unit for this prefix
-type"""
-        self._bit_value = value * self._unit_value
-        self._byte_value = self._bit_value / 8.0
+    __slots__ = ()
+    _base = 2
+    _power = 0
+    _name_singular = 'Bit'
+    _name_plural = 'Bits'
+    _fundamental_bits = 1
 
 
 ######################################################################
 # NIST Prefixes for Bit based types
 class Kib(Bit):
-    def _setup(self):
-        return (2, 10, 'Kib', 'Kibs')
+    __slots__ = ()
+    _base = 2
+    _power = 10
+    _name_singular = 'Kib'
+    _name_plural = 'Kibs'
 
 
 class Mib(Bit):
-    def _setup(self):
-        return (2, 20, 'Mib', 'Mibs')
+    __slots__ = ()
+    _base = 2
+    _power = 20
+    _name_singular = 'Mib'
+    _name_plural = 'Mibs'
 
 
 class Gib(Bit):
-    def _setup(self):
-        return (2, 30, 'Gib', 'Gibs')
+    __slots__ = ()
+    _base = 2
+    _power = 30
+    _name_singular = 'Gib'
+    _name_plural = 'Gibs'
 
 
 class Tib(Bit):
-    def _setup(self):
-        return (2, 40, 'Tib', 'Tibs')
+    __slots__ = ()
+    _base = 2
+    _power = 40
+    _name_singular = 'Tib'
+    _name_plural = 'Tibs'
 
 
 class Pib(Bit):
-    def _setup(self):
-        return (2, 50, 'Pib', 'Pibs')
+    __slots__ = ()
+    _base = 2
+    _power = 50
+    _name_singular = 'Pib'
+    _name_plural = 'Pibs'
 
 
 class Eib(Bit):
-    def _setup(self):
-        return (2, 60, 'Eib', 'Eibs')
+    __slots__ = ()
+    _base = 2
+    _power = 60
+    _name_singular = 'Eib'
+    _name_plural = 'Eibs'
 
 
 ######################################################################
 # SI Prefixes for Bit based types
 class kb(Bit):
-    def _setup(self):
-        return (10, 3, 'kb', 'kbs')
+    __slots__ = ()
+    _base = 10
+    _power = 3
+    _name_singular = 'kb'
+    _name_plural = 'kbs'
 
 
 class Mb(Bit):
-    def _setup(self):
-        return (10, 6, 'Mb', 'Mbs')
+    __slots__ = ()
+    _base = 10
+    _power = 6
+    _name_singular = 'Mb'
+    _name_plural = 'Mbs'
 
 
 class Gb(Bit):
-    def _setup(self):
-        return (10, 9, 'Gb', 'Gbs')
+    __slots__ = ()
+    _base = 10
+    _power = 9
+    _name_singular = 'Gb'
+    _name_plural = 'Gbs'
 
 
 class Tb(Bit):
-    def _setup(self):
-        return (10, 12, 'Tb', 'Tbs')
+    __slots__ = ()
+    _base = 10
+    _power = 12
+    _name_singular = 'Tb'
+    _name_plural = 'Tbs'
 
 
 class Pb(Bit):
-    def _setup(self):
-        return (10, 15, 'Pb', 'Pbs')
+    __slots__ = ()
+    _base = 10
+    _power = 15
+    _name_singular = 'Pb'
+    _name_plural = 'Pbs'
 
 
 class Eb(Bit):
-    def _setup(self):
-        return (10, 18, 'Eb', 'Ebs')
+    __slots__ = ()
+    _base = 10
+    _power = 18
+    _name_singular = 'Eb'
+    _name_plural = 'Ebs'
 
 
 class Zb(Bit):
-    def _setup(self):
-        return (10, 21, 'Zb', 'Zbs')
+    __slots__ = ()
+    _base = 10
+    _power = 21
+    _name_singular = 'Zb'
+    _name_plural = 'Zbs'
 
 
 class Yb(Bit):
-    def _setup(self):
-        return (10, 24, 'Yb', 'Ybs')
+    __slots__ = ()
+    _base = 10
+    _power = 24
+    _name_singular = 'Yb'
+    _name_plural = 'Ybs'
+
+
+######################################################################
+# Conversions
+
+def _exact_float(n):
+    """`n` as a float if that is exact, otherwise None"""
+    f = float(n)
+    return f if f == n else None
+
+
+def _conversion_factor(source, target):
+    """The factor turning a number of `source` units into a number of
+`target` units, as ``(numerator, denominator, float numerator, float
+denominator)``. The ints are exact and in lowest terms; the floats are
+the same two numbers, or None where a float can't hold them exactly."""
+    gcd = math.gcd(source._unit_bits, target._unit_bits)
+    num = source._unit_bits // gcd
+    den = target._unit_bits // gcd
+    fnum, fden = _exact_float(num), _exact_float(den)
+    if fnum is None or fden is None:
+        fnum = fden = None
+    return (num, den, fnum, fden)
+
+
+#: Every unit class
+_UNITS = tuple(globals()[name] for name in ALL_UNIT_TYPES)
+
+# The exact conversion factor for every pair of units, keyed by
+# (source class, target class) and by (source name, target name). See
+# _conversion_factor().
+_CONVERSION_FACTORS = {}
+for _source in _UNITS:
+    for _target in _UNITS:
+        _CONVERSION_FACTORS[_source, _target] = \
+            _CONVERSION_FACTORS[_source.__name__, _target.__name__] = \
+            _conversion_factor(_source, _target)
+del _source, _target
+
+
+def _make_converter(cls):
+    # Instances hold their size as a number of bits, whatever the
+    # unit, so converting one is only a matter of handing those bits
+    # to a new instance of `cls`.
+    new = object.__new__
+
+    def converter(self):
+        inst = new(cls)
+        _set_bit_value(inst, self._bit_value)
+        return inst
+    converter.__name__ = 'to_%s' % cls.__name__
+    converter.__qualname__ = 'Bitmath.to_%s' % cls.__name__
+    converter.__doc__ = "Return a new instance representing this one in %s" % cls.__name__
+    return converter
+
+
+for _unit in _UNITS:
+    setattr(Bitmath, 'to_%s' % _unit.__name__, _make_converter(_unit))
+    setattr(Bitmath, _unit.__name__, property(_make_converter(_unit)))
+del _unit
+
+
+def _unit_class(unit):
+    """The bitmath class `unit` names, for convert()"""
+    if isinstance(unit, str):
+        cls = _UNIT_CLASSES.get(unit)
+        if cls is not None:
+            return cls
+    elif isinstance(unit, type) and issubclass(unit, Bitmath) and unit._unit_bits is not None:
+        return unit
+    raise ValueError("'%s' is not a bitmath unit" % (unit,))
+
+
+def convert(value, from_unit, to_unit):
+    """Convert the plain number `value` from one unit into another,
+without creating any bitmath instances. The units are bitmath classes,
+or their names, as in ``convert(1.5, 'GiB', bitmath.MB)``.
+
+Returns a ``float``, as :attr:`Bitmath.value` would. The conversion
+factor is exact, so the result is the correctly rounded conversion of
+`value`. A result too large for a ``float`` is ``inf`` (or ``-inf``).
+
+   :param number value: An ``int``, ``float`` or ``Fraction``
+   :raises ValueError: if either unit is not a bitmath unit, or
+      `value` is not a valid number
+"""
+    try:
+        num, den, fnum, fden = _CONVERSION_FACTORS[from_unit, to_unit]
+    except (KeyError, TypeError):
+        num, den, fnum, fden = _CONVERSION_FACTORS[_unit_class(from_unit), _unit_class(to_unit)]
+
+    if type(value) is float and fnum is not None:  # pylint: disable=unidiomatic-typecheck
+        # One of the two factors is 1 or a power of two, so only one
+        # of these operations rounds
+        result = value * fnum / fden
+        if not math.isinf(result) or math.isinf(value):
+            return result
+        # value * fnum overflowed, though the result may not
+    if isinstance(value, Bitmath.valid_types) or _is_fraction(value):
+        if isinstance(value, float):
+            try:
+                value_num, value_den = value.as_integer_ratio()
+            except (OverflowError, ValueError):
+                # inf and nan
+                return value * num / den
+        elif isinstance(value, int):
+            value_num, value_den = value, 1
+        else:
+            value_num, value_den = value.numerator, value.denominator
+        # A true division of two ints is correctly rounded
+        try:
+            return (value_num * num) / (value_den * den)
+        except OverflowError:
+            # Too large for a float, which float math rounds to infinity
+            return math.inf if value_num > 0 else -math.inf
+    raise ValueError("Can not convert '%s', it is of an invalid type: %s" % (value, type(value)))
 
 
 ######################################################################
 # Utility functions
+#: The units Bitmath.best_prefix() chooses from, by system, smallest first
+_BEST_PREFIX_UNITS = {
+    NIST: (Byte, KiB, MiB, GiB, TiB, PiB, EiB),
+    SI: (Byte, kB, MB, GB, TB, PB, EB, ZB, YB),
+}
+
+# The number of bytes where each SI prefix unit starts: 1000, 1000**2, ...
+_SI_PREFIX_BYTES = [unit._unit_value for unit in _BEST_PREFIX_UNITS[SI][1:]]
+
+
 def best_prefix(bytes, system=NIST):
     """Return a bitmath instance representing the best human-readable
 representation of the number of bytes given by ``bytes``. In addition
@@ -1192,10 +1422,337 @@ Or:
    >>> best = (bitmath.KiB(12345) * 4201).best_prefix()
     """
     if isinstance(bytes, Bitmath):
-        value = bytes.bytes
+        return Byte._from_bits_unchecked(bytes.bits).best_prefix(system=system)
+    return Byte(bytes).best_prefix(system=system)
+
+
+def format_many(values, fmt=None, bestprefix=True, system=NIST):
+    """Format many sizes at once, returning a list of strings.
+
+``values`` may be a bitmath.array.BitmathArray, a sequence of bitmath
+instances, or a sequence (or NumPy array) of numbers of bytes.
+
+``fmt`` - a format string or a Formatter. By default, the format
+str() would use.
+
+``bestprefix`` - True (default) formats each size in its best prefix
+unit of ``system`` (NIST by default). False formats each size in its
+own unit (Byte, for numbers of bytes).
+
+With NumPy available, the best prefix units are picked for all sizes
+at once, and fields which don't depend on the instances themselves
+(value, unit, ...) are computed a whole column at a time.
+    """
+    formatter = _get_formatter(fmt)
+    try:
+        from bitmath.array import BitmathArray
+    except ImportError:  # pragma: no cover
+        BitmathArray = None
+
+    if BitmathArray is not None and isinstance(values, BitmathArray):
+        return values.format(formatter, bestprefix=bestprefix, system=system)
+
+    if not hasattr(values, 'dtype'):
+        values = list(values)
+    instances = len(values) > 0 and isinstance(values[0], Bitmath)
+
+    if BitmathArray is None or (instances and not bestprefix):
+        # One at a time. Each instance keeps its own unit
+        def one(size):
+            if not isinstance(size, Bitmath):
+                size = Byte(size)
+            if bestprefix:
+                size = size.best_prefix(system=system)
+            return formatter.format(size)
+        return [one(size) for size in values]
+
+    if instances:
+        array = BitmathArray(values)
     else:
-        value = bytes
-    return Byte(value).best_prefix(system=system)
+        array = BitmathArray.from_bytes(values)
+    return array.format(formatter, bestprefix=bestprefix, system=system)
+
+
+def _decimal_digits(n):
+    """Return how many decimal digits the non-negative int `n` has (0
+for 0), worked out from its bit length. 1233 / 4096 is just under
+log10(2), so the estimate is close but can be off either way for huge
+`n`, and is checked against powers of ten."""
+    digits = (n.bit_length() * 1233 >> 12) + 1
+    while n >= 10 ** digits:
+        digits += 1
+    while digits and n < 10 ** (digits - 1):
+        digits -= 1
+    return digits
+
+
+class SizeHistogram(object):
+    """Count sizes in logarithmic buckets, for a picture of how sizes
+(of files, for instance) are distributed.
+
+``system`` - NIST (default) for buckets which are powers of two wide,
+[1 Byte, 2 Bytes), [2 Bytes, 4 Bytes), ... [4 KiB, 8 KiB) and so on.
+SI for buckets which are powers of ten wide, [1 Byte, 10 Bytes),
+[10 Bytes, 100 Bytes), ... [1 kB, 10 kB) and so on.
+
+``step`` - how many powers of two (or ten) wide each bucket is. For
+instance, NIST with a step of 10 gives [1 Byte, 1 KiB),
+[1 KiB, 1 MiB) ...
+
+Sizes are counted in whole bytes, and empty sizes have a bucket of
+their own. A bucket is picked from the bit length of the number of
+bytes, so no floating point math is involved.
+    """
+
+    def __init__(self, system=NIST, step=1):
+        if system != NIST and system != SI:
+            raise ValueError("Invalid value given for 'system' parameter."
+                             " Must be one of NIST or SI")
+        if not isinstance(step, int) or step < 1:
+            raise ValueError("step must be a positive integer, not %r" % (step,))
+        self.system = system
+        self.step = step
+        # Bucket number -> how many sizes, and their total in bytes.
+        # Bucket 0 is empty sizes, bucket k covers
+        # [base ** ((k - 1) * step), base ** (k * step)) bytes.
+        self._counts = {}
+        self._totals = {}
+
+    def __repr__(self):
+        return "SizeHistogram(system=%s, step=%d, count=%d)" % (
+            'NIST' if self.system == NIST else 'SI', self.step, self.count)
+
+    def __str__(self):
+        return self.format()
+
+    def _bucket(self, nbytes):
+        if self.system == NIST:
+            digits = nbytes.bit_length()
+        else:
+            digits = _decimal_digits(nbytes)
+        return -(-digits // self.step)
+
+    def _bounds(self, bucket):
+        """Return the [lower, upper) number of bytes of `bucket`"""
+        if bucket == 0:
+            return 0, 1
+        return (self.system ** ((bucket - 1) * self.step),
+                self.system ** (bucket * self.step))
+
+    def add(self, size, count=1):
+        """Count `size` (a bitmath instance, or a number of bytes) `count`
+times"""
+        if isinstance(size, Bitmath):
+            nbytes = int(size.bits) >> 3
+        else:
+            nbytes = int(size)
+        if nbytes < 0:
+            raise ValueError("Can not count a negative size: %r" % (size,))
+        bucket = self._bucket(nbytes)
+        self._counts[bucket] = self._counts.get(bucket, 0) + count
+        self._totals[bucket] = self._totals.get(bucket, 0) + nbytes * count
+
+    def update(self, sizes):
+        """Count every size in `sizes`. That can be an iterable of bitmath
+instances or numbers of bytes, the ``(path, size)`` tuples
+:func:`listdir` yields, or a bitmath.array.BitmathArray. Nothing is
+kept but the counts, so `sizes` can be as long as it likes."""
+        array = sys.modules.get('bitmath.array')
+        if array is not None and isinstance(sizes, array.BitmathArray):
+            self._update_array(array.numpy, sizes)
+            return
+
+        add = self.add
+        for size in sizes:
+            if isinstance(size, tuple):
+                size = size[1]
+            add(size)
+
+    def _update_array(self, numpy, sizes):
+        """Count a whole BitmathArray at once"""
+        bits = sizes.bits
+        if len(bits) == 0:
+            return
+        if bits.dtype.kind == 'f':
+            nbytes = numpy.floor(bits / 8)
+            if nbytes.max() >= 2.0 ** 63:
+                # Too many bytes for int64, count them as Python ints
+                for n in nbytes.tolist():
+                    self.add(int(n))
+                return
+            nbytes = nbytes.astype(numpy.int64)
+        else:
+            nbytes = bits >> 3
+        if nbytes.min() < 0:
+            raise ValueError("Can not count a negative size")
+
+        # The lower bound of bucket k (k >= 1) is edges[k - 1]
+        edges = [1]
+        while edges[-1] <= nbytes.max():
+            edges.append(edges[-1] * self.system ** self.step)
+        # No size reaches the last edge, which may not fit in the dtype
+        buckets = numpy.searchsorted(numpy.array(edges[:-1], dtype=nbytes.dtype),
+                                     nbytes, side='right')
+        for bucket in numpy.unique(buckets).tolist():
+            in_bucket = nbytes[buckets == bucket]
+            self._counts[bucket] = self._counts.get(bucket, 0) + len(in_bucket)
+            total = sum(in_bucket.tolist())
+            self._totals[bucket] = self._totals.get(bucket, 0) + total
+
+    def merge(self, other):
+        """Add the counts of the SizeHistogram `other` into this one. Both
+must have the same ``system`` and ``step``."""
+        if not isinstance(other, SizeHistogram):
+            raise TypeError("Can only merge another SizeHistogram, not %r" % (other,))
+        if (other.system, other.step) != (self.system, self.step):
+            raise ValueError("Can not merge histograms with different buckets")
+        for bucket, count in other._counts.items():
+            self._counts[bucket] = self._counts.get(bucket, 0) + count
+            self._totals[bucket] = self._totals.get(bucket, 0) + other._totals[bucket]
+
+    @property
+    def count(self):
+        """How many sizes have been counted"""
+        return sum(self._counts.values())
+
+    @property
+    def total(self):
+        """The total of every size counted, as a Byte"""
+        return Byte(sum(self._totals.values()))
+
+    def _size(self, nbytes):
+        if nbytes == 0:
+            return Byte(0)
+        return Byte(nbytes).best_prefix(system=self.system)
+
+    def buckets(self):
+        """Return a list of ``(lower, upper, count, total)`` 4-tuples, one
+for each bucket from the smallest to the largest with anything in
+it. Each bucket holds the sizes from `lower` up to (but not
+including) `upper`. `lower`, `upper` and `total` are bitmath instances
+in their best prefix units."""
+        if not self._counts:
+            return []
+        result = []
+        for bucket in range(min(self._counts), max(self._counts) + 1):
+            lower, upper = self._bounds(bucket)
+            result.append((self._size(lower), self._size(upper),
+                           self._counts.get(bucket, 0),
+                           self._size(self._totals.get(bucket, 0))))
+        return result
+
+    def format(self, fmt=None):
+        """Return a table of the buckets, one per line, with the number of
+sizes in each and their total. Sizes are formatted with `fmt` (a
+format string or a Formatter), by default the format str() would
+use."""
+        formatter = _get_formatter(fmt)
+        rows = [("[%s, %s)" % (formatter.format(lower), formatter.format(upper)),
+                 str(count), formatter.format(total))
+                for lower, upper, count, total in self.buckets()]
+        if not rows:
+            return ''
+        widths = [max(len(row[i]) for row in rows) for i in range(3)]
+        return "\n".join("%-*s  %*s  %*s" % (widths[0], row[0], widths[1], row[1],
+                                             widths[2], row[2])
+                         for row in rows)
+
+
+# The ioctl requests query_device_capacity() makes, by platform. The
+# keys of the ``_IOCTL_MAP`` dictionary correlate to possible values
+# from the ``platform.system`` function.
+_IOCTL_MAP = {
+    # ioctls for the "Linux" platform
+    "Linux": {
+        "request_params": [
+            # A list of parameters to calculate the block size.
+            #
+            # ( PARAM_NAME , FORMAT_CHAR , REQUEST_CODE )
+            ("BLKGETSIZE64", "L", 0x80081272)
+            # Per <linux/fs.h>, the BLKGETSIZE64 request returns a
+            # 'u64' sized value. This is an unsigned 64 bit
+            # integer C type. This means to correctly "buffer" the
+            # result we need 64 bits, or 8 bytes, of memory.
+            #
+            # The struct module documentation include a reference
+            # chart relating formatting characters to native C
+            # Types. In this case, using the "native size", the
+            # table tells us:
+            #
+            # * Character 'L' - Unsigned Long C Type (u64) - Loads into a Python int type
+            #
+            # Confirm this character is right by running (on Linux):
+            #
+            #    >>> import struct
+            #    >>> print 8 == struct.calcsize('L')
+            #
+            # The result should be true as long as your kernel
+            # headers define BLKGETSIZE64 as a u64 type (please
+            # file a bug report at
+            # https://github.com/tbielawa/bitmath/issues/new if
+            # this does *not* work for you)
+        ],
+        # func is how the final result is decided. Because the
+        # Linux BLKGETSIZE64 call returns the block device
+        # capacity in bytes as an integer value, no extra
+        # calculations are required. Simply return the value of
+        # BLKGETSIZE64.
+        "func": lambda x: x["BLKGETSIZE64"]
+    },
+    # ioctls for the "Darwin" (Mac OS X) platform
+    "Darwin": {
+        "request_params": [
+            # A list of parameters to calculate the block size.
+            #
+            # ( PARAM_NAME , FORMAT_CHAR , REQUEST_CODE )
+            ("DKIOCGETBLOCKCOUNT", "L", 0x40086419),
+            # Per <sys/disk.h>: get media's block count - uint64_t
+            #
+            # As in the BLKGETSIZE64 example, an unsigned 64 bit
+            # integer will use the 'L' formatting character
+            ("DKIOCGETBLOCKSIZE", "I", 0x40046418)
+            # Per <sys/disk.h>: get media's block size - uint32_t
+            #
+            # This request returns an unsigned 32 bit integer, or
+            # in other words: just a normal integer (or 'int' c
+            # type). That should require 4 bytes of space for
+            # buffering. According to the struct modules
+            # 'Formatting Characters' chart:
+            #
+            # * Character 'I' - Unsigned Int C Type (uint32_t) - Loads into a Python int type
+        ],
+        # OS X doesn't have a direct equivalent to the Linux
+        # BLKGETSIZE64 request. Instead, we must request how many
+        # blocks (or "sectors") are on the disk, and the size (in
+        # bytes) of each block. Finally, multiply the two together
+        # to obtain capacity:
+        #
+        #                      n Block * y Byte
+        # capacity (bytes)  =            -------
+        #                                1 Block
+        "func": lambda x: x["DKIOCGETBLOCKCOUNT"] * x["DKIOCGETBLOCKSIZE"]
+        # This expression simply accepts a dictionary ``x`` as a
+        # parameter, and then returns the result of multiplying
+        # the two named dictionary items together. In this case,
+        # that means multiplying ``DKIOCGETBLOCKCOUNT``, the total
+        # number of blocks, by ``DKIOCGETBLOCKSIZE``, the size of
+        # each block in bytes.
+    }
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _ioctl_requests(system):
+    """Return the ioctl requests query_device_capacity() makes on the
+platform `system`, as ``(name, request code, format, buffer)``
+4-tuples, and the function which turns their results into a capacity.
+Worked out once per platform."""
+    import struct
+
+    params = _IOCTL_MAP[system]
+    requests = [(req_name, request_code, fmt, ' ' * struct.calcsize(fmt))
+                for req_name, fmt, request_code in params['request_params']]
+    return requests, params['func']
 
 
 def query_device_capacity(device_fd):
@@ -1221,100 +1778,19 @@ ioctl's for querying block device sizes:
     if os_name() != 'posix':
         raise NotImplementedError("'bitmath.query_device_capacity' is not supported on this platform: %s" % os_name())
 
+    import fcntl
+    import platform
+    import stat
+    import struct
+
     s = os.stat(device_fd.name).st_mode
     if not stat.S_ISBLK(s):
         raise ValueError("The file descriptor provided is not of a device type")
 
-    # The keys of the ``ioctl_map`` dictionary correlate to possible
-    # values from the ``platform.system`` function.
-    ioctl_map = {
-        # ioctls for the "Linux" platform
-        "Linux": {
-            "request_params": [
-                # A list of parameters to calculate the block size.
-                #
-                # ( PARAM_NAME , FORMAT_CHAR , REQUEST_CODE )
-                ("BLKGETSIZE64", "L", 0x80081272)
-                # Per <linux/fs.h>, the BLKGETSIZE64 request returns a
-                # 'u64' sized value. This is an unsigned 64 bit
-                # integer C type. This means to correctly "buffer" the
-                # result we need 64 bits, or 8 bytes, of memory.
-                #
-                # The struct module documentation include a reference
-                # chart relating formatting characters to native C
-                # Types. In this case, using the "native size", the
-                # table tells us:
-                #
-                # * Character 'L' - Unsigned Long C Type (u64) - Loads into a Python int type
-                #
-                # Confirm this character is right by running (on Linux):
-                #
-                #    >>> import struct
-                #    >>> print 8 == struct.calcsize('L')
-                #
-                # The result should be true as long as your kernel
-                # headers define BLKGETSIZE64 as a u64 type (please
-                # file a bug report at
-                # https://github.com/tbielawa/bitmath/issues/new if
-                # this does *not* work for you)
-            ],
-            # func is how the final result is decided. Because the
-            # Linux BLKGETSIZE64 call returns the block device
-            # capacity in bytes as an integer value, no extra
-            # calculations are required. Simply return the value of
-            # BLKGETSIZE64.
-            "func": lambda x: x["BLKGETSIZE64"]
-        },
-        # ioctls for the "Darwin" (Mac OS X) platform
-        "Darwin": {
-            "request_params": [
-                # A list of parameters to calculate the block size.
-                #
-                # ( PARAM_NAME , FORMAT_CHAR , REQUEST_CODE )
-                ("DKIOCGETBLOCKCOUNT", "L", 0x40086419),
-                # Per <sys/disk.h>: get media's block count - uint64_t
-                #
-                # As in the BLKGETSIZE64 example, an unsigned 64 bit
-                # integer will use the 'L' formatting character
-                ("DKIOCGETBLOCKSIZE", "I", 0x40046418)
-                # Per <sys/disk.h>: get media's block size - uint32_t
-                #
-                # This request returns an unsigned 32 bit integer, or
-                # in other words: just a normal integer (or 'int' c
-                # type). That should require 4 bytes of space for
-                # buffering. According to the struct modules
-                # 'Formatting Characters' chart:
-                #
-                # * Character 'I' - Unsigned Int C Type (uint32_t) - Loads into a Python int type
-            ],
-            # OS X doesn't have a direct equivalent to the Linux
-            # BLKGETSIZE64 request. Instead, we must request how many
-            # blocks (or "sectors") are on the disk, and the size (in
-            # bytes) of each block. Finally, multiply the two together
-            # to obtain capacity:
-            #
-            #                      n Block * y Byte
-            # capacity (bytes)  =            -------
-            #                                1 Block
-            "func": lambda x: x["DKIOCGETBLOCKCOUNT"] * x["DKIOCGETBLOCKSIZE"]
-            # This expression simply accepts a dictionary ``x`` as a
-            # parameter, and then returns the result of multiplying
-            # the two named dictionary items together. In this case,
-            # that means multiplying ``DKIOCGETBLOCKCOUNT``, the total
-            # number of blocks, by ``DKIOCGETBLOCKSIZE``, the size of
-            # each block in bytes.
-        }
-    }
-
-    platform_params = ioctl_map[platform.system()]
+    requests, func = _ioctl_requests(platform.system())
     results = {}
 
-    for req_name, fmt, request_code in platform_params['request_params']:
-        # Read the systems native size (in bytes) of this format type.
-        buffer_size = struct.calcsize(fmt)
-        # Construct a buffer to store the ioctl result in
-        buffer = ' ' * buffer_size
-
+    for req_name, request_code, fmt, buffer in requests:
         # This code has been ran on only a few test systems. If it's
         # appropriate, maybe in the future we'll add try/except
         # conditions for some possible errors. Really only for cases
@@ -1328,7 +1804,165 @@ ioctl's for querying block device sizes:
         # Add the new result to our collection
         results[req_name] = result
 
-    return Byte(platform_params['func'](results))
+    return Byte(func(results))
+
+
+def query_all_device_capacities(sysfs='/sys/block'):
+    """Return a dictionary mapping the name of every block device on the
+system (as in ``/dev/<name>``) to its capacity, as a
+:class:`bitmath.Byte` instance.
+
+On Linux the capacities are read from `sysfs`, which doesn't need any
+device to be opened (or root privileges), so even hosts with hundreds
+of devices take next to no time. If a device's size can't be read
+from there, or there is no `sysfs` at all (on Mac OS X, say), the
+device is opened and asked with :func:`query_device_capacity`
+instead. Devices which can't be opened are left out.
+    """
+    if os_name() != 'posix':
+        raise NotImplementedError("'bitmath.query_all_device_capacities' is not supported on this platform: %s" % os_name())
+
+    try:
+        names = sorted(os.listdir(sysfs))
+    except OSError:
+        # Whole disks only, not their slices (disk0, not disk0s1)
+        names = sorted(name for name in os.listdir('/dev')
+                       if re.match(r'disk[0-9]+\Z', name))
+        sysfs = None
+
+    capacities = {}
+    for name in names:
+        # Slashes in device names are '!' in sysfs (cciss!c0d0)
+        device = name.replace('!', '/')
+        if sysfs is not None:
+            try:
+                with open(os.path.join(sysfs, name, 'size'), 'rb') as size:
+                    # Always in 512 byte sectors, whatever the device's
+                    # own block size is
+                    capacities[device] = Byte(int(size.read()) * 512)
+                continue
+            except (OSError, ValueError):
+                pass
+        try:
+            with open(os.path.join('/dev', device), 'rb') as device_fd:
+                capacities[device] = query_device_capacity(device_fd)
+        except OSError:
+            pass
+    return capacities
+
+
+#: The capacity and usage of a filesystem, as returned by fs_usage()
+FsUsage = collections.namedtuple('FsUsage', ['total', 'used', 'free', 'available',
+                                             'inodes', 'inodes_used', 'inodes_free'])
+
+# Cached results of fs_usage() and all_mounts_usage(), as
+# {key: (expiry time, result)}
+_FS_USAGE_CACHE = {}
+_FS_USAGE_CACHE_PRUNE = 1024
+
+# Escaped characters in mount points (\040 is a space)
+_MOUNT_ESCAPE_RE = re.compile(br'\\([0-7]{3})')
+
+
+def _ttl_cached(key, ttl, compute):
+    """Return `compute()`, reusing the result of an earlier call with
+the same `key` for up to `ttl` seconds. No `ttl` means no caching."""
+    if not ttl:
+        return compute()
+    now = time.monotonic()
+    cached = _FS_USAGE_CACHE.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    result = compute()
+    if len(_FS_USAGE_CACHE) >= _FS_USAGE_CACHE_PRUNE:
+        for old_key, (expires, _) in list(_FS_USAGE_CACHE.items()):
+            if expires <= now:
+                # Another thread may have pruned it already
+                _FS_USAGE_CACHE.pop(old_key, None)
+    _FS_USAGE_CACHE[key] = (now + ttl, result)
+    return result
+
+
+def _statvfs_usage(path, bestprefix, system):
+    """Return the FsUsage of the filesystem `path` is on"""
+    st = os.statvfs(path)
+    sizes = [Byte(st.f_blocks * st.f_frsize),
+             Byte((st.f_blocks - st.f_bfree) * st.f_frsize),
+             Byte(st.f_bfree * st.f_frsize),
+             Byte(st.f_bavail * st.f_frsize)]
+    if bestprefix:
+        sizes = [size.best_prefix(system=system) for size in sizes]
+    return FsUsage(sizes[0], sizes[1], sizes[2], sizes[3],
+                   st.f_files, st.f_files - st.f_ffree, st.f_ffree)
+
+
+def _mount_points():
+    """Return the mount point of every mounted filesystem, in the order
+they were mounted, read from /proc/self/mountinfo (or /proc/mounts)."""
+    def unescape(match):
+        return bytes([int(match.group(1), 8)])
+
+    for table, field in (('/proc/self/mountinfo', 4), ('/proc/mounts', 1)):
+        try:
+            with open(table, 'rb') as mounts:
+                lines = mounts.read().splitlines()
+        except OSError:
+            continue
+        return [os.fsdecode(_MOUNT_ESCAPE_RE.sub(unescape, line.split()[field]))
+                for line in lines if line]
+    import platform
+    raise NotImplementedError("'bitmath.all_mounts_usage' is not supported on this platform: %s" % platform.system())
+
+
+def fs_usage(path, bestprefix=True, system=NIST, ttl=None):
+    """Return the capacity and usage of the filesystem `path` is on, the
+way ``df`` reports them, as a FsUsage named tuple of:
+
+* ``total`` - The size of the filesystem
+* ``used`` - How much of it is in use
+* ``free`` - How much of it is free
+* ``available`` - How much of it is free for unprivileged users
+  (``free``, less any space reserved for root)
+* ``inodes``, ``inodes_used`` and ``inodes_free`` - The same, for
+  inodes
+
+The sizes are bitmath instances in their best prefix units of
+`system` (NIST by default). Set ``bestprefix`` to ``False`` to get
+``bitmath.Byte`` instances back instead.
+
+Set `ttl` to reuse the result for `path` for up to that many seconds,
+rather than asking the filesystem again every time.
+    """
+    return _ttl_cached(('fs_usage', path, bestprefix, system), ttl,
+                       lambda: _statvfs_usage(path, bestprefix, system))
+
+
+def all_mounts_usage(bestprefix=True, system=NIST, ttl=None, pseudo=False):
+    """Return a dictionary mapping the mount point of every mounted
+filesystem to its fs_usage(), like ``df`` does.
+
+The list of mounts is read from ``/proc/self/mountinfo`` once per call,
+then each mount point is ``statvfs()``'d. Filesystems which can't be
+asked (like a hung network mount, or one this user can't read) are
+left out, and so are pseudo filesystems with no blocks at all (proc,
+sysfs, cgroup ...), unless `pseudo` is ``True``.
+
+`bestprefix`, `system` and `ttl` mean the same as for fs_usage().
+    """
+    def usage():
+        result = {}
+        for mount_point in _mount_points():
+            try:
+                fs = _statvfs_usage(mount_point, bestprefix, system)
+            except OSError:
+                continue
+            if pseudo or fs.total.bits:
+                result[mount_point] = fs
+            else:
+                # An earlier mount at the same place is hidden anyway
+                result.pop(mount_point, None)
+        return result
+    return _ttl_cached(('all_mounts_usage', bestprefix, system, pseudo), ttl, usage)
 
 
 def getsize(path, bestprefix=True, system=NIST):
@@ -1340,16 +1974,191 @@ system by setting `system` to either `bitmath.NIST` (default) or
 Optionally, set ``bestprefix`` to ``False`` to get ``bitmath.Byte``
 instances back.
     """
-    _path = os.path.realpath(path)
-    size_bytes = os.path.getsize(_path)
+    size_bytes = os.stat(path).st_size
     if bestprefix:
         return Byte(size_bytes).best_prefix(system=system)
     else:
         return Byte(size_bytes)
 
 
+def _list_dir(top):
+    """Return the os.DirEntry objects for everything in the directory
+`top`, or an empty list if it can't be read (os.walk ignores those).
+    """
+    try:
+        with os.scandir(top) as scan:
+            return list(scan)
+    except OSError:
+        return []
+
+
+def _scan_dir(top, followlinks):
+    """List the directory `top` the way os.walk does. Returns a 2-tuple
+of the os.DirEntry objects of everything in `top` that isn't a
+directory, and the paths of the subdirectories to descend into, each
+in the order os.scandir() lists them. A directory which can't be read
+has no entries.
+    """
+    entries = _list_dir(top)
+    files = []
+    dirs = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if not is_dir:
+            files.append(entry)
+        elif followlinks:
+            dirs.append(entry.path)
+        else:
+            try:
+                is_symlink = entry.is_symlink()
+            except OSError:
+                is_symlink = False
+            if not is_symlink:
+                dirs.append(entry.path)
+    return files, dirs
+
+
+def _listdir_scan(top, followlinks, match, relpath, bestprefix, system):
+    """Scan one directory for listdir(). Returns a 3-tuple of the
+``(path, size)`` results for the files in `top`, the subdirectories
+to descend into, and the OSError which stopped the scan part way
+through (or ``None``).
+    """
+    # os.scandir() tells us which entries are directories and symlinks
+    # without any system calls, and DirEntry.stat() costs at most one
+    # per file. Paths are worked out once per directory, rather than
+    # once per file.
+    files, dirs = _scan_dir(top, followlinks)
+    if relpath:
+        # RELATIVE path
+        _return_root = os.path.relpath(top, '.')
+        if _return_root == os.curdir:
+            _return_root = ''
+    else:
+        # REAL path
+        _return_root = os.path.realpath(top)
+
+    normcase = os.path.normcase
+    join = os.path.join
+    results = []
+    try:
+        for entry in files:
+            if not match(normcase(entry.name)):
+                continue
+
+            if entry.is_symlink():
+                if not followlinks:
+                    continue
+                if not relpath:
+                    # The real path of a link is its target's path
+                    _return_path = os.path.realpath(entry.path)
+                else:
+                    _return_path = join(_return_root, entry.name)
+            else:
+                _return_path = join(_return_root, entry.name)
+
+            size = Byte(entry.stat().st_size)
+            if bestprefix:
+                size = size.best_prefix(system=system)
+            results.append((_return_path, size))
+    except OSError as e:
+        return results, dirs, e
+    return results, dirs, None
+
+
+def _schedule_scans(stack, running, window, submit):
+    """Start scanning the directories an ordered walk will need next.
+
+`stack` is a pre-order walk stack of ``[path, future, children]``
+lists, `running` the set of futures started and not yet consumed, and
+`submit(path)` starts scanning `path` and returns its future. The
+directories needed next are the ones nearest the top of the stack
+and, for those already scanned, their subdirectories. The first
+`window` of those are started, and scans further along which haven't
+started yet give up their place to them.
+    """
+    ahead = 0
+    seen = 0
+    upcoming = [reversed(stack)]
+    while upcoming:
+        node = next(upcoming[-1], None)
+        if node is None:
+            upcoming.pop()
+            continue
+        if ahead < window:
+            ahead += 1
+            if node[1] is None:
+                node[1] = submit(node[0])
+                running.add(node[1])
+            seen += 1
+        elif seen == len(running):
+            break
+        elif node[1] is not None:
+            seen += 1
+            if node[1].cancel():
+                running.discard(node[1])
+                seen -= 1
+                node[1] = None
+        if node[1] is not None and node[1].done() and node[1].exception() is None:
+            if node[2] is None:
+                node[2] = [[d, None, None] for d in node[1].result()[1]]
+            upcoming.append(iter(node[2]))
+
+
+def _listdir_parallel(search_base, workers, ordered, scan):
+    """Run `scan` over the tree `search_base` on a pool of `workers`
+threads, yielding each directory's ``(results, error)`` as it becomes
+available. With `ordered` they come back in the same order a
+sequential walk would produce them.
+
+No more than a few directories per worker are ever queued up or
+waiting to be consumed, so a consumer which stops iterating stops the
+walk, and memory use doesn't grow with the size of the tree.
+    """
+    import concurrent.futures
+
+    window = workers * 2
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    running = set()
+
+    def submit(path):
+        return executor.submit(scan, path)
+
+    try:
+        if ordered:
+            stack = [[search_base, None, None]]
+            while stack:
+                _schedule_scans(stack, running, window, submit)
+                node = stack.pop()
+                results, dirs, error = node[1].result()
+                running.discard(node[1])
+                if node[2] is None:
+                    node[2] = [[d, None, None] for d in dirs]
+                stack.extend(reversed(node[2]))
+                yield results, error
+        else:
+            pending = [search_base]
+            while pending or running:
+                while pending and len(running) < window:
+                    running.add(submit(pending.pop()))
+                done, running = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    results, dirs, error = future.result()
+                    pending.extend(reversed(dirs))
+                    yield results, error
+    finally:
+        for future in running:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
 def listdir(search_base, followlinks=False, filter='*',
-            relpath=False, bestprefix=False, system=NIST):
+            relpath=False, bestprefix=False, system=NIST,
+            workers=None, ordered=True):
     """This is a generator which recurses the directory tree
 `search_base`, yielding 2-tuples of:
 
@@ -1366,29 +2175,234 @@ def listdir(search_base, followlinks=False, filter='*',
       instances back instead.
     - `system` - Provide a preferred unit system by setting `system`
       to either ``bitmath.NIST`` (default) or ``bitmath.SI``.
+    - `workers` - Scan directories on this many threads at once
+      (default: ``None``, walk the tree in the calling thread). Worth
+      it where every ``stat()`` is a network round trip, such as NFS.
+    - `ordered` - With `workers`, ``True`` (default) to get results in
+      the same order as a single threaded walk, or ``False`` to get
+      them in whatever order directories finish being scanned.
 
 .. note:: This function does NOT return tuples for directory entities.
 
 .. note:: Symlinks to **files** are followed automatically
 
     """
-    for root, dirs, files in os.walk(search_base, followlinks=followlinks):
-        for name in fnmatch.filter(files, filter):
-            _path = os.path.join(root, name)
-            if relpath:
-                # RELATIVE path
-                _return_path = os.path.relpath(_path, '.')
-            else:
-                # REAL path
-                _return_path = os.path.realpath(_path)
+    if workers is not None and (not isinstance(workers, int) or workers < 1):
+        raise ValueError("workers must be a positive integer, not %r" % (workers,))
+
+    import fnmatch
+    match = re.compile(fnmatch.translate(os.path.normcase(filter))).match
+
+    def scan(top):
+        return _listdir_scan(top, followlinks, match, relpath, bestprefix, system)
+
+    if workers is None:
+        stack = [search_base]
+        while stack:
+            results, dirs, error = scan(stack.pop())
+            for result in results:
+                yield result
+            if error is not None:
+                raise error
+            # Visit subdirectories in the order they were listed
+            stack.extend(reversed(dirs))
+    else:
+        for results, error in _listdir_parallel(search_base, workers, ordered, scan):
+            for result in results:
+                yield result
+            if error is not None:
+                raise error
+
+
+def _du_walk(path, apparent, one_file_system):
+    """The walk behind du(). Yields a ``(path, depth, total bytes)``
+3-tuple for every directory in the tree `path`, each one after all of
+its subdirectories. If `path` isn't a directory, it is the only
+result.
+    """
+    import stat
+
+    root_st = os.lstat(path)
+    if apparent or not hasattr(root_st, 'st_blocks'):
+        def size(st):
+            return st.st_size
+    else:
+        def size(st):
+            return st.st_blocks * 512
+
+    if not stat.S_ISDIR(root_st.st_mode):
+        yield path, 0, size(root_st)
+        return
+
+    root_dev = root_st.st_dev
+    seen = set()
+    # A depth first walk stack of [path, total, entries left]. A
+    # directory's total is final once its entries run out.
+    stack = [[path, size(root_st), iter(_list_dir(path))]]
+    while stack:
+        frame = stack[-1]
+        for entry in frame[2]:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if stat.S_ISDIR(st.st_mode):
+                if one_file_system and st.st_dev != root_dev:
+                    continue
+                stack.append([entry.path, size(st), iter(_list_dir(entry.path))])
+                break
+            if st.st_nlink > 1:
+                # Hard links share one inode; count it once
+                inode = (st.st_dev, st.st_ino)
+                if inode in seen:
+                    continue
+                seen.add(inode)
+            frame[1] += size(st)
+        else:
+            stack.pop()
+            if stack:
+                stack[-1][1] += frame[1]
+            yield frame[0], len(stack), frame[1]
+
+
+def du(path, apparent=False, max_depth=None, one_file_system=False,
+       bestprefix=False, system=NIST):
+    """Summarize the disk usage of the directory tree `path`, like the
+``du`` command does. Returns a dictionary mapping each directory to a
+bitmath instance of the total size of everything beneath it
+(including itself). Like the output of ``du``, every directory comes
+after its subdirectories, so `path` is always last.
+
+    - `path` - The directory to summarize. If `path` is not a
+      directory, the result only holds its own size.
+    - `apparent` - ``False`` (default) to count the space allocated
+      for each file on disk (``st_blocks`` * 512 bytes), ``True`` to
+      count the "apparent size" (``st_size``) instead.
+    - `max_depth` - Only include directories at most this many levels
+      below `path` in the result (default: ``None``, all of them).
+      Deeper directories still count towards the totals above them.
+    - `one_file_system` - ``True`` to skip directories which are on a
+      different filesystem than `path` (default: ``False``)
+    - ``bestprefix`` - ``False`` (default) for ``bitmath.Byte``
+      instances, ``True`` for the best human-readable prefix unit.
+    - `system` - Provide a preferred unit system by setting `system`
+      to either ``bitmath.NIST`` (default) or ``bitmath.SI``.
+
+Each file is ``lstat()``'d once and symbolic links are never followed.
+A file with several hard links is only counted the first time one of
+them is found. Directories which can't be read only count their own
+size.
+    """
+    if max_depth is not None and (not isinstance(max_depth, int) or max_depth < 0):
+        raise ValueError("max_depth must be a non-negative integer, not %r" % (max_depth,))
+
+    totals = {}
+    for _path, depth, total in _du_walk(path, apparent, one_file_system):
+        if max_depth is None or depth <= max_depth:
+            totals[_path] = total
+
+    for _path, total in totals.items():
+        total = Byte(total)
+        if bestprefix:
+            total = total.best_prefix(system=system)
+        totals[_path] = total
+    return totals
+
+
+def largest(path, n=100, filter='*', by='file', system=NIST):
+    """Find the `n` largest files (or directories) in the tree `path`.
+Returns a list of up to `n` 2-tuples, largest first, of:
+
+* The path to a file or directory
+* A bitmath instance in the best human-readable prefix unit of its
+  "apparent size"
+
+    - `path` - The directory to search
+    - `n` - How many of the largest to return (default: 100)
+    - `filter` - A glob (see :py:mod:`fnmatch`) which the names of
+      files or directories must match (default: ``*``, everything)
+    - `by` - ``'file'`` (default) to find the largest files, as
+      :func:`listdir` would report them, or ``'dir'`` to find the
+      directories with the largest totals, as
+      ``du(path, apparent=True)`` would report them.
+    - `system` - Provide a preferred unit system by setting `system`
+      to either ``bitmath.NIST`` (default) or ``bitmath.SI``.
+
+The tree is read once and never held in memory: only the `n` largest
+seen so far are kept. Ties go to whichever was found first.
+    """
+    if not isinstance(n, int) or n < 0:
+        raise ValueError("n must be a non-negative integer, not %r" % (n,))
+
+    import fnmatch
+    import heapq
+
+    if by == 'file':
+        top = heapq.nlargest(n, listdir(path, filter=filter),
+                             key=lambda item: item[1].bits)
+        return [(_path, size.best_prefix(system=system)) for _path, size in top]
+    elif by == 'dir':
+        match = re.compile(fnmatch.translate(os.path.normcase(filter))).match
+        normcase = os.path.normcase
+        basename = os.path.basename
+        dirs = ((_path, total) for _path, depth, total in _du_walk(path, True, False)
+                if match(normcase(basename(os.path.normpath(_path)))))
+        top = heapq.nlargest(n, dirs, key=lambda item: item[1])
+        return [(_path, Byte(total).best_prefix(system=system)) for _path, total in top]
+    else:
+        raise ValueError("Invalid value given for 'by' parameter."
+                         " Must be one of 'file' or 'dir'")
+
+
+# Parsing: A number, optional whitespace, and some ASCII letters for
+# the unit. This is what nearly every real input looks like.
+# Anything else takes the slower general path, which behaves exactly
+# the way the parsers always have (including their error messages).
+_PARSE_RE = re.compile(r'[ \t\n\r\f\v]*([-+]?(?:[0-9]+\.?[0-9]*|\.[0-9]+))'
+                       r'[ \t\n\r\f\v]*([A-Za-z]+)\Z')
+
+# Every unit name parse_string() accepts, mapped to its class. That
+# includes the octet aliases (Mo, Kio, ...) and the bare 'b' and 'B'.
+_UNIT_CLASSES = dict(
+    (name, obj) for (name, obj) in globals().items()
+    if isinstance(obj, type) and issubclass(obj, Bitmath) and obj is not Bitmath)
+_UNIT_CLASSES['b'] = Bit
+_UNIT_CLASSES['B'] = Byte
+
+
+def _unsafe_unit_classes(system):
+    """Build the parse_string_unsafe() table for `system`: the unit
+letters (with any trailing b/B characters removed) mapped to the class
+they are parsed as. Only spellings which parse successfully are
+included.
+    """
+    table = {}
+    for prefix in NIST_PREFIXES:
+        unit_class = _UNIT_CLASSES[prefix + 'B']
+        table[prefix[0].lower() + 'i'] = unit_class
+        table[prefix[0].upper() + 'i'] = unit_class
+    for prefix in SI_PREFIXES:
+        if system == NIST:
+            unit_class = _UNIT_CLASSES.get(prefix.upper() + 'iB')
+        else:
+            unit_class = _UNIT_CLASSES[prefix + 'B']
+        if unit_class is not None:
+            table[prefix.lower()] = unit_class
+            table[prefix.upper()] = unit_class
+    return table
 
-            if followlinks:
-                yield (_return_path, getsize(_path, bestprefix=bestprefix, system=system))
-            else:
-                if os.path.isdir(_path) or os.path.islink(_path):
-                    pass
-                else:
-                    yield (_return_path, getsize(_path, bestprefix=bestprefix, system=system))
+
+_UNSAFE_SI_UNITS = _unsafe_unit_classes(SI)
+_UNSAFE_NIST_UNITS = _unsafe_unit_classes(NIST)
+
+
+def _find_alpha(s):
+    """Return the index of the first alphabetic character in `s`, or
+None if there isn't one"""
+    for index, char in enumerate(s):
+        if char.isalpha():
+            return index
+    return None
 
 
 def parse_string(s):
@@ -1397,41 +2411,36 @@ it.
 
 String inputs may include whitespace characters between the value and
 the unit.
+
+Results are remembered in the parse cache, see parse_cache_info().
     """
+    if isinstance(s, str):
+        return _parse_cached(s, True, None)
+    return _parse_string(s)
+
+
+def _parse_string(s):
+    """parse_string(), without the cache"""
     # Strings only please
-    if not isinstance(s, (str, unicode)):
+    if not isinstance(s, str):
         raise ValueError("parse_string only accepts string inputs but a %s was given" %
                          type(s))
 
-    # get the index of the first alphabetic character
-    try:
-        index = list([i.isalpha() for i in s]).index(True)
-    except ValueError:
-        # If there's no alphabetic characters we won't be able to .index(True)
-        raise ValueError("No unit detected, can not parse string '%s' into a bitmath object" % s)
-
-    # split the string into the value and the unit
-    val, unit = s[:index], s[index:]
-
-    # see if the unit exists as a type in our namespace
-
-    if unit == "b":
-        unit_class = Bit
-    elif unit == "B":
-        unit_class = Byte
+    match = _PARSE_RE.match(s)
+    if match is not None:
+        val, unit = match.groups()
     else:
-        if not (hasattr(sys.modules[__name__], unit) and isinstance(getattr(sys.modules[__name__], unit), type)):
-            raise ValueError("The unit %s is not a valid bitmath unit" % unit)
-        unit_class = globals()[unit]
+        # Split on the first alphabetic character
+        index = _find_alpha(s)
+        if index is None:
+            raise ValueError("No unit detected, can not parse string '%s' into a bitmath object" % s)
+        val, unit = s[:index], s[index:]
+
+    unit_class = _UNIT_CLASSES.get(unit)
+    if unit_class is None:
+        raise ValueError("The unit %s is not a valid bitmath unit" % unit)
 
-    try:
-        val = float(val)
-    except ValueError:
-        raise
-    try:
-        return unit_class(val)
-    except:  # pragma: no cover
-        raise ValueError("Can't parse string %s into a bitmath object" % s)
+    return unit_class._from_bits_unchecked(float(val) * unit_class._unit_bits)
 
 
 def parse_string_unsafe(s, system=SI):
@@ -1458,8 +2467,17 @@ Note the following caveats:
 
 * Capitalization does not matter
 
+Results for string inputs are remembered in the parse cache, see
+parse_cache_info().
     """
-    if not isinstance(s, (str, unicode)) and \
+    if isinstance(s, str):
+        return _parse_cached(s, False, system)
+    return _parse_string_unsafe(s, system)
+
+
+def _parse_string_unsafe(s, system):
+    """parse_string_unsafe(), without the cache"""
+    if not isinstance(s, str) and \
        not isinstance(s, numbers.Number):
         raise ValueError("parse_string_unsafe only accepts string/number inputs but a %s was given" %
                          type(s))
@@ -1473,19 +2491,31 @@ Note the following caveats:
         # It's just a number. Assume bytes
         return Byte(s)
 
+    # Test case: the common shape, a number followed by a unit we
+    # know how to spell. A plain number never matches here.
+    match = _PARSE_RE.match(s)
+    if match is not None:
+        val, unit = match.groups()
+        if system == NIST:
+            unit_class = _UNSAFE_NIST_UNITS.get(unit.rstrip('Bb'))
+        else:
+            unit_class = _UNSAFE_SI_UNITS.get(unit.rstrip('Bb'))
+        if unit_class is not None:
+            return unit_class._from_bits_unchecked(float(val) * unit_class._unit_bits)
+
     # Test case: a number pretending to be a string
-    if isinstance(s, (str, unicode)):
-        try:
-            # Can we turn it directly into a number?
-            return Byte(float(s))
-        except ValueError:
-            # Nope, this is not a plain number
-            pass
+    try:
+        # Can we turn it directly into a number?
+        return Byte(float(s))
+    except ValueError:
+        # Nope, this is not a plain number
+        pass
 
     ######################################################################
     # At this point:
     # - the input is also not just a number wrapped in a string
     # - nor is is just a plain number type
+    # - nor a number with a unit spelled the usual way
     #
     # We need to do some more digging around now to figure out exactly
     # what we were given and possibly normalize the input into a
@@ -1494,10 +2524,9 @@ Note the following caveats:
     # First we'll separate the number and the unit.
     #
     # Get the index of the first alphabetic character
-    try:
-        index = list([i.isalpha() for i in s]).index(True)
-    except ValueError:  # pragma: no cover
-        # If there's no alphabetic characters we won't be able to .index(True)
+    index = _find_alpha(s)
+    if index is None:  # pragma: no cover
+        # If there's no alphabetic characters we can't find a unit
         raise ValueError("No unit detected, can not parse string '%s' into a bitmath object" % s)
 
     # Split the string into the value and the unit
@@ -1513,20 +2542,17 @@ Note the following caveats:
     # - 3 Caracters (so NIST, ex: KiB, or GiB)
     #
     # A unit with any other number of chars is not a valid unit
+    unit_class = None
 
     # SI
     if len(unit) == 2:
         # Has NIST parsing been requested?
         if system == NIST:
             # NIST units requested. Ensure the unit begins with a
-            # capital letter and is followed by an 'i' character.
+            # capital letter and insert an 'i' char after it.
             unit = capitalize_first(unit)
-            # Insert an 'i' char after the first letter
-            _unit = list(unit)
-            _unit.insert(1, 'i')
-            # Collapse the list back into a 3 letter string
-            unit = ''.join(_unit)
-            unit_class = globals()[unit]
+            unit = unit[0] + 'i' + unit[1:]
+            unit_class = _UNIT_CLASSES[unit]
         else:
             # Default parsing (SI format)
             #
@@ -1539,72 +2565,355 @@ Note the following caveats:
 
             # This is an SI-type unit
             if unit[0] in SI_PREFIXES:
-                unit_class = globals()[unit]
+                unit_class = _UNIT_CLASSES[unit]
     # NIST
     elif len(unit) == 3:
         unit = capitalize_first(unit)
 
         # This is a NIST-type unit
         if unit[:2] in NIST_PREFIXES:
-            unit_class = globals()[unit]
-    else:
-        # This is not a unit we recognize
-        raise ValueError("The unit %s is not a valid bitmath unit" % unit)
+            unit_class = _UNIT_CLASSES[unit]
 
-    try:
-        unit_class
-    except UnboundLocalError:
+    if unit_class is None:
+        # This is not a unit we recognize
         raise ValueError("The unit %s is not a valid bitmath unit" % unit)
 
     return unit_class(float(val))
 
 
+def _parse_uncached(s, strict, system):
+    """The function behind the parse cache"""
+    if strict:
+        return _parse_string(s)
+    return _parse_string_unsafe(s, system)
+
+
+#: Number of parsed strings the parse cache remembers by default
+PARSE_CACHE_SIZE = 4096
+
+# Parsed instances are immutable, so handing the same one out to
+# every caller which parses the same string is safe.
+_parse_cached = functools.lru_cache(maxsize=PARSE_CACHE_SIZE)(_parse_uncached)
+
+
+def parse_cache_info():
+    """Return the statistics of the parse cache, as a named tuple of
+``hits``, ``misses``, ``maxsize``, and ``currsize``."""
+    return _parse_cached.cache_info()
+
+
+def parse_cache_clear():
+    """Empty the parse cache and reset its statistics"""
+    _parse_cached.cache_clear()
+
+
+def parse_cache_resize(maxsize=PARSE_CACHE_SIZE):
+    """Set the number of parsed strings the parse cache remembers. The
+least recently used strings are forgotten first. The cache is emptied
+and its statistics reset. A `maxsize` of 0 disables the cache.
+    """
+    global _parse_cached
+    if isinstance(maxsize, bool) or not isinstance(maxsize, int) or maxsize < 0:
+        raise ValueError("The parse cache size must be an integer 0 or greater, not %r" % (maxsize,))
+    _parse_cached = functools.lru_cache(maxsize=maxsize)(_parse_uncached)
+
+
+def _parse_all(items, strict, system, errors):
+    """Parse each ``(position, string)`` pair of `items`, yielding the
+resulting bitmath instances in order.
+
+The parser (parse_string when `strict`, otherwise parse_string_unsafe
+with `system`) is picked once, up front. Strings are looked up in the
+parse cache. If the cache is disabled, inputs of the common
+'<number> <unit>' shape are handled right here instead. Anything else
+is handed to the parser itself, so results and errors are exactly
+what calling it directly would give.
+
+If `errors` is a list, inputs which fail to parse are appended to it
+as ``(position, string, exception)`` tuples and skipped. Otherwise the
+first failure is raised.
+    """
+    if strict:
+        parse = _parse_string
+        units = _UNIT_CLASSES
+    else:
+        def parse(s):
+            return _parse_string_unsafe(s, system)
+        units = _UNSAFE_NIST_UNITS if system == NIST else _UNSAFE_SI_UNITS
+
+    if _parse_cached.cache_info().maxsize:
+        cached = _parse_cached
+
+        def parse_one(s):
+            if isinstance(s, str):
+                return cached(s, strict, system)
+            return parse(s)
+    else:
+        # Bound once, these are the hot path for large inputs
+        match = _PARSE_RE.match
+        new = object.__new__
+        set_bits = _set_bit_value
+
+        def parse_one(s):
+            if isinstance(s, str):
+                m = match(s)
+                if m is not None:
+                    val, unit = m.groups()
+                    unit_class = units.get(unit if strict else unit.rstrip('Bb'))
+                    if unit_class is not None:
+                        inst = new(unit_class)
+                        set_bits(inst, float(val) * unit_class._unit_bits)
+                        return inst
+            return parse(s)
+
+    for position, s in items:
+        if errors is None:
+            yield parse_one(s)
+        else:
+            try:
+                yield parse_one(s)
+            except (ValueError, KeyError) as e:
+                errors.append((position, s, e))
+
+
+def parse_many(iterable, strict=True, system=SI, unit=None, errors=None):
+    """Parse every string in `iterable`.
+
+``strict`` - True (default) parses each string with parse_string().
+False parses with parse_string_unsafe() instead, and ``system`` is
+passed along to it.
+
+``unit`` - None (default) returns a list of bitmath instances. Give a
+bitmath class (or its name) to get a bitmath.array.BitmathArray in
+that unit instead. That requires NumPy.
+
+``errors`` - None (default) raises on the first string which can't be
+parsed. Give a list to collect ``(index, string, exception)`` tuples
+for each bad string instead; those strings are left out of the
+result.
+    """
+    parsed = _parse_all(enumerate(iterable), strict, system, errors)
+    if unit is None:
+        return list(parsed)
+
+    from bitmath.array import BitmathArray
+    return BitmathArray.from_bits([item._bit_value for item in parsed], unit)
+
+
+def _iter_fields(fileobj, delimiter, field, errors):
+    """Yield ``(line number, string)`` pairs for iterparse()"""
+    for lineno, line in enumerate(fileobj, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if field is None and delimiter is None:
+            yield lineno, line
+            continue
+
+        fields = line.split(delimiter)
+        if field is None:
+            for value in fields:
+                value = value.strip()
+                if value:
+                    yield lineno, value
+        else:
+            try:
+                yield lineno, fields[field].strip()
+            except IndexError:
+                e = ValueError("Line %d has no field %d: '%s'" % (lineno, field, line))
+                if errors is None:
+                    raise e
+                errors.append((lineno, line, e))
+
+
+def iterparse(fileobj, strict=True, system=SI, delimiter=None, field=None,
+              errors=None):
+    """Parse sizes from the lines of `fileobj` (any iterable of text lines,
+such as an open file), yielding bitmath instances as it goes. Blank
+lines are skipped.
+
+By default each whole line is one size. Give ``field`` to split each
+line on ``delimiter`` (any whitespace if ``delimiter`` is None) and
+parse only that field, for example ``field=0`` for ``du -h`` output.
+Give only ``delimiter`` to parse every field of every line.
+
+``strict`` and ``system`` work as they do for parse_many().
+
+``errors`` - None (default) raises on the first bad size. Give a list
+to collect ``(line number, string, exception)`` tuples instead; bad
+sizes are then skipped.
+    """
+    return _parse_all(_iter_fields(fileobj, delimiter, field, errors),
+                      strict, system, errors)
+
+
 ######################################################################
 # Contxt Managers
 @contextlib.contextmanager
-def format(fmt_str=None, plural=False, bestprefix=False):
+def format(fmt_str=None, plural=None, bestprefix=None):
     """Context manager for printing bitmath instances.
 
 ``fmt_str`` - a formatting mini-language compat formatting string. See
 the @properties (above) for a list of available items.
 
 ``plural`` - True enables printing instances with 's's if they're
-plural. False (default) prints them as singular (no trailing 's').
+plural. False prints them as singular (no trailing 's'), which is
+what happens outside of any context.
 
 ``bestprefix`` - True enables printing instances in their best
-human-readable representation. False, the default, prints instances
-using their current prefix unit.
+human-readable representation. False prints instances using their
+current prefix unit, which is what happens outside of any context.
+
+The settings only apply to the current thread (or asyncio task), and
+are undone when the block exits, even if it raises. Contexts may be
+nested: settings which aren't given (or are None) are inherited from
+the enclosing context, and a nested context may switch off a setting
+the enclosing one switched on.
     """
-    if 'bitmath' not in globals():
-        import bitmath
+    outer_fmt_str, outer_plural, outer_bestprefix = \
+        _format_context.get() or (None, None, None)
+    token = _format_context.set((
+        fmt_str or outer_fmt_str,
+        plural if plural is not None else outer_plural,
+        bestprefix if bestprefix is not None else outer_bestprefix))
+    try:
+        yield
+    finally:
+        _format_context.reset(token)
+
+
+def _cli_converter(fromunit, tounit, fmt):
+    """Return a function turning one command line size string into its
+output: a bitmath instance, or a string if `fmt` is given. The unit
+classes are looked up once, here, rather than once per value."""
+    from_class = _UNIT_CLASSES[fromunit]
+    to_class = _UNIT_CLASSES[tounit] if tounit else None
+
+    from_bits = from_class._unit_bits
 
-    if plural:
-        orig_fmt_plural = bitmath.format_plural
-        bitmath.format_plural = True
+    def convert(text):
+        instance = None
+        try:
+            bits = float(text) * from_bits
+        except ValueError:
+            # Not a plain number, so it should carry its own unit
+            instance = parse_string(text.strip())
+            bits = instance.bits
+
+        if to_class is not None:
+            result = to_class._from_bits_unchecked(bits)
+        else:
+            # A parsed SI size stays SI, so the input's own class has
+            # to pick the prefix
+            if instance is None:
+                instance = from_class._from_bits_unchecked(bits)
+            result = instance.best_prefix()
 
-    if fmt_str:
-        orig_fmt_str = bitmath.format_string
-        bitmath.format_string = fmt_str
+        if fmt is not None:
+            return result.format(fmt)
+        return result
 
-    yield
+    return convert
 
-    if plural:
-        bitmath.format_plural = orig_fmt_plural
 
-    if fmt_str:
-        bitmath.format_string = orig_fmt_str
+_CLI_WHITESPACE_SPLIT = re.compile(r'(\s+)').split
 
+#: Number of output lines cli_stream() collects before each write
+CLI_STREAM_CHUNK = 4096
 
-def cli_script_main(cli_args):
+
+def cli_stream(infile, outfile, convert, field=None, delimiter=None,
+               invalid='abort'):
+    """Convert the sizes read from `infile`, one per line, writing the
+results to `outfile` as it goes. Only one chunk of output lines is held
+in memory at a time, however long the input is.
+
+- `convert` - a function turning a size string into its output, such
+  as one from _cli_converter()
+- `field` - None (default) converts each whole line. Give a number
+  (counting from 1) to convert only that field, keeping the rest of the
+  line as it was
+- `delimiter` - the field separator, any run of whitespace if None
+- `invalid` - what to do with a line which can not be converted:
+  'abort' (default) raises ValueError, 'warn' writes a message to
+  stderr and passes the line through unchanged, 'ignore' just passes
+  it through
+
+Blank lines are passed through unchanged.
+    """
+    chunk = []
+    for lineno, line in enumerate(infile, 1):
+        line = line.rstrip('\r\n')
+        try:
+            if not line.strip():
+                chunk.append(line)
+            elif field is None:
+                chunk.append(str(convert(line)))
+            else:
+                if delimiter is None:
+                    parts = _CLI_WHITESPACE_SPLIT(line)
+                    # Fields sit between the separators, after a
+                    # leading empty string if the line is indented
+                    index = (field - 1) * 2 + (2 if parts[0] == '' else 0)
+                else:
+                    parts = line.split(delimiter)
+                    index = field - 1
+                if index >= len(parts) or not parts[index].strip():
+                    raise ValueError("no field %d" % field)
+                parts[index] = str(convert(parts[index]))
+                chunk.append(('' if delimiter is None else delimiter).join(parts))
+        except ValueError as e:
+            if invalid == 'abort':
+                outfile.write(''.join(done + '\n' for done in chunk))
+                outfile.flush()
+                raise ValueError("line %d: %s" % (lineno, e))
+            if invalid == 'warn':
+                sys.stderr.write("bitmath: line %d: %s\n" % (lineno, e))
+            chunk.append(line)
+
+        if len(chunk) >= CLI_STREAM_CHUNK:
+            outfile.write('\n'.join(chunk) + '\n')
+            chunk = []
+
+    if chunk:
+        outfile.write('\n'.join(chunk) + '\n')
+    outfile.flush()
+
+
+def cli_script_main(cli_args, stdin=None, stdout=None):
     """
     A command line interface to basic bitmath operations.
+
+In ``--stream`` mode the results are written to `stdout` (default
+``sys.stdout``) as `stdin` (default ``sys.stdin``) is read, and an empty
+list is returned.
     """
+    import argparse
+
     choices = ALL_UNIT_TYPES
 
     parser = argparse.ArgumentParser(
         description='Converts from one type of size to another.')
     parser.add_argument('--from-stdin', default=False, action='store_true',
                         help='Reads number from stdin rather than the cli')
+    parser.add_argument(
+        '-s', '--stream', default=False, action='store_true',
+        help=('Converts every line read from stdin, writing each result '
+              'as it goes.'))
+    parser.add_argument(
+        '--field', type=int, default=None,
+        help=('With --stream, converts only this field (counting from 1) '
+              'of each line, leaving the rest of the line as it is.'))
+    parser.add_argument(
+        '-d', '--delimiter', default=None,
+        help='Field delimiter for --field. Defaults to whitespace.')
+    parser.add_argument(
+        '--invalid', choices=['abort', 'warn', 'ignore'], default=None,
+        help=('With --stream, what to do with a line which can not be '
+              'converted. Defaults to abort.'))
+    parser.add_argument(
+        '--format', default=None, dest='fmt',
+        help='Format string for each result, such as "{value:.2f} {unit}".')
     parser.add_argument(
         '-f', '--from', choices=choices, nargs=1,
         type=str, dest='fromunit', default=['Byte'],
@@ -1614,31 +2923,50 @@ def cli_script_main(cli_args):
         help=('Input type you are converting to. '
               'Attempts to detect best result if omitted.'), dest='tounit')
     parser.add_argument(
-        'size', nargs='*', type=float,
-        help='The number to convert.')
+        'size', nargs='*', type=str,
+        help=('The number to convert. May carry its own unit, such as '
+              '"10 GiB".'))
 
     args = parser.parse_args(cli_args)
 
-    # Not sure how to cover this with tests, or if the functionality
-    # will remain in this form long enough for it to make writing a
-    # test worth the effort.
-    if args.from_stdin:  # pragma: no cover
-        args.size = [float(sys.stdin.readline()[:-1])]
+    if not args.stream:
+        for option, value in (('--field', args.field),
+                              ('-d/--delimiter', args.delimiter),
+                              ('--invalid', args.invalid)):
+            if value is not None:
+                parser.error("%s only works with --stream" % option)
+    if args.field is not None and args.field < 1:
+        parser.error("--field counts from 1")
+    if args.delimiter is not None and args.field is None:
+        parser.error("-d/--delimiter only works with --field")
+
+    convert = _cli_converter(args.fromunit[0],
+                             args.tounit[0] if args.tounit else None,
+                             args.fmt)
+
+    if stdin is None:
+        stdin = sys.stdin
+
+    if args.stream:
+        if stdout is None:
+            stdout = sys.stdout
+        try:
+            cli_stream(stdin, stdout, convert, args.field, args.delimiter,
+                       args.invalid or 'abort')
+        except ValueError as e:
+            parser.exit(1, "bitmath: %s\n" % e)
+        return []
+
+    if args.from_stdin:
+        args.size = [stdin.readline()]
 
     results = []
 
     for size in args.size:
-        instance = getattr(__import__(
-            'bitmath', fromlist=['True']), args.fromunit[0])(size)
-
-        # If we have a unit provided then use it
-        if args.tounit:
-            result = getattr(instance, args.tounit[0])
-        # Otherwise use the best_prefix call
-        else:
-            result = instance.best_prefix()
-
-        results.append(result)
+        try:
+            results.append(convert(size))
+        except ValueError:
+            parser.error("invalid size: '%s'" % size.strip())
 
     return results
 
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014-2016 Tim Bielawa <timbielawa@gmail.com>
+# See GitHub Contributors Graph for more information
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sub-license, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""asyncio versions of :func:`bitmath.listdir` and :func:`bitmath.getsize`.
+
+The filesystem calls run on a small pool of threads, so a coroutine
+walking a large (or slow, network mounted) tree never blocks the event
+loop. Results come back exactly as the blocking functions would give
+them.
+
+This module is not imported by ``import bitmath``.
+"""
+
+import asyncio
+import concurrent.futures
+import fnmatch
+import functools
+import os
+import re
+import threading
+
+import bitmath
+
+__all__ = ['listdir', 'getsize', 'WORKERS']
+
+#: How many threads the shared pool behind this module has. Change it
+#: before the first call to take effect.
+WORKERS = 8
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """The thread pool every walk shares, unless given one of its own.
+Using a pool of our own keeps long walks from tying up the event
+loop's default executor, which other things (like DNS lookups) need.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=WORKERS, thread_name_prefix='bitmath-aio')
+        return _executor
+
+
+async def getsize(path, bestprefix=True, system=bitmath.NIST, executor=None):
+    """Like :func:`bitmath.getsize`, without blocking the event loop.
+The ``stat()`` runs on `executor`, by default the pool shared by this
+module."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor or _get_executor(),
+        functools.partial(bitmath.getsize, path, bestprefix=bestprefix, system=system))
+
+
+async def listdir(search_base, followlinks=False, filter='*', relpath=False,
+                  bestprefix=False, system=bitmath.NIST, concurrency=4,
+                  ordered=True, executor=None):
+    """Like :func:`bitmath.listdir`, as an asynchronous generator which
+never blocks the event loop. Directories are listed, and their files
+``stat()``'d, on `executor`, by default the pool shared by this
+module.
+
+    - `concurrency` - How many directories this walk may have being
+      scanned, or scanned and waiting to be read, at once (default:
+      4). The walk never gets further ahead of its reader than that,
+      so several walks can share one pool without any of them hogging
+      it, and a walk whose results aren't being read just waits.
+    - `ordered` - ``True`` (default) to get results in the same order
+      as :func:`bitmath.listdir`, or ``False`` to get them in whatever
+      order directories finish being scanned.
+
+The other parameters are the same as for :func:`bitmath.listdir`.
+    """
+    if not isinstance(concurrency, int) or concurrency < 1:
+        raise ValueError("concurrency must be a positive integer, not %r" % (concurrency,))
+
+    executor = executor or _get_executor()
+    match = re.compile(fnmatch.translate(os.path.normcase(filter))).match
+
+    def scan(top):
+        return bitmath._listdir_scan(top, followlinks, match, relpath, bestprefix, system)
+
+    def submit(path):
+        # A concurrent.futures.Future, unlike the asyncio future
+        # run_in_executor() gives, can't be cancelled once it started,
+        # so _schedule_scans() never drops a scan which is under way
+        return executor.submit(scan, path)
+
+    running = set()
+    try:
+        if ordered:
+            stack = [[search_base, None, None]]
+            while stack:
+                bitmath._schedule_scans(stack, running, concurrency, submit)
+                node = stack.pop()
+                results, dirs, error = await asyncio.wrap_future(node[1])
+                running.discard(node[1])
+                if node[2] is None:
+                    node[2] = [[d, None, None] for d in dirs]
+                stack.extend(reversed(node[2]))
+                for result in results:
+                    yield result
+                if error is not None:
+                    raise error
+        else:
+            pending = [search_base]
+            while pending or running:
+                while pending and len(running) < concurrency:
+                    running.add(asyncio.wrap_future(submit(pending.pop())))
+                done, running = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    results, dirs, error = future.result()
+                    pending.extend(reversed(dirs))
+                    for result in results:
+                        yield result
+                    if error is not None:
+                        raise error
+    finally:
+        for future in running:
+            future.cancel()
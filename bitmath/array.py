@@ -0,0 +1,527 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014-2016 Tim Bielawa <timbielawa@gmail.com>
+# See GitHub Contributors Graph for more information
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sub-license, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Vectorized arrays of sizes, backed by NumPy.
+
+A :class:`BitmathArray` holds many sizes of one unit. The sizes are
+stored as a single NumPy array of bits (``int64`` or ``float64``),
+so arithmetic, comparisons, conversions and reductions
+run as NumPy operations instead of one Python object per size.
+
+Indexing a :class:`BitmathArray` with an integer returns an ordinary
+bitmath instance, and iterating over one yields bitmath instances, so
+code written for lists of bitmath instances keeps working.
+
+This module requires NumPy, which is an optional dependency of
+bitmath. It is not imported by ``import bitmath``.
+"""
+
+from __future__ import division
+
+import numbers
+import operator
+
+import numpy
+
+import bitmath
+
+__all__ = ['BitmathArray']
+
+_INT64_MIN = int(numpy.iinfo(numpy.int64).min)
+_INT64_MAX = int(numpy.iinfo(numpy.int64).max)
+_UINT64_MAX = int(numpy.iinfo(numpy.uint64).max)
+
+
+def _unit_class(unit):
+    """Return the bitmath class for `unit`, a class or a unit name"""
+    if isinstance(unit, type) and issubclass(unit, bitmath.Bitmath):
+        return unit
+    if unit in bitmath.ALL_UNIT_TYPES:
+        return getattr(bitmath, unit)
+    raise ValueError("The unit %s is not a valid bitmath unit" % unit)
+
+
+def _best_prefix_table(system):
+    """Return ``(int thresholds, float thresholds, units)`` for vectorized
+best prefix selection in `system`. ``units[i]`` is the best unit for
+byte counts with ``thresholds[i - 1] <= bytes < thresholds[i]``.
+
+The thresholds are the same ones :meth:`bitmath.Bitmath.best_prefix`
+uses. The ``uint64`` ones are capped at the largest ``uint64``, which
+no count of bytes held in ``int64`` bits can reach. The ``float64``
+ones are rounded up, so comparing a float against them gives the same
+answer as comparing it against the exact threshold."""
+    if system != bitmath.NIST and system != bitmath.SI:
+        raise ValueError("Invalid value given for 'system' parameter."
+                         " Must be one of NIST or SI")
+    units = list(bitmath._BEST_PREFIX_UNITS[system])
+    exact = [unit._unit_value for unit in units[1:]]
+    int_thresholds = numpy.array([min(t, _UINT64_MAX) for t in exact], dtype=numpy.uint64)
+    float_thresholds = numpy.array([float(t) for t in exact])
+    rounded_down = numpy.array([float(t) < t for t in exact])
+    float_thresholds[rounded_down] = numpy.nextafter(float_thresholds[rounded_down], numpy.inf)
+    return int_thresholds, float_thresholds, units
+
+
+class BitmathArray(object):
+    """An array of sizes which all share one unit.
+
+``values`` may be a sequence (or NumPy array) of plain numbers, which
+are taken to be in ``unit``, or a sequence of bitmath instances, which
+are converted into ``unit``. ``unit`` is a bitmath class or the name
+of one, and defaults to :class:`bitmath.Byte`.
+
+Integer input is stored as ``int64`` bits as long as it fits,
+anything else is stored as ``float64`` bits. Arithmetic on ``int64``
+bits which would not fit in ``int64`` is done in ``float64`` instead
+of wrapping around, and :meth:`sum` is exact.
+    """
+
+    __slots__ = ('_bits', '_unit')
+
+    # Comparisons are element-wise, like NumPy arrays
+    __hash__ = None
+
+    # Make NumPy defer to our reflected operators (ndarray + ba)
+    __array_ufunc__ = None
+
+    def __init__(self, values=(), unit=bitmath.Byte):
+        unit = _unit_class(unit)
+        if isinstance(values, BitmathArray):
+            bits = values._bits
+        else:
+            if not isinstance(values, numpy.ndarray):
+                values = list(values)
+                if values and isinstance(values[0], bitmath.Bitmath):
+                    values = [v.bits for v in values]
+                    bits = _as_bits_array(numpy.asarray(values), 1)
+                else:
+                    bits = _as_bits_array(numpy.asarray(values), unit._unit_bits)
+            else:
+                bits = _as_bits_array(values, unit._unit_bits)
+        self._init(bits, unit)
+
+    def _init(self, bits, unit):
+        bits.flags.writeable = False
+        object.__setattr__(self, '_bits', bits)
+        object.__setattr__(self, '_unit', unit)
+
+    @classmethod
+    def _from_bits_array(cls, bits, unit):
+        """Internal constructor, wraps an existing array of bits"""
+        inst = object.__new__(cls)
+        inst._init(numpy.asarray(bits), unit)
+        return inst
+
+    @classmethod
+    def from_bytes(cls, values, unit=bitmath.Byte):
+        """Create an array in ``unit`` from a sequence of byte counts"""
+        unit = _unit_class(unit)
+        return cls._from_bits_array(_as_bits_array(numpy.asarray(values), 8), unit)
+
+    @classmethod
+    def from_bits(cls, values, unit=bitmath.Bit):
+        """Create an array in ``unit`` from a sequence of bit counts"""
+        unit = _unit_class(unit)
+        return cls._from_bits_array(_as_bits_array(numpy.asarray(values), 1), unit)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("BitmathArray instances are immutable, can not set '%s'" % name)
+
+    ##################################################################
+    # Properties
+
+    #: The bitmath class of every element
+    unit = property(lambda s: s._unit)
+
+    #: The NumPy array of bits, read-only
+    bits = property(lambda s: s._bits)
+
+    @property
+    def bytes(self):
+        """A NumPy array of the number of bytes in each element"""
+        return self._bits / 8
+
+    @property
+    def value(self):
+        """A NumPy array of the prefix value of each element"""
+        return self._bits / self._unit._unit_bits
+
+    #: Alias for :attr:`value`
+    prefix_value = value
+
+    #: The NumPy dtype of the underlying array of bits
+    dtype = property(lambda s: s._bits.dtype)
+
+    #: The shape of the array
+    shape = property(lambda s: s._bits.shape)
+
+    ##################################################################
+    # Container protocol
+
+    def __len__(self):
+        return len(self._bits)
+
+    def __getitem__(self, key):
+        result = self._bits[key]
+        if isinstance(result, numpy.ndarray):
+            return BitmathArray._from_bits_array(result, self._unit)
+        return self._unit._from_bits_unchecked(result.item())
+
+    def __iter__(self):
+        make = self._unit._from_bits_unchecked
+        for bits in self._bits.tolist():
+            yield make(bits)
+
+    def __array__(self, dtype=None, copy=None):
+        """NumPy sees the prefix values, as ``float(bm)`` would"""
+        value = self.value
+        return value if dtype is None else value.astype(dtype)
+
+    def tolist(self):
+        """Return a list of bitmath instances"""
+        return list(self)
+
+    def __repr__(self):
+        return "BitmathArray(%s, unit=%s)" % (
+            numpy.array2string(self.value, separator=', ',
+                               formatter={'float_kind': lambda x: repr(float(x))}),
+            self._unit.__name__)
+
+    def __str__(self):
+        return "[%s]" % ", ".join(str(item) for item in self)
+
+    ##################################################################
+    # Conversions
+
+    def to(self, unit):
+        """Return the same sizes as a new array in ``unit``. No data is
+copied, only the unit changes."""
+        return BitmathArray._from_bits_array(self._bits, _unit_class(unit))
+
+    def _best_prefix_choices(self, system=None):
+        """Return ``(index, choices)``: an integer array which holds, for
+each element, the index into the object array `choices` of the unit
+:meth:`bitmath.Bitmath.best_prefix` would pick."""
+        if system is None:
+            system = bitmath.SI if self._unit._base == 10 else bitmath.NIST
+        int_thresholds, float_thresholds, units = _best_prefix_table(system)
+        if self._bits.dtype.kind == 'f':
+            abs_bits = numpy.abs(self._bits)
+            index = numpy.searchsorted(float_thresholds, abs_bits / 8, side='right')
+        else:
+            # Whole bytes, as Python ints would count them. Viewed as
+            # unsigned, abs() of the smallest int64 is right too
+            abs_bits = numpy.abs(self._bits).view(numpy.uint64)
+            index = numpy.searchsorted(int_thresholds, abs_bits >> numpy.uint64(3), side='right')
+        choices = numpy.empty(len(units) + 1, dtype=object)
+        choices[:-1] = units
+        choices[-1] = bitmath.Bit
+        # Anything smaller than one Byte is best represented in Bits
+        index[abs_bits < 8] = len(units)
+        return index, choices
+
+    def best_prefix_units(self, system=None):
+        """Return a NumPy object array holding, for each element, the
+bitmath class :meth:`bitmath.Bitmath.best_prefix` would pick.
+
+``system`` is one of :py:data:`bitmath.NIST` or
+:py:data:`bitmath.SI`. By default the system of this array's unit is
+used (:class:`bitmath.Bit` and :class:`bitmath.Byte` default to NIST).
+        """
+        index, choices = self._best_prefix_choices(system)
+        return choices[index]
+
+    def best_prefix(self, system=None):
+        """Return a list of bitmath instances, each in its best
+human-readable prefix unit. Element-wise equivalent to calling
+:meth:`bitmath.Bitmath.best_prefix` on each element."""
+        units = self.best_prefix_units(system=system)
+        return [unit._from_bits_unchecked(bits)
+                for unit, bits in zip(units.tolist(), self._bits.tolist())]
+
+    def format(self, fmt=None, bestprefix=False, system=None):
+        """Return a list of strings, one for each element, formatted with
+``fmt``: a format string or a :class:`bitmath.Formatter`, by default
+the format ``str()`` uses. Element-wise equivalent to calling
+:meth:`bitmath.Bitmath.format` on each element.
+
+If ``bestprefix`` is True, each element is first converted to its best
+prefix unit in ``system``, like :meth:`best_prefix` does.
+        """
+        formatter = bitmath._get_formatter(fmt)
+        if bestprefix:
+            index, choices = self._best_prefix_choices(system)
+        else:
+            index = numpy.zeros(len(self._bits), dtype=numpy.intp)
+            choices = numpy.empty(1, dtype=object)
+            choices[0] = self._unit
+
+        if formatter._template is None or not formatter.fields <= _COLUMN_FIELDS:
+            # Fields which need the instances themselves
+            return [formatter.format(unit._from_bits_unchecked(bits))
+                    for unit, bits in zip(choices[index].tolist(), self._bits.tolist())]
+
+        # Compute each field for all of the elements at once, then
+        # format the rows
+        unit_bits = numpy.array([unit._unit_bits for unit in choices], dtype=object)[index]
+        if self._bits.dtype.kind == 'f':
+            values = self._bits / unit_bits.astype(numpy.float64)
+        else:
+            # Python int division, exact like the instances' own
+            values = numpy.array([bits / unit for bits, unit in
+                                  zip(self._bits.tolist(), unit_bits.tolist())],
+                                 dtype=numpy.float64)
+
+        columns = []
+        for name in formatter._names:
+            if name == 'value':
+                columns.append(values.tolist())
+            elif name == 'unit':
+                singular = _unit_field(choices, 'unit_singular')[index]
+                if bitmath._format_plural():
+                    plural = _unit_field(choices, 'unit_plural')[index]
+                    singular = numpy.where(values == 1, singular, plural)
+                columns.append(singular.tolist())
+            else:
+                columns.append(_unit_field(choices, name)[index].tolist())
+
+        template = formatter._template
+        return [template.format(*row) for row in zip(*columns)]
+
+    ##################################################################
+    # Reductions
+
+    def _scalar(self, bits):
+        return self._unit._from_bits_unchecked(bits.item())
+
+    def sum(self):
+        """The total of all elements, as a bitmath instance"""
+        bits = self._bits
+        bounds = _int_bounds(bits)
+        if bounds is not None and len(bits) * max(-bounds[0], bounds[1]) > _INT64_MAX:
+            # NumPy would wrap around. Add them up as Python ints.
+            return self._unit._from_bits_unchecked(sum(bits.tolist()))
+        return self._scalar(bits.sum())
+
+    def min(self):
+        """The smallest element, as a bitmath instance"""
+        return self._scalar(self._bits.min())
+
+    def max(self):
+        """The largest element, as a bitmath instance"""
+        return self._scalar(self._bits.max())
+
+    def mean(self):
+        """The mean of all elements, as a bitmath instance"""
+        return self._scalar(self._bits.mean())
+
+    ##################################################################
+    # Arithmetic. Result types follow the scalar rules:
+    #
+    # - ba + bm/ba = ba
+    # - ba + num = array of numbers
+    # - ba * num = ba
+    # - ba / num = ba
+    # - ba / bm/ba = array of numbers
+
+    def _other_bits(self, other):
+        if isinstance(other, BitmathArray):
+            return other._bits
+        return other._bit_value
+
+    def __add__(self, other):
+        if isinstance(other, (BitmathArray, bitmath.Bitmath)):
+            return BitmathArray._from_bits_array(
+                _bits_op(operator.add, self._bits, self._other_bits(other)), self._unit)
+        return self.value + other
+
+    def __radd__(self, other):
+        if isinstance(other, bitmath.Bitmath):
+            return BitmathArray._from_bits_array(
+                _bits_op(operator.add, other._bit_value, self._bits), self._unit)
+        return other + self.value
+
+    def __sub__(self, other):
+        if isinstance(other, (BitmathArray, bitmath.Bitmath)):
+            return BitmathArray._from_bits_array(
+                _bits_op(operator.sub, self._bits, self._other_bits(other)), self._unit)
+        return self.value - other
+
+    def __rsub__(self, other):
+        if isinstance(other, bitmath.Bitmath):
+            return BitmathArray._from_bits_array(
+                _bits_op(operator.sub, other._bit_value, self._bits), self._unit)
+        return other - self.value
+
+    def __mul__(self, other):
+        if isinstance(other, (BitmathArray, bitmath.Bitmath)):
+            return NotImplemented
+        return BitmathArray._from_bits_array(
+            _bits_op(operator.mul, self._bits, other), self._unit)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, (BitmathArray, bitmath.Bitmath)):
+            return self._bits / self._other_bits(other)
+        return BitmathArray._from_bits_array(self._bits / other, self._unit)
+
+    __div__ = __truediv__
+
+    def __rtruediv__(self, other):
+        if isinstance(other, bitmath.Bitmath):
+            return other._bit_value / self._bits
+        return other / self.value
+
+    __rdiv__ = __rtruediv__
+
+    def __neg__(self):
+        return BitmathArray._from_bits_array(
+            _bits_op(operator.sub, 0, self._bits), self._unit)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        # abs() overflows exactly where negation does
+        _, bits = _int64_operands(operator.sub, 0, self._bits)
+        return BitmathArray._from_bits_array(numpy.abs(bits), self._unit)
+
+    ##################################################################
+    # Comparisons, element-wise
+
+    def _compare(self, other, op):
+        if isinstance(other, (BitmathArray, bitmath.Bitmath)):
+            return op(self._bits, self._other_bits(other))
+        elif isinstance(other, (numbers.Number, numpy.ndarray)):
+            return op(self.value, other)
+        return NotImplemented
+
+    def __lt__(self, other):
+        return self._compare(other, numpy.less)
+
+    def __le__(self, other):
+        return self._compare(other, numpy.less_equal)
+
+    def __eq__(self, other):
+        return self._compare(other, numpy.equal)
+
+    def __ne__(self, other):
+        return self._compare(other, numpy.not_equal)
+
+    def __gt__(self, other):
+        return self._compare(other, numpy.greater)
+
+    def __ge__(self, other):
+        return self._compare(other, numpy.greater_equal)
+
+
+# The format fields BitmathArray.format() computes without creating
+# an instance for each element. All but 'value' and 'unit' are the
+# same for every instance of a unit.
+_COLUMN_FIELDS = frozenset(['value', 'unit', 'unit_singular', 'unit_plural',
+                            'base', 'power', 'system'])
+
+
+def _unit_field(units, name):
+    """Return an object array of the format field `name` of each of
+`units` (an object array of bitmath classes)"""
+    field = numpy.empty(len(units), dtype=object)
+    field[:] = [getattr(unit._from_bits_unchecked(0), name) for unit in units]
+    return field
+
+
+def _int_bounds(x):
+    """``(smallest, largest)`` of `x` as Python ints, if `x` is an integer
+array or number, otherwise None"""
+    if isinstance(x, numpy.ndarray):
+        if x.dtype.kind not in 'iub':
+            return None
+        if not x.size:
+            return (0, 0)
+        return (int(x.min()), int(x.max()))
+    if isinstance(x, (numbers.Integral, numpy.integer)):
+        return (int(x), int(x))
+    return None
+
+
+def _int64_operands(op, a, b):
+    """Return the operands `a` and `b` of `op` (add, sub or mul) on bits,
+as ``float64`` if any result of ``op(a, b)`` would not fit in ``int64``
+bits. NumPy would silently wrap around."""
+    bounds_a, bounds_b = _int_bounds(a), _int_bounds(b)
+    if bounds_a is None or bounds_b is None:
+        return a, b
+    # The extremes of a sum, difference or product of two ranges are
+    # found at their corners
+    corners = [op(x, y) for x in bounds_a for y in bounds_b]
+    if _INT64_MIN <= min(corners) and max(corners) <= _INT64_MAX:
+        return a, b
+    return _as_float64(a), _as_float64(b)
+
+
+def _as_float64(x):
+    if isinstance(x, numpy.ndarray):
+        return x.astype(numpy.float64)
+    return float(x)
+
+
+def _bits_op(op, a, b):
+    """``op(a, b)`` for bits, without wrapping around past ``int64``"""
+    a, b = _int64_operands(op, a, b)
+    return op(a, b)
+
+
+def _as_bits_array(values, multiplier):
+    """Multiply `values` (an ndarray) by `multiplier` bits. Integer input
+is stored as ``int64`` unless the result would not fit."""
+    kind = values.dtype.kind
+    if kind in 'iub' and values.size:
+        if max(abs(int(values.min())), int(values.max())) <= _INT64_MAX // multiplier:
+            return values.astype(numpy.int64) * numpy.int64(multiplier)
+    elif kind in 'iub':
+        return values.astype(numpy.int64)
+    elif kind not in 'f':
+        if kind == 'O':
+            # Plain python numbers too large for int64
+            return values.astype(numpy.float64) * float(multiplier)
+        raise ValueError("Can not create a BitmathArray from values of type %s" % values.dtype)
+    return values.astype(numpy.float64) * float(multiplier)
+
+
+def _make_converter(name):
+    def converter(self):
+        return self.to(name)
+    converter.__name__ = 'to_%s' % name
+    converter.__doc__ = "Return the same sizes as a new array in %s" % name
+    return converter
+
+
+for _name in bitmath.ALL_UNIT_TYPES:
+    setattr(BitmathArray, 'to_%s' % _name, _make_converter(_name))
+    setattr(BitmathArray, _name, property(_make_converter(_name)))
+del _name
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014-2016 Tim Bielawa <timbielawa@gmail.com>
+# See GitHub Contributors Graph for more information
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sub-license, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""An on-disk index of directory sizes, for cheap repeated du() runs.
+
+A :class:`DiskUsageIndex` remembers what it found in every directory
+of a tree in a SQLite database. The next :meth:`DiskUsageIndex.update`
+still checks every directory, but only lists and ``lstat()``'s the
+contents of directories which changed since the last one. A directory
+which gains, loses or renames an entry gets a new modification time,
+so its total is worked out again. Any directory at all can then be
+summarized from the index, without touching the filesystem.
+
+This module uses :py:mod:`sqlite3`. It is not imported by
+``import bitmath``.
+"""
+
+from __future__ import division
+
+import json
+import os
+import sqlite3
+import stat
+import time
+
+import bitmath
+
+__all__ = ['DiskUsageIndex']
+
+# Bumped whenever the layout of the database changes
+_SCHEMA_VERSION = 1
+
+# A directory changed this recently before an update (FAT only keeps
+# mtimes to 2 seconds) might change again without its times moving.
+# Those are always listed again on the next update.
+_RACY_NS = 2 * 10 ** 9
+
+
+class DiskUsageIndex(object):
+    """An index of the disk usage of the directory tree `root`, kept in
+the SQLite database `index_path`. `apparent` and `one_file_system`
+mean what they do for :func:`bitmath.du`, and are fixed when the index
+is created.
+
+Call :meth:`update` to bring the index up to date with the filesystem,
+then :meth:`du` or :meth:`total` to read sizes from it.
+    """
+
+    def __init__(self, index_path, root, apparent=False, one_file_system=False):
+        self.root = root
+        self.apparent = bool(apparent)
+        self.one_file_system = bool(one_file_system)
+        self._db = sqlite3.connect(index_path)
+        with self._db:
+            self._db.execute("CREATE TABLE IF NOT EXISTS settings "
+                             "(name TEXT PRIMARY KEY, value)")
+            # One row per directory, keyed by its (encoded) path
+            # relative to root. ``own`` is the size of the directory
+            # and the files in it with only one link. ``items`` lists
+            # its subdirectories and its files with several links, as
+            # [st_dev, st_ino, size], in the order they were listed.
+            self._db.execute("CREATE TABLE IF NOT EXISTS dirs "
+                             "(path BLOB PRIMARY KEY, dev INTEGER, ino INTEGER, "
+                             "mtime_ns INTEGER, ctime_ns INTEGER, own INTEGER, "
+                             "items TEXT, generation INTEGER)")
+            settings = {
+                'version': _SCHEMA_VERSION,
+                'root': os.path.abspath(root),
+                'apparent': int(self.apparent),
+                'one_file_system': int(self.one_file_system),
+            }
+            stored = dict(self._db.execute("SELECT name, value FROM settings"))
+            if not stored:
+                self._db.executemany("INSERT INTO settings VALUES (?, ?)",
+                                     list(settings.items()) + [('generation', 0)])
+                stored = settings
+        for name, value in sorted(settings.items()):
+            if stored.get(name) != value:
+                self._db.close()
+                raise ValueError("The index %s was built with %s=%r, not %r" % (
+                    index_path, name, stored.get(name), value))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the index database"""
+        self._db.close()
+
+    def _size(self, st):
+        if self.apparent or not hasattr(st, 'st_blocks'):
+            return st.st_size
+        return st.st_blocks * 512
+
+    def update(self, full=False):
+        """Bring the index up to date with the filesystem, and return
+how many directories had to be listed to do so.
+
+Every directory in the tree is ``lstat()``'d. Directories whose
+inode, modification time and change time are the same as last time
+are taken from the index; only the others are listed, and their
+contents ``lstat()``'d. Set `full` to ``True`` to list every directory
+again regardless.
+
+.. note:: Writing to a file in place, or adding a hard link to it in
+   another directory, leaves the modification time of the directory
+   the file is in alone. Sizes from the index only reflect such
+   changes after the directory itself changes, or after an update
+   with `full` set.
+        """
+        started = time.time_ns()
+        root_st = os.lstat(self.root)
+        if not stat.S_ISDIR(root_st.st_mode):
+            raise ValueError("%s is not a directory" % self.root)
+        root_dev = root_st.st_dev
+
+        listed = 0
+        with self._db:
+            db = self._db
+            generation = db.execute("SELECT value FROM settings "
+                                    "WHERE name = 'generation'").fetchone()[0] + 1
+            stack = [('', self.root, root_st)]
+            while stack:
+                rel, path, st = stack.pop()
+                key = os.fsencode(rel)
+                row = db.execute("SELECT dev, ino, mtime_ns, ctime_ns, items "
+                                 "FROM dirs WHERE path = ?", (key,)).fetchone()
+                if not full and row is not None and row[2] is not None and \
+                   row[:4] == (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_ctime_ns):
+                    # Unchanged, so only its subdirectories need a look
+                    db.execute("UPDATE dirs SET generation = ? WHERE path = ?",
+                               (generation, key))
+                    subdirs = []
+                    for name in json.loads(row[4]):
+                        if not isinstance(name, str):
+                            continue
+                        subpath = os.path.join(path, name)
+                        try:
+                            sub_st = os.lstat(subpath)
+                        except OSError:
+                            continue
+                        if stat.S_ISDIR(sub_st.st_mode):
+                            subdirs.append((name, subpath, sub_st))
+                else:
+                    listed += 1
+                    own = self._size(st)
+                    items = []
+                    subdirs = []
+                    for entry in bitmath._list_dir(path):
+                        try:
+                            entry_st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        if stat.S_ISDIR(entry_st.st_mode):
+                            items.append(entry.name)
+                            subdirs.append((entry.name, entry.path, entry_st))
+                        elif entry_st.st_nlink > 1:
+                            items.append([entry_st.st_dev, entry_st.st_ino,
+                                          self._size(entry_st)])
+                        else:
+                            own += self._size(entry_st)
+                    mtime_ns = st.st_mtime_ns
+                    if max(mtime_ns, st.st_ctime_ns) > started - _RACY_NS:
+                        mtime_ns = None
+                    db.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                               (key, st.st_dev, st.st_ino, mtime_ns, st.st_ctime_ns,
+                                own, json.dumps(items), generation))
+
+                for name, subpath, sub_st in reversed(subdirs):
+                    if self.one_file_system and sub_st.st_dev != root_dev:
+                        continue
+                    stack.append((os.path.join(rel, name) if rel else name,
+                                  subpath, sub_st))
+
+            # Anything not seen this time around is gone
+            db.execute("DELETE FROM dirs WHERE generation != ?", (generation,))
+            db.execute("UPDATE settings SET value = ? WHERE name = 'generation'",
+                       (generation,))
+        return listed
+
+    def _relpath(self, path):
+        """Return `path` relative to the root of the index"""
+        if path is None:
+            return ''
+        rel = os.path.relpath(path, self.root)
+        if rel == os.curdir:
+            return ''
+        if rel == os.pardir or rel.startswith(os.pardir + os.sep):
+            raise ValueError("%s is not inside %s" % (path, self.root))
+        return rel
+
+    def du(self, path=None, max_depth=None, bestprefix=False, system=bitmath.NIST):
+        """Summarize the disk usage of the directory `path` (default:
+the root of the index) from the index, without touching the
+filesystem. The result is what :func:`bitmath.du` would have returned
+for `path` at the last :meth:`update`, with the same `max_depth`,
+`bestprefix` and `system` parameters.
+        """
+        if max_depth is not None and (not isinstance(max_depth, int) or max_depth < 0):
+            raise ValueError("max_depth must be a non-negative integer, not %r" % (max_depth,))
+        if path is None:
+            path = self.root
+        rel = self._relpath(path)
+
+        # Read the whole subtree in one go. Every path under ``key``
+        # sorts between ``key + sep`` and ``key + (sep + 1)``.
+        key = os.fsencode(rel)
+        rows = self._db.execute("SELECT own, items FROM dirs WHERE path = ?", (key,)).fetchall()
+        if not rows:
+            raise ValueError("%s is not in the index" % path)
+        dirs = {key: rows[0]}
+        prefix = key + os.fsencode(os.sep) if key else b''
+        if prefix:
+            subtree = self._db.execute(
+                "SELECT path, own, items FROM dirs WHERE path > ? AND path < ?",
+                (prefix, prefix[:-1] + bytes([prefix[-1] + 1])))
+        else:
+            subtree = self._db.execute("SELECT path, own, items FROM dirs WHERE path != ?", (key,))
+        for sub_key, own, items in subtree:
+            dirs[sub_key] = (own, items)
+
+        # The same walk as bitmath.du(), over the index instead
+        totals = {}
+        seen = set()
+        own, items = dirs[key]
+        stack = [[key, path, own, iter(json.loads(items))]]
+        while stack:
+            frame = stack[-1]
+            for item in frame[3]:
+                if isinstance(item, str):
+                    sub_key = os.fsencode(item) if not frame[0] else \
+                        frame[0] + os.fsencode(os.sep + item)
+                    if sub_key not in dirs:
+                        continue
+                    own, items = dirs[sub_key]
+                    stack.append([sub_key, os.path.join(frame[1], item), own,
+                                  iter(json.loads(items))])
+                    break
+                dev, ino, size = item
+                if (dev, ino) in seen:
+                    continue
+                seen.add((dev, ino))
+                frame[2] += size
+            else:
+                stack.pop()
+                if max_depth is None or len(stack) <= max_depth:
+                    totals[frame[1]] = frame[2]
+                if stack:
+                    stack[-1][2] += frame[2]
+
+        for _path, total in totals.items():
+            total = bitmath.Byte(total)
+            if bestprefix:
+                total = total.best_prefix(system=system)
+            totals[_path] = total
+        return totals
+
+    def total(self, path=None, bestprefix=False, system=bitmath.NIST):
+        """Return the total size of the directory `path` (default: the
+root of the index) from the index, like :meth:`du` with `max_depth`
+of 0.
+        """
+        if path is None:
+            path = self.root
+        return self.du(path, max_depth=0, bestprefix=bestprefix, system=system)[path]
@@ -24,12 +24,25 @@
 # CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-# Kept for backward compatibilty
-from .bmargparse import BitmathType
+# Kept for backward compatibilty: ``from bitmath.integrations import
+# BitmathType`` (or BitmathFileTransferSpeed) still works. Both are
+# only imported on first use, so importing one integration doesn't pay
+# for argparse and progressbar as well.
+_LAZY = {
+    'BitmathType': 'bmargparse',
+    'BitmathFileTransferSpeed': 'bmprogressbar',
+}
 
-try:
-    from .bmprogressbar import BitmathFileTransferSpeed
-except ImportError:
-    # Ignore missing dependency as argparse integration will fail if
-    # progressbar is not installed (#86).
-    pass
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    import importlib
+    try:
+        module = importlib.import_module('.' + _LAZY[name], __name__)
+    except ImportError:
+        # Ignore missing dependency as argparse integration will fail if
+        # progressbar is not installed (#86).
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = globals()[name] = getattr(module, name)
+    return value
@@ -0,0 +1,457 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014-2016 Tim Bielawa <timbielawa@gmail.com>
+# See GitHub Contributors Graph for more information
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sub-license, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""pandas integration: a ``bitmath`` column type.
+
+Importing this module registers the ``bitmath`` extension dtype with
+pandas, and the ``.bm`` accessor for Series of that dtype:
+
+   >>> import pandas as pd
+   >>> import bitmath.integrations.bmpandas
+   >>> sizes = pd.Series(["1 KiB", "3 MiB", "2.5 GiB"], dtype="bitmath[MiB]")
+   >>> sizes.sum()
+   MiB(2563.0009765625)
+   >>> sizes.bm.format("{value:.1f} {unit}").tolist()
+   ['1.0 KiB', '3.0 MiB', '2.5 GiB']
+
+A column is stored as one contiguous ``float64`` NumPy array holding
+the number of bits in each row (``NaN`` for missing values), plus the
+unit shared by the whole column. Reductions, comparisons, arithmetic,
+sorting and groupby run on that array directly.
+"""
+
+from __future__ import division
+
+import numbers
+import re
+
+import numpy
+import pandas
+from pandas.api.extensions import (
+    ExtensionArray,
+    ExtensionDtype,
+    register_extension_dtype,
+    register_series_accessor,
+)
+
+import bitmath
+from bitmath.array import BitmathArray
+
+__all__ = ['BitmathDtype', 'BitmathExtensionArray', 'BitmathAccessor']
+
+
+def _unit_class(unit):
+    if isinstance(unit, type) and issubclass(unit, bitmath.Bitmath):
+        return unit
+    if unit in bitmath.ALL_UNIT_TYPES:
+        return getattr(bitmath, unit)
+    raise TypeError("The unit %s is not a valid bitmath unit" % unit)
+
+
+@register_extension_dtype
+class BitmathDtype(ExtensionDtype):
+    """A pandas dtype for sizes in one bitmath unit, spelled
+``bitmath[UNIT]`` (for example ``bitmath[MiB]``). Plain ``bitmath``
+means ``bitmath[Byte]``."""
+
+    _match = re.compile(r'^bitmath(?:\[(?P<unit>\w+)\])?$')
+    type = bitmath.Bitmath
+    kind = 'O'
+    na_value = numpy.nan
+    _metadata = ('unit',)
+
+    def __init__(self, unit=bitmath.Byte):
+        self.unit = _unit_class(unit)
+
+    @property
+    def name(self):
+        return 'bitmath[%s]' % self.unit.__name__
+
+    @classmethod
+    def construct_from_string(cls, string):
+        if not isinstance(string, str):
+            raise TypeError("'construct_from_string' expects a string, got %s" % type(string))
+        match = cls._match.match(string)
+        if match is None:
+            raise TypeError("Cannot construct a 'BitmathDtype' from '%s'" % string)
+        return cls(match.group('unit') or bitmath.Byte)
+
+    @classmethod
+    def construct_array_type(cls):
+        return BitmathExtensionArray
+
+    @property
+    def _is_numeric(self):
+        return True
+
+
+def _to_bits(scalar, unit):
+    """Return the number of bits in one input scalar, NaN for missing
+values. Plain numbers (and strings of them) are values in ``unit``,
+other strings are parsed with :func:`bitmath.parse_string`."""
+    if isinstance(scalar, bitmath.Bitmath):
+        return float(scalar.bits)
+    if isinstance(scalar, numbers.Number):
+        return scalar * unit._unit_bits
+    if scalar is None or scalar is pandas.NA or scalar is pandas.NaT:
+        return numpy.nan
+    if isinstance(scalar, str):
+        scalar = scalar.strip()
+        if not scalar:
+            return numpy.nan
+        try:
+            return float(scalar) * unit._unit_bits
+        except ValueError:
+            return float(bitmath.parse_string(scalar).bits)
+    raise TypeError("Can not store %r in a bitmath column" % (scalar,))
+
+
+class BitmathExtensionArray(ExtensionArray):
+    """pandas ExtensionArray of sizes sharing one unit. The sizes are held
+in a ``float64`` array of bits."""
+
+    __array_priority__ = 1000
+
+    def __init__(self, bits, dtype=None):
+        if dtype is None:
+            dtype = BitmathDtype()
+        self._bits = numpy.asarray(bits, dtype=numpy.float64)
+        self._dtype = dtype
+
+    ##################################################################
+    # Construction
+
+    @classmethod
+    def _from_sequence(cls, scalars, dtype=None, copy=False):
+        if isinstance(dtype, str):
+            dtype = BitmathDtype.construct_from_string(dtype)
+        elif dtype is None:
+            dtype = BitmathDtype()
+        if isinstance(scalars, BitmathExtensionArray):
+            bits = scalars._bits.copy() if copy else scalars._bits
+            return cls(bits, dtype)
+        if isinstance(scalars, BitmathArray):
+            return cls(scalars.bits.astype(numpy.float64), dtype)
+        scalars = numpy.asarray(scalars, dtype=object) \
+            if not isinstance(scalars, numpy.ndarray) else scalars
+        if scalars.dtype.kind in 'iuf':
+            # Plain numbers are values in the unit of the dtype
+            return cls(scalars.astype(numpy.float64) * dtype.unit._unit_bits, dtype)
+        unit = dtype.unit
+        return cls(numpy.fromiter((_to_bits(scalar, unit) for scalar in scalars),
+                                  dtype=numpy.float64, count=len(scalars)), dtype)
+
+    @classmethod
+    def _from_sequence_of_strings(cls, strings, dtype=None, copy=False):
+        """Used by read_csv(..., dtype="bitmath[UNIT]"). Each string is
+parsed with :func:`bitmath.parse_string`. Strings without a unit are
+values in the unit of ``dtype``. Empty strings are missing values."""
+        if dtype is None:
+            dtype = BitmathDtype()
+        unit = dtype.unit
+        return cls(numpy.fromiter((_to_bits(string, unit) for string in strings),
+                                  dtype=numpy.float64, count=len(strings)), dtype)
+
+    @classmethod
+    def _from_factorized(cls, values, original):
+        return cls(values, original.dtype)
+
+    @classmethod
+    def _concat_same_type(cls, to_concat):
+        to_concat = list(to_concat)
+        return cls(numpy.concatenate([arr._bits for arr in to_concat]),
+                   to_concat[0].dtype)
+
+    ##################################################################
+    # The required ExtensionArray interface
+
+    dtype = property(lambda s: s._dtype)
+
+    @property
+    def nbytes(self):
+        return self._bits.nbytes
+
+    def __len__(self):
+        return len(self._bits)
+
+    def __getitem__(self, item):
+        if isinstance(item, tuple) and len(item) == 1:
+            item = item[0]
+        if pandas.api.types.is_integer(item):
+            bits = self._bits[item]
+            if numpy.isnan(bits):
+                return self._dtype.na_value
+            return self._dtype.unit._from_bits_unchecked(float(bits))
+        item = pandas.api.indexers.check_array_indexer(self, item)
+        return type(self)(self._bits[item], self._dtype)
+
+    def __setitem__(self, key, value):
+        if pandas.api.types.is_list_like(value) and not isinstance(value, str):
+            value = type(self)._from_sequence(value, dtype=self._dtype)._bits
+        else:
+            value = _to_bits(value, self._dtype.unit)
+        key = pandas.api.indexers.check_array_indexer(self, key)
+        self._bits[key] = value
+
+    def isna(self):
+        return numpy.isnan(self._bits)
+
+    def take(self, indices, allow_fill=False, fill_value=None):
+        from pandas.api.extensions import take
+        if allow_fill and fill_value is not None:
+            fill_value = _to_bits(fill_value, self._dtype.unit)
+        result = take(self._bits, indices, allow_fill=allow_fill,
+                      fill_value=numpy.nan if fill_value is None else fill_value)
+        return type(self)(result, self._dtype)
+
+    def copy(self):
+        return type(self)(self._bits.copy(), self._dtype)
+
+    def _values_for_argsort(self):
+        return self._bits
+
+    def _values_for_factorize(self):
+        return self._bits, numpy.nan
+
+    def __array__(self, dtype=None, copy=None):
+        return self.to_numpy(dtype=dtype)
+
+    def to_numpy(self, dtype=None, copy=False, na_value=None):
+        """Convert to a NumPy array of bitmath instances, or of prefix
+values when a numeric ``dtype`` is requested"""
+        if dtype is not None and numpy.dtype(dtype).kind in 'iuf':
+            values = self._bits / self._dtype.unit._unit_bits
+            if na_value is not None:
+                values = numpy.where(numpy.isnan(values), na_value, values)
+            return values.astype(dtype)
+        result = numpy.empty(len(self), dtype=object)
+        result[:] = [self[i] if na_value is None or not numpy.isnan(bits) else na_value
+                     for i, bits in enumerate(self._bits)]
+        return result
+
+    def astype(self, dtype, copy=True):
+        """``astype("bitmath[UNIT]")`` changes the unit of the column,
+numeric dtypes give the prefix values, ``str`` gives formatted
+strings."""
+        if isinstance(dtype, str):
+            try:
+                dtype = BitmathDtype.construct_from_string(dtype)
+            except TypeError:
+                pass
+        if isinstance(dtype, BitmathDtype):
+            return type(self)(self._bits.copy() if copy else self._bits, dtype)
+        dtype = pandas.api.types.pandas_dtype(dtype)
+        if dtype.kind in 'iuf':
+            return self.to_numpy(dtype=dtype)
+        if dtype.kind in 'OSU' and dtype != numpy.dtype(object):
+            return numpy.array([str(item) for item in self], dtype=dtype)
+        return super(BitmathExtensionArray, self).astype(dtype, copy=copy)
+
+    def _formatter(self, boxed=False):
+        return str if boxed else repr
+
+    ##################################################################
+    # Reductions
+
+    _REDUCTIONS = {
+        'sum': numpy.nansum, 'min': numpy.nanmin, 'max': numpy.nanmax,
+        'mean': numpy.nanmean, 'median': numpy.nanmedian,
+        'std': numpy.nanstd,
+    }
+
+    def _reduce(self, name, skipna=True, keepdims=False, **kwargs):
+        if name not in self._REDUCTIONS:
+            raise TypeError("bitmath columns do not support the '%s' reduction" % name)
+        bits = self._bits
+        if not skipna and numpy.isnan(bits).any():
+            result = numpy.nan
+        elif name == 'sum' and kwargs.get('min_count', 0) > numpy.count_nonzero(~numpy.isnan(bits)):
+            result = numpy.nan
+        elif not len(bits) or numpy.isnan(bits).all():
+            result = 0.0 if name == 'sum' else numpy.nan
+        elif name == 'std':
+            result = numpy.nanstd(bits, ddof=kwargs.get('ddof', 1))
+        else:
+            result = self._REDUCTIONS[name](bits)
+        if keepdims:
+            return type(self)(numpy.array([result]), self._dtype)
+        if numpy.isnan(result):
+            return self._dtype.na_value
+        return self._dtype.unit._from_bits_unchecked(float(result))
+
+    def _quantile(self, qs, interpolation):
+        """Quantiles of the bits, skipping missing values. The result keeps
+the unit of the column."""
+        bits = self._bits[~numpy.isnan(self._bits)]
+        if len(bits):
+            result = numpy.quantile(bits, qs, method=interpolation)
+        else:
+            result = numpy.full(len(qs), numpy.nan)
+        return type(self)(result, self._dtype)
+
+    _GROUPBY_OPS = ('sum', 'min', 'max', 'mean', 'median', 'first', 'last', 'std')
+
+    def _groupby_op(self, how, has_dropped_na, min_count, ngroups, ids, **kwargs):
+        """Group-wise reductions, computed on the float64 bits array"""
+        if how not in self._GROUPBY_OPS:
+            return super(BitmathExtensionArray, self)._groupby_op(
+                how=how, has_dropped_na=has_dropped_na, min_count=min_count,
+                ngroups=ngroups, ids=ids, **kwargs)
+        mask = ids >= 0
+        grouped = pandas.Series(self._bits[mask]).groupby(ids[mask])
+        if how == 'sum':
+            result = grouped.sum(min_count=min_count)
+        elif how == 'std':
+            result = grouped.std(ddof=kwargs.get('ddof', 1))
+        else:
+            result = getattr(grouped, how)()
+        result = result.reindex(range(ngroups)).to_numpy(numpy.float64)
+        return type(self)(result, self._dtype)
+
+    ##################################################################
+    # Arithmetic and comparisons, with the bitmath result type rules
+
+    def _other_bits(self, other):
+        if isinstance(other, pandas.Series):
+            other = other.array
+        if isinstance(other, BitmathExtensionArray):
+            return other._bits
+        if isinstance(other, bitmath.Bitmath):
+            return float(other.bits)
+        return None
+
+    def _size_op(self, other, op):
+        other_bits = self._other_bits(other)
+        if other_bits is None:
+            return NotImplemented
+        return type(self)(op(self._bits, other_bits), self._dtype)
+
+    def __add__(self, other):
+        return self._size_op(other, numpy.add)
+
+    def __radd__(self, other):
+        return self._size_op(other, lambda a, b: numpy.add(b, a))
+
+    def __sub__(self, other):
+        return self._size_op(other, numpy.subtract)
+
+    def __rsub__(self, other):
+        return self._size_op(other, lambda a, b: numpy.subtract(b, a))
+
+    def __mul__(self, other):
+        if self._other_bits(other) is not None:
+            return NotImplemented
+        return type(self)(self._bits * numpy.asarray(other, dtype=numpy.float64), self._dtype)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        other_bits = self._other_bits(other)
+        if other_bits is not None:
+            return self._bits / other_bits
+        return type(self)(self._bits / numpy.asarray(other, dtype=numpy.float64), self._dtype)
+
+    def _compare(self, other, op):
+        other_bits = self._other_bits(other)
+        if other_bits is None:
+            if isinstance(other, (numbers.Number, numpy.ndarray, list)):
+                result = op(self._bits / self._dtype.unit._unit_bits, other)
+            else:
+                return NotImplemented
+        else:
+            result = op(self._bits, other_bits)
+        return numpy.asarray(result, dtype=bool)
+
+    def __eq__(self, other):
+        return self._compare(other, numpy.equal)
+
+    def __ne__(self, other):
+        return self._compare(other, numpy.not_equal)
+
+    def __lt__(self, other):
+        return self._compare(other, numpy.less)
+
+    def __le__(self, other):
+        return self._compare(other, numpy.less_equal)
+
+    def __gt__(self, other):
+        return self._compare(other, numpy.greater)
+
+    def __ge__(self, other):
+        return self._compare(other, numpy.greater_equal)
+
+
+@register_series_accessor('bm')
+class BitmathAccessor(object):
+    """The ``.bm`` accessor for Series of ``bitmath`` dtype"""
+
+    def __init__(self, series):
+        if not isinstance(series.dtype, BitmathDtype):
+            raise AttributeError("The .bm accessor is only valid for Series of bitmath dtype")
+        self._series = series
+
+    @property
+    def bits(self):
+        """The number of bits in each row, as a float64 Series"""
+        return pandas.Series(self._series.array._bits, index=self._series.index,
+                             name=self._series.name)
+
+    @property
+    def bytes(self):
+        """The number of bytes in each row, as a float64 Series"""
+        return self.bits / 8
+
+    @property
+    def value(self):
+        """The prefix value of each row, as a float64 Series"""
+        return self.bits / self._series.dtype.unit._unit_bits
+
+    def to(self, unit):
+        """Return the Series converted to ``unit``"""
+        return self._series.astype(BitmathDtype(unit))
+
+    def best_prefix(self, system=None):
+        """Return an object Series holding each row in its best
+human-readable prefix unit. Missing values stay missing."""
+        bits = self._series.array._bits
+        result = numpy.full(len(bits), numpy.nan, dtype=object)
+        present = ~numpy.isnan(bits)
+        array = BitmathArray._from_bits_array(bits[present], self._series.dtype.unit)
+        result[present] = array.best_prefix(system=system)
+        return pandas.Series(result, index=self._series.index, name=self._series.name)
+
+    def format(self, fmt_str=None, bestprefix=True, system=None):
+        """Return a Series of strings, each row formatted with ``fmt_str``
+(default: the format ``str()`` uses, see :func:`bitmath.format`). By
+default each row is first converted to its best prefix unit. Missing
+values stay missing."""
+        bits = self._series.array._bits
+        strings = numpy.full(len(bits), numpy.nan, dtype=object)
+        present = ~numpy.isnan(bits)
+        array = BitmathArray._from_bits_array(bits[present], self._series.dtype.unit)
+        strings[present] = array.format(fmt_str, bestprefix=bestprefix, system=system)
+        return pandas.Series(strings, index=self._series.index,
+                             name=self._series.name, dtype=object)
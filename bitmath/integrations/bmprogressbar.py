@@ -3,7 +3,11 @@ import progressbar.widgets
 
 
 class BitmathFileTransferSpeed(progressbar.widgets.Widget):
-    """Widget for showing the transfer speed (useful for file transfers)."""
+    """Widget for showing the transfer speed (useful for file transfers).
+
+``format`` may be a format string or a :class:`bitmath.Formatter`.
+Format strings are compiled on first use and reused on every update
+after that."""
     __slots__ = ('system', 'format')
 
     def __init__(self, system=bitmath.NIST, format="{value:.2f} {unit}/s"):
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Throughput of common arithmetic and conversion operations.
+
+Each operation is timed with timeit and reported as operations per
+second.
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import timeit
+
+# The timed code imports bitmath from this checkout
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+NUMBER = 200000
+
+SETUP = """
+import bitmath
+a = bitmath.MiB(1.5)
+b = bitmath.KiB(300)
+"""
+
+STATEMENTS = [
+    ('a + b', 'a + b'),
+    ('a - b', 'a - b'),
+    ('a * 3', 'a * 3'),
+    ('a / 3', 'a / 3'),
+    ('a.to_KiB()', 'a.to_KiB()'),
+    ('KiB.from_other(a)', 'bitmath.KiB.from_other(a)'),
+    ('a.best_prefix()', 'a.best_prefix()'),
+    ('MiB(1.5)', 'bitmath.MiB(1.5)'),
+]
+
+
+def main():
+    for label, stmt in STATEMENTS:
+        best = min(timeit.repeat(stmt, setup=SETUP, number=NUMBER, repeat=3))
+        print("%-20s %12.0f ops/sec" % (label, NUMBER / best))
+
+
+if __name__ == '__main__':
+    main()
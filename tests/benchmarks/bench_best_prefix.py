@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Throughput of best_prefix, as used for every value printed by the CLI
+and on every tick of the progressbar transfer speed widget.
+
+Each case is timed with timeit and reported as calls per second.
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import timeit
+
+# The timed code imports bitmath from this checkout
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+NUMBER = 200000
+
+SETUP = """
+import bitmath
+small = bitmath.Bit(5)
+byte = bitmath.Byte(700)
+nist = bitmath.KiB(3.5 * 1024 ** 3)
+si = bitmath.Byte(4700000000)
+huge = bitmath.Byte(2 ** 100)
+"""
+
+STATEMENTS = [
+    ('Bit(5)', 'small.best_prefix()'),
+    ('Byte(700)', 'byte.best_prefix()'),
+    ('KiB float, NIST', 'nist.best_prefix()'),
+    ('Byte int, SI', 'si.best_prefix(system=bitmath.SI)'),
+    ('Byte(2 ** 100)', 'huge.best_prefix()'),
+    ('best_prefix(float)', 'bitmath.best_prefix(123456789.0)'),
+]
+
+
+def main():
+    for label, stmt in STATEMENTS:
+        best = min(timeit.repeat(stmt, setup=SETUP, number=NUMBER, repeat=3))
+        print("%-20s %12.0f calls/sec" % (label, NUMBER / best))
+
+
+if __name__ == '__main__':
+    main()
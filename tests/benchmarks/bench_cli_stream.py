@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Streaming sizes through the bitmath command line tool.
+
+Feeds generated lines (one million by default) through cli_stream(),
+the ``bitmath --stream`` loop, and throws the output away. Pass a
+different line count as the first argument, for example::
+
+   $ python tests/benchmarks/bench_cli_stream.py 10000000
+
+The lines are generated as they are read, so the peak RSS printed at
+the end should not grow with the line count.
+"""
+
+from __future__ import print_function
+
+import os
+import random
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+import bitmath  # noqa: E402
+
+LINES = 1000000
+
+
+class Discard(object):
+    def write(self, data):
+        pass
+
+    def flush(self):
+        pass
+
+
+def lines(count, template):
+    rand = random.Random(42)
+    for _ in range(count):
+        yield template % rand.randrange(10 ** 12)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else LINES
+    for label, template, kwargs in [
+            ('best prefix', '%d\n', {}),
+            ('-t MiB', '%d\n', {'tounit': 'MiB'}),
+            ('--format', '%d\n', {'fmt': '{value:.1f}{unit}'}),
+            ('with units', '%d KiB\n', {}),
+            ('--field 2', 'file %d x\n', {'field': 2})]:
+        convert = bitmath._cli_converter(
+            'Byte', kwargs.get('tounit'), kwargs.get('fmt'))
+        start = time.time()
+        bitmath.cli_stream(lines(count, template), Discard(), convert,
+                           field=kwargs.get('field'))
+        elapsed = time.time() - start
+        print("%-12s %10d lines %8.2fs %12.0f lines/sec" % (
+            label, count, elapsed, count / elapsed))
+    print("peak RSS: %d KiB" %
+          resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Throughput of formatting instances as strings, with str(), repr(),
+and the format() method, and of rendering a table of sizes with
+format_many().
+
+Each operation is timed with timeit and reported as operations per
+second.
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import timeit
+
+# The timed code imports bitmath from this checkout
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+NUMBER = 200000
+
+SETUP = """
+import bitmath
+a = bitmath.MiB(1.5)
+big = bitmath.Byte(2 ** 80)
+fmt = bitmath.Formatter("{value:.2f} {unit}")
+"""
+
+STATEMENTS = [
+    ('str(a)', 'str(a)'),
+    ('repr(a)', 'repr(a)'),
+    ('a.format(...)', 'a.format("{value:.2f} {unit}")'),
+    ('big.format(...)', 'big.format("{value:.2f} {unit}")'),
+    ('Formatter.format(a)', 'fmt.format(a)'),
+]
+
+
+# Rendering a table of sizes, one row per size
+TABLE_SETUP = """
+import bitmath
+import random
+random.seed(42)
+counts = [random.randint(0, 2 ** 50) for _ in range(100000)]
+"""
+
+TABLE_STATEMENTS = [
+    ('best_prefix().format', '[bitmath.Byte(c).best_prefix().format("{value:.2f} {unit}") for c in counts]'),
+    ('format_many', 'bitmath.format_many(counts, "{value:.2f} {unit}")'),
+]
+
+
+def main():
+    for label, stmt in STATEMENTS:
+        best = min(timeit.repeat(stmt, setup=SETUP, number=NUMBER, repeat=3))
+        print("%-20s %12.0f ops/sec" % (label, NUMBER / best))
+    for label, stmt in TABLE_STATEMENTS:
+        best = min(timeit.repeat(stmt, setup=TABLE_SETUP, number=1, repeat=3))
+        print("%-20s %12.0f rows/sec" % (label, 100000 / best))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+How long ``import bitmath`` takes in a fresh interpreter.
+
+Runs ``python -X importtime -c 'import bitmath'`` a number of times
+(20 by default) from the top of the source tree and prints the median
+and best cumulative import time, followed by the modules which cost
+the most in one of the runs. Pass a different run count as the first
+argument, for example::
+
+   $ python tests/benchmarks/bench_import.py 50
+
+Unlike the other benchmarks this one has a budget: it exits with
+status 1 if the median is over BUDGET_MS. Only ``argparse`` and the
+other modules the CLI and filesystem helpers need would be expected to
+push it that far, see tests/test_import_time.py. Raise the budget with
+``BITMATH_IMPORT_BUDGET_MS`` on a slow host.
+
+Byte-compiled files are written and warmed up first (whatever
+``PYTHONDONTWRITEBYTECODE`` says), because an installed bitmath would
+have them.
+"""
+
+from __future__ import print_function
+
+import os
+import subprocess
+import sys
+
+RUNS = 20
+BUDGET_MS = 30.0
+TOP = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+
+
+def import_times():
+    """Run one import, returning ``[(self us, cumulative us, module)]``"""
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import bitmath'],
+                          cwd=TOP, env=env, stderr=subprocess.PIPE,
+                          universal_newlines=True, check=True)
+    times = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative, name = line[len('import time:'):].split('|')
+        times.append((int(self_us), int(cumulative), name.strip()))
+    return times
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else RUNS
+    budget = float(os.environ.get('BITMATH_IMPORT_BUDGET_MS', BUDGET_MS))
+
+    import_times()
+    totals = []
+    for _ in range(runs):
+        times = import_times()
+        totals.append(dict((name, cumulative)
+                           for _, cumulative, name in times)['bitmath'] / 1000.0)
+    totals.sort()
+    median = totals[len(totals) // 2]
+
+    print("import bitmath: median %.1f ms, best %.1f ms over %d runs "
+          "(budget %.1f ms)" % (median, totals[0], runs, budget))
+    print("slowest modules (self time) in the last run:")
+    for self_us, _, name in sorted(times, reverse=True)[:10]:
+        print("  %8.1f ms  %s" % (self_us / 1000.0, name))
+
+    if median > budget:
+        print("import bitmath is over budget")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Walking a large tree with bitmath.listdir.
+
+Builds a synthetic tree of empty files in a temporary directory (one
+million files by default, 1000 per directory) and times a full
+listdir() over it. Pass a different file count as the first argument,
+for example::
+
+   $ python tests/benchmarks/bench_listdir.py 100000
+
+The tree is built once and removed afterwards. The plain walk is run
+twice; the second pass is the one with a warm dentry/inode cache.
+
+The ``workers`` cases only pay off where stat() has to wait on the
+network (NFS, SMB, FUSE). Run the script from such a mount with
+``TMPDIR`` pointing at it to see that; on a local disk they mostly
+measure the cost of handing results between threads.
+"""
+
+from __future__ import print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+import bitmath  # noqa: E402
+
+FILES = 1000000
+PER_DIR = 1000
+
+
+def build_tree(base, files):
+    for n in range(files):
+        if n % PER_DIR == 0:
+            d = os.path.join(base, 'd%04d' % (n // PER_DIR))
+            os.mkdir(d)
+        open(os.path.join(d, 'f%04d' % (n % PER_DIR)), 'w').close()
+
+
+def walk(base, **kwargs):
+    start = time.time()
+    count = 0
+    for _ in bitmath.listdir(base, **kwargs):
+        count += 1
+    return count, time.time() - start
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else FILES
+    base = tempfile.mkdtemp(prefix='bitmath-bench-')
+    try:
+        start = time.time()
+        build_tree(base, files)
+        print("built %d files in %.1fs" % (files, time.time() - start))
+        for label, kwargs in [
+                ('listdir (1st pass)', {}),
+                ('listdir', {}),
+                ('listdir bestprefix', {'bestprefix': True}),
+                ('listdir relpath', {'relpath': True}),
+                ('listdir filter', {'filter': '*7'}),
+                ('workers=8', {'workers': 8}),
+                ('workers=8 unordered', {'workers': 8, 'ordered': False})]:
+            count, elapsed = walk(base, **kwargs)
+            print("%-20s %8d files %8.2fs %12.0f files/sec" % (
+                label, count, elapsed, count / elapsed))
+    finally:
+        shutil.rmtree(base)
+
+
+if __name__ == '__main__':
+    main()
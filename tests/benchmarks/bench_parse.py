@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Parsing throughput of parse_string, parse_string_unsafe, and the bulk
+parse_many.
+
+Each parser is run over a list of typical inputs (as found in logs
+and `du`/`ls -h` output) and the rate is reported as strings per
+second. Like real logs, the inputs repeat, so each parser is timed
+with the parse cache disabled and with it enabled.
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+import bitmath  # noqa: E402
+
+NUMBER = 20
+
+SAFE_INPUTS = ['4.7 GiB', '512MiB', '1.5 kB', '100 Mb', '3 B', '12 TiB',
+               '0.25 EB', '1024 KiB', '8b', '700 MB'] * 1000
+
+UNSAFE_INPUTS = ['4.0K', '512M', '1.5G', '100k', '3', '12TiB', '0.25 e',
+                 '1024 KiB', '2.7 kb', '700mb'] * 1000
+
+
+def run(label, stmt, inputs):
+    best = min(timeit.repeat(stmt, number=NUMBER, repeat=3,
+                             globals={'bitmath': bitmath, 'inputs': inputs}))
+    print("%-32s %12.0f strings/sec" % (label, NUMBER * len(inputs) / best))
+
+
+def main():
+    for label, stmt, inputs in [
+            ('parse_string', 'for s in inputs: bitmath.parse_string(s)', SAFE_INPUTS),
+            ('parse_string_unsafe', 'for s in inputs: bitmath.parse_string_unsafe(s)', UNSAFE_INPUTS),
+            ('parse_many', 'bitmath.parse_many(inputs)', SAFE_INPUTS),
+            ('parse_many unsafe', 'bitmath.parse_many(inputs, strict=False)', UNSAFE_INPUTS)]:
+        bitmath.parse_cache_resize(0)
+        run(label + ' (no cache)', stmt, inputs)
+        bitmath.parse_cache_resize()
+        run(label + ' (cache)', stmt, inputs)
+
+
+if __name__ == '__main__':
+    main()
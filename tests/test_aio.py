@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Tests for bitmath.aio, the asyncio listdir and getsize
+"""
+
+from . import TestCase
+import bitmath
+import bitmath.aio
+import asyncio
+import concurrent.futures
+import mock
+import os
+import shutil
+import tempfile
+import time
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def collect(agen):
+    return [item async for item in agen]
+
+
+class TestAio(TestCase):
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+        size = 0
+        for i in range(3):
+            for j in range(3):
+                d = os.path.join(self.base, 'd%d' % i, 's%d' % j)
+                os.makedirs(d)
+                size += 1
+                with open(os.path.join(d, 'f.txt'), 'wb') as f:
+                    f.write(b'x' * size)
+
+    def tearDown(self):
+        shutil.rmtree(self.base)
+
+    def test_aio_listdir(self):
+        """aio.listdir: same results, in the same order, as listdir"""
+        expected = list(bitmath.listdir(self.base))
+        self.assertEqual(len(expected), 9)
+        for concurrency in (1, 4):
+            result = run(collect(bitmath.aio.listdir(self.base, concurrency=concurrency)))
+            self.assertListEqual(result, expected)
+
+    def test_aio_listdir_options(self):
+        """aio.listdir: honors the listdir parameters"""
+        kwargs = {'followlinks': True, 'relpath': True, 'bestprefix': True,
+                  'filter': '*_file*'}
+        expected = list(bitmath.listdir('./tests/listdir_symlinks/', **kwargs))
+        result = run(collect(bitmath.aio.listdir('./tests/listdir_symlinks/', **kwargs)))
+        self.assertListEqual(result, expected)
+
+    def test_aio_listdir_filter_normcase(self):
+        """aio.listdir: the filter is normcased like the file names"""
+        with mock.patch('os.path.normcase', str.lower):
+            result = run(collect(bitmath.aio.listdir(self.base, filter='*.TXT')))
+        self.assertEqual(len(result), 9)
+
+    def test_aio_listdir_scans_once(self):
+        """aio.listdir: a scan which has started is never dropped and redone"""
+        for i in range(3):
+            for j in range(3):
+                os.makedirs(os.path.join(self.base, 'x', 'd%d' % i, 't%d' % j))
+        scan = bitmath._listdir_scan
+        scanned = []
+
+        def slow_scan(top, *args):
+            scanned.append(top)
+            # The second directory is still being scanned when the
+            # subdirectories of the first need its place in the window
+            time.sleep({2: 0.01, 3: 0.1}.get(len(scanned), 0))
+            return scan(top, *args)
+
+        with mock.patch('bitmath._listdir_scan', side_effect=slow_scan):
+            run(collect(bitmath.aio.listdir(os.path.join(self.base, 'x'), concurrency=2)))
+        self.assertEqual(len(scanned), 13)
+        self.assertEqual(len(set(scanned)), 13)
+
+    def test_aio_listdir_unordered(self):
+        """aio.listdir: unordered gives the same results in any order"""
+        expected = sorted(bitmath.listdir(self.base))
+        result = run(collect(bitmath.aio.listdir(self.base, ordered=False)))
+        self.assertListEqual(sorted(result), expected)
+
+    def test_aio_listdir_executor(self):
+        """aio.listdir: walks can run on an executor of their own"""
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            result = run(collect(bitmath.aio.listdir(self.base, executor=executor)))
+        self.assertListEqual(result, list(bitmath.listdir(self.base)))
+
+    def test_aio_listdir_concurrent_walks(self):
+        """aio.listdir: several walks can run at once"""
+        async def walks():
+            return await asyncio.gather(*[collect(bitmath.aio.listdir(self.base))
+                                          for _ in range(3)])
+        expected = list(bitmath.listdir(self.base))
+        for result in run(walks()):
+            self.assertListEqual(result, expected)
+
+    def test_aio_listdir_stop_early(self):
+        """aio.listdir: closing a walk part way through is fine"""
+        async def first():
+            walk = bitmath.aio.listdir(self.base)
+            result = await walk.__anext__()
+            await walk.aclose()
+            return result
+        self.assertEqual(run(first()), next(bitmath.listdir(self.base)))
+
+    def test_aio_listdir_errors(self):
+        """aio.listdir: broken links and bad concurrency raise"""
+        os.symlink('nowhere', os.path.join(self.base, 'broken'))
+        with self.assertRaises(OSError):
+            run(collect(bitmath.aio.listdir(self.base, followlinks=True)))
+        with self.assertRaises(ValueError):
+            run(collect(bitmath.aio.listdir(self.base, concurrency=0)))
+
+    def test_aio_getsize(self):
+        """aio.getsize: same result as getsize"""
+        path = './tests/file_sizes/kbytes.test'
+        self.assertEqual(run(bitmath.aio.getsize(path)), bitmath.getsize(path))
+        result = run(bitmath.aio.getsize(path, bestprefix=False))
+        self.assertIs(type(result), bitmath.Byte)
+        with self.assertRaises(OSError):
+            run(bitmath.aio.getsize(os.path.join(self.base, 'nonexistent')))
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Tests for the NumPy backed BitmathArray
+"""
+
+from . import TestCase
+import bitmath
+from bitmath.array import BitmathArray
+import numpy
+
+
+class TestBitmathArray(TestCase):
+    def setUp(self):
+        self.kibs = BitmathArray([1, 2, 3000], unit='KiB')
+
+    def test_storage_dtype(self):
+        """Integer input is stored as int64 bits, floats as float64"""
+        self.assertEqual(self.kibs.dtype, numpy.int64)
+        self.assertEqual(list(self.kibs.bits), [8192, 16384, 24576000])
+        self.assertEqual(BitmathArray([1.5], unit='KiB').dtype, numpy.float64)
+        # Too big for int64 bits
+        self.assertEqual(BitmathArray([5], unit='YB').dtype, numpy.float64)
+
+    def test_from_bitmath_instances(self):
+        """A sequence of instances is converted into the array unit"""
+        arr = BitmathArray([bitmath.MiB(1), bitmath.Byte(512)], unit=bitmath.KiB)
+        self.assertEqual(list(arr.value), [1024.0, 0.5])
+
+    def test_from_bytes(self):
+        """from_bytes takes raw byte counts"""
+        arr = BitmathArray.from_bytes([1024, 2048], unit='KiB')
+        self.assertEqual(list(arr.value), [1.0, 2.0])
+
+    def test_indexing_gives_scalars(self):
+        """Integer indexing and iteration give bitmath instances"""
+        first = self.kibs[0]
+        self.assertIs(type(first), bitmath.KiB)
+        self.assertEqual(first, bitmath.KiB(1))
+        self.assertEqual(list(self.kibs),
+                         [bitmath.KiB(1), bitmath.KiB(2), bitmath.KiB(3000)])
+
+    def test_slicing_and_masks(self):
+        """Slices and boolean masks give arrays"""
+        self.assertIsInstance(self.kibs[1:], BitmathArray)
+        big = self.kibs[self.kibs > bitmath.KiB(1.5)]
+        self.assertEqual(len(big), 2)
+
+    def test_immutable(self):
+        """The underlying bits can not be modified"""
+        with self.assertRaises(ValueError):
+            self.kibs.bits[0] = 1
+        with self.assertRaises(AttributeError):
+            self.kibs.foo = 1
+
+    def test_arithmetic(self):
+        """Vectorized + - * / follow the scalar result types"""
+        self.assertEqual(list(self.kibs + bitmath.KiB(1)),
+                         [bitmath.KiB(2), bitmath.KiB(3), bitmath.KiB(3001)])
+        self.assertEqual(list(bitmath.KiB(1) + self.kibs),
+                         [bitmath.KiB(2), bitmath.KiB(3), bitmath.KiB(3001)])
+        self.assertEqual(list(self.kibs - self.kibs), [0, 0, 0])
+        self.assertEqual(list(self.kibs * 2),
+                         [bitmath.KiB(2), bitmath.KiB(4), bitmath.KiB(6000)])
+        self.assertEqual(list(self.kibs / 2),
+                         [bitmath.KiB(0.5), bitmath.KiB(1), bitmath.KiB(1500)])
+        ratios = self.kibs / bitmath.KiB(1)
+        self.assertIsInstance(ratios, numpy.ndarray)
+        self.assertEqual(list(ratios), [1.0, 2.0, 3000.0])
+
+    def test_comparisons(self):
+        """Comparisons are element-wise"""
+        self.assertEqual(list(self.kibs == bitmath.Byte(2048)), [False, True, False])
+        self.assertEqual(list(self.kibs < 2), [True, False, False])
+
+    def test_conversions(self):
+        """to_* methods and properties change the unit"""
+        mib = self.kibs.to_MiB()
+        self.assertIs(mib.unit, bitmath.MiB)
+        self.assertEqual(mib[2], bitmath.MiB(3000 / 1024.0))
+        self.assertIs(self.kibs.kB.unit, bitmath.kB)
+
+    def test_reductions(self):
+        """sum/min/max/mean return bitmath instances"""
+        self.assertEqual(self.kibs.sum(), bitmath.KiB(3003))
+        self.assertIs(type(self.kibs.sum()), bitmath.KiB)
+        self.assertEqual(self.kibs.min(), bitmath.KiB(1))
+        self.assertEqual(self.kibs.max(), bitmath.KiB(3000))
+        self.assertEqual(self.kibs.mean(), bitmath.KiB(1001))
+
+    def test_sum_does_not_wrap(self):
+        """sum() is exact where int64 bits would wrap around"""
+        arr = BitmathArray.from_bytes([2 ** 59, 2 ** 59, 2 ** 59])
+        self.assertEqual(arr.sum(), bitmath.Byte(3 * 2 ** 59))
+        self.assertEqual(arr.sum().bits, 3 * 2 ** 62)
+        self.assertEqual(arr.sum(), sum(arr.tolist(), bitmath.Byte(0)))
+
+    def test_arithmetic_does_not_wrap(self):
+        """int64 bits which would overflow become float64 instead"""
+        arr = BitmathArray.from_bytes([2 ** 59, -2 ** 59])
+        self.assertEqual(list((arr + arr).bytes), [2.0 ** 60, -2.0 ** 60])
+        self.assertEqual(list((arr * 16).bytes), [2.0 ** 63, -2.0 ** 63])
+        self.assertEqual(list((arr - bitmath.Byte(-2 ** 59)).bytes), [2.0 ** 60, 0.0])
+        self.assertEqual(list((bitmath.Byte(2 ** 59) + arr).bytes), [2.0 ** 60, 0.0])
+        # Results which fit stay exact int64
+        self.assertEqual((arr + bitmath.Byte(1)).dtype, numpy.int64)
+
+    def test_negation_does_not_wrap(self):
+        """-ba and abs(ba) of the smallest int64 don't wrap around"""
+        smallest = numpy.iinfo(numpy.int64).min
+        arr = BitmathArray.from_bits(numpy.array([smallest]))
+        self.assertEqual(list((-arr).bits), [-float(smallest)])
+        self.assertEqual(list(abs(arr).bits), [-float(smallest)])
+
+    def test_unsigned_input(self):
+        """Unsigned input is stored signed, so results can go negative"""
+        arr = BitmathArray.from_bytes(numpy.array([1, 5], dtype=numpy.uint64))
+        self.assertEqual(arr.dtype, numpy.int64)
+        self.assertEqual(list(arr - bitmath.Byte(3)), [bitmath.Byte(-2), bitmath.Byte(2)])
+        self.assertEqual(list(-arr), [bitmath.Byte(-1), bitmath.Byte(-5)])
+        big = BitmathArray.from_bytes(numpy.array([2 ** 63], dtype=numpy.uint64))
+        self.assertEqual(big.dtype, numpy.float64)
+
+    def test_best_prefix_matches_scalar(self):
+        """Element-wise best_prefix agrees with the scalar version"""
+        byte_counts = [0, 1, 7, 1023, 1024, 1025, 10 ** 6, 2 ** 40, 10 ** 30]
+        arr = BitmathArray.from_bytes(byte_counts)
+        for system in (bitmath.NIST, bitmath.SI):
+            expected = [bitmath.Byte(b).best_prefix(system=system)
+                        for b in byte_counts]
+            result = arr.best_prefix(system=system)
+            self.assertEqual([type(x) for x in result],
+                             [type(x) for x in expected])
+            # The last one is stored as float64 bits, not exactly
+            self.assertEqual(result[:-1], expected[:-1])
+
+    def test_best_prefix_boundaries_match_scalar(self):
+        """Element-wise best_prefix agrees with the scalar version at every
+prefix boundary, including those past 2**53 bytes"""
+        byte_counts = []
+        for unit in bitmath._UNITS:
+            if unit._unit_bits % 8 == 0 and unit._unit_bits // 8 < 2 ** 60:
+                start = unit._unit_bits // 8
+                byte_counts.extend([start - 1, start, start + 1])
+        # 2**60 - 1 bytes is the most int64 bits can hold
+        byte_counts.extend([2 ** 60 - 2, 2 ** 60 - 1, 2 ** 53 + 1])
+        byte_counts.extend([-b for b in byte_counts])
+        arr = BitmathArray.from_bytes(byte_counts)
+        self.assertEqual(arr.dtype, numpy.int64)
+        for system in (bitmath.NIST, bitmath.SI):
+            expected = [bitmath.Byte(b).best_prefix(system=system) for b in byte_counts]
+            result = arr.best_prefix(system=system)
+            self.assertEqual([type(x) for x in result], [type(x) for x in expected])
+            self.assertEqual(result, expected)
+
+    def test_best_prefix_float_boundaries_match_scalar(self):
+        """float64 bits pick the same units as the scalar version"""
+        byte_counts = [1023.5, 1024.0, 999.9, 1000.0, 1e21, 1e24, 1e24 * (1 + 2 ** -52)]
+        arr = BitmathArray.from_bytes(byte_counts)
+        for system in (bitmath.NIST, bitmath.SI):
+            self.assertEqual(
+                [type(x) for x in arr.best_prefix(system=system)],
+                [type(bitmath.Byte(b).best_prefix(system=system)) for b in byte_counts])
+
+    def test_best_prefix_small_and_negative(self):
+        """Sizes under one Byte become Bits, negatives use abs()"""
+        arr = BitmathArray.from_bits([4, -4, -9000])
+        self.assertEqual([type(x) for x in arr.best_prefix()],
+                         [bitmath.Bit, bitmath.Bit, bitmath.KiB])
+
+    def test_invalid_unit(self):
+        """Unknown unit names are rejected"""
+        with self.assertRaises(ValueError):
+            BitmathArray([1], unit='furlong')
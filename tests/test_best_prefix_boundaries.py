@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Tests for best prefix guessing right at, and just next to, the
+boundaries between prefix units
+"""
+
+from . import TestCase
+import bitmath
+import fractions
+
+
+class TestBestPrefixBoundaries(TestCase):
+    def test_nist_exact_boundaries(self):
+        """NIST: exactly 1024**N bytes is 1 of the Nth prefix unit"""
+        units = [bitmath.KiB, bitmath.MiB, bitmath.GiB, bitmath.TiB,
+                 bitmath.PiB, bitmath.EiB]
+        for power, unit in enumerate(units, 1):
+            best = bitmath.Byte(1024 ** power).best_prefix()
+            self.assertIs(type(best), unit)
+            self.assertEqual(best.value, 1)
+
+    def test_nist_just_below_boundaries(self):
+        """NIST: one byte less than 1024**N stays in the smaller unit"""
+        units = [bitmath.Byte, bitmath.KiB, bitmath.MiB, bitmath.GiB,
+                 bitmath.TiB, bitmath.PiB]
+        for power, unit in enumerate(units, 1):
+            self.assertIs(type(bitmath.Byte(1024 ** power - 1).best_prefix()), unit)
+            # Less than one bit below the boundary
+            below = bitmath.Bit(1024 ** power * 8 - 1)
+            self.assertIs(type(below.best_prefix(system=bitmath.NIST)), unit)
+
+    def test_si_exact_boundaries(self):
+        """SI: exactly 1000**N bytes is 1 of the Nth prefix unit"""
+        units = [bitmath.kB, bitmath.MB, bitmath.GB, bitmath.TB, bitmath.PB,
+                 bitmath.EB, bitmath.ZB, bitmath.YB]
+        for power, unit in enumerate(units, 1):
+            best = bitmath.Byte(1000 ** power).best_prefix(system=bitmath.SI)
+            self.assertIs(type(best), unit)
+            self.assertEqual(best.value, 1)
+
+    def test_si_just_below_boundaries(self):
+        """SI: one byte less than 1000**N stays in the smaller unit"""
+        units = [bitmath.Byte, bitmath.kB, bitmath.MB, bitmath.GB,
+                 bitmath.TB, bitmath.PB, bitmath.EB, bitmath.ZB]
+        for power, unit in enumerate(units, 1):
+            self.assertIs(type(bitmath.kB(bytes=1000 ** power - 1).best_prefix()), unit)
+
+    def test_beyond_largest_unit(self):
+        """Sizes past the largest prefix unit use the largest unit"""
+        self.assertIs(type(bitmath.Byte(1024 ** 9).best_prefix()), bitmath.EiB)
+        self.assertIs(type(bitmath.Byte(10 ** 40).best_prefix(system=bitmath.SI)), bitmath.YB)
+        self.assertIs(type(bitmath.Byte(1e300).best_prefix()), bitmath.EiB)
+
+    def test_byte_and_bit_boundary(self):
+        """Sizes under one byte are Bits, one byte and up are not"""
+        self.assertIs(type(bitmath.Bit(7).best_prefix()), bitmath.Bit)
+        self.assertIs(type(bitmath.Bit(-7.9).best_prefix()), bitmath.Bit)
+        self.assertIs(type(bitmath.Bit(8).best_prefix()), bitmath.Byte)
+        self.assertIs(type(bitmath.Bit(-8).best_prefix()), bitmath.Byte)
+        self.assertIs(type(bitmath.Byte(1023.99).best_prefix()), bitmath.Byte)
+
+    def test_exact_values_kept(self):
+        """The best prefix instance holds exactly the same bits"""
+        for size in [bitmath.Byte(1024 ** 5 - 1), bitmath.Byte(fractions.Fraction(2049, 2)),
+                     bitmath.Bit(-8 * 10 ** 12), bitmath.MiB(1.5)]:
+            for system in (bitmath.NIST, bitmath.SI):
+                best = size.best_prefix(system=system)
+                self.assertEqual(best.bits, size.bits)
+                self.assertIs(type(best.bits), type(size.bits))
+        self.assertIs(type(bitmath.Bit(-8 * 10 ** 12).best_prefix(system=bitmath.SI)), bitmath.TB)
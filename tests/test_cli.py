@@ -30,6 +30,8 @@ Test the command line tool
 
 from . import TestCase
 import bitmath
+import io
+import mock
 
 
 class TestCli(TestCase):
@@ -67,3 +69,128 @@ class TestCli(TestCase):
         results = bitmath.cli_script_main(args)
         self.assertEqual(results[0], bitmath.Byte(1048576))
         self.assertIs(type(results[0]), bitmath.Byte)
+
+    def test_cli_script_main_units_in_size(self):
+        """CLI script parses sizes which carry their own units"""
+        results = bitmath.cli_script_main(['-t', 'KiB', '1 MiB', '2048'])
+        self.assertEqual(results, [bitmath.KiB(1024), bitmath.KiB(2)])
+
+    def test_cli_script_main_parsed_unit_best_prefix(self):
+        """CLI script keeps the prefix system of a parsed size"""
+        results = bitmath.cli_script_main(['2000 kB'])
+        self.assertIs(type(results[0]), bitmath.MB)
+
+    def test_cli_script_main_invalid_size(self):
+        """CLI script exits if a size can not be parsed"""
+        with mock.patch('sys.stderr', io.StringIO()):
+            with self.assertRaises(SystemExit):
+                bitmath.cli_script_main(['lots'])
+
+    def test_cli_script_main_format(self):
+        """CLI script formats results with --format"""
+        results = bitmath.cli_script_main(
+            ['--format', '{value:.1f}{unit}', '1536'])
+        self.assertEqual(results, ['1.5KiB'])
+
+    def test_cli_script_main_from_stdin(self):
+        """CLI script reads one size from stdin"""
+        results = bitmath.cli_script_main(
+            ['--from-stdin', '-t', 'KiB'], stdin=io.StringIO(u'1024\n'))
+        self.assertEqual(results, [bitmath.KiB(1)])
+
+
+class TestCliStream(TestCase):
+    def _stream(self, args, data):
+        out = io.StringIO()
+        results = bitmath.cli_script_main(
+            ['--stream'] + args, stdin=io.StringIO(data), stdout=out)
+        self.assertEqual(results, [])
+        return out.getvalue()
+
+    def test_stream_lines(self):
+        """Stream mode converts every line, with or without units"""
+        self.assertEqual(
+            self._stream([], u'100\n1024 KiB\n2 GB\n'),
+            u'100.0 Byte\n1.0 MiB\n2.0 GB\n')
+
+    def test_stream_to_unit(self):
+        """Stream mode converts to a fixed unit"""
+        self.assertEqual(
+            self._stream(['-f', 'KiB', '-t', 'MiB'], u'512\n1024\n'),
+            u'0.5 MiB\n1.0 MiB\n')
+
+    def test_stream_blank_lines(self):
+        """Stream mode passes blank lines through"""
+        self.assertEqual(self._stream([], u'1\n\n2\n'),
+                         u'1.0 Byte\n\n2.0 Byte\n')
+
+    def test_stream_field(self):
+        """Stream mode converts one field and keeps the rest of the line"""
+        self.assertEqual(
+            self._stream(['--field', '2'], u'a 1024  x\n\tb\t2048\n'),
+            u'a 1.0 KiB  x\n\tb\t2.0 KiB\n')
+
+    def test_stream_field_delimiter(self):
+        """Stream mode splits fields on a given delimiter"""
+        self.assertEqual(
+            self._stream(['--field', '1', '-d', ',', '--format',
+                          '{value:.0f}{unit}'], u'1048576,x,y\n'),
+            u'1MiB,x,y\n')
+
+    def test_stream_bad_field(self):
+        """Stream mode refuses --field 0"""
+        with mock.patch('sys.stderr', io.StringIO()):
+            with self.assertRaises(SystemExit):
+                self._stream(['--field', '0'], u'1\n')
+
+    def test_stream_options_need_stream(self):
+        """--field, -d and --invalid are refused without --stream"""
+        for args in (['--field', '1'], ['--field', '1', '-d', ','],
+                     ['--invalid', 'warn']):
+            with mock.patch('sys.stderr', io.StringIO()) as err:
+                with self.assertRaises(SystemExit) as e:
+                    bitmath.cli_script_main(args + ['1024'])
+            self.assertEqual(e.exception.code, 2)
+            self.assertIn(u'only works with --stream', err.getvalue())
+
+    def test_stream_delimiter_needs_field(self):
+        """-d is refused without --field"""
+        with mock.patch('sys.stderr', io.StringIO()) as err:
+            with self.assertRaises(SystemExit):
+                self._stream(['-d', ','], u'1\n')
+        self.assertIn(u'only works with --field', err.getvalue())
+
+    def test_stream_invalid_abort(self):
+        """Stream mode stops at an invalid line, after writing the earlier ones"""
+        out = io.StringIO()
+        with mock.patch('sys.stderr', io.StringIO()) as err:
+            with self.assertRaises(SystemExit) as e:
+                bitmath.cli_script_main(['-s'], stdin=io.StringIO(u'1\nx\n2\n'),
+                                        stdout=out)
+        self.assertEqual(e.exception.code, 1)
+        self.assertEqual(out.getvalue(), u'1.0 Byte\n')
+        self.assertIn(u'line 2', err.getvalue())
+
+    def test_stream_invalid_warn(self):
+        """Stream mode can warn about invalid lines and pass them through"""
+        with mock.patch('sys.stderr', io.StringIO()) as err:
+            out = self._stream(['--invalid', 'warn', '--field', '2'],
+                               u'a 1\nb\nc x\n')
+        self.assertEqual(out, u'a 1.0 Byte\nb\nc x\n')
+        self.assertIn(u'line 2: no field 2', err.getvalue())
+        self.assertIn(u'line 3', err.getvalue())
+
+    def test_stream_invalid_ignore(self):
+        """Stream mode can pass invalid lines through quietly"""
+        with mock.patch('sys.stderr', io.StringIO()) as err:
+            out = self._stream(['--invalid', 'ignore'], u'x\n')
+        self.assertEqual(out, u'x\n')
+        self.assertEqual(err.getvalue(), u'')
+
+    def test_stream_chunks(self):
+        """Stream mode writes in chunks rather than all at the end"""
+        out = mock.Mock()
+        convert = bitmath._cli_converter('Byte', None, None)
+        with mock.patch('bitmath.CLI_STREAM_CHUNK', 2):
+            bitmath.cli_stream([u'1\n'] * 5, out, convert)
+        self.assertEqual(out.write.call_count, 3)
@@ -30,6 +30,8 @@ Tests to verify that the formatting context manager works
 
 from . import TestCase
 import bitmath
+import asyncio
+import threading
 
 
 class TestContextManager(TestCase):
@@ -101,3 +103,92 @@ class TestContextManager(TestCase):
             third_tibibyte = bitmath.TiB(1 / 3.0).best_prefix()
             actual_result = str(third_tibibyte)
             self.assertEqual(expected_result, actual_result)
+
+    def test_format_restored_after_exception(self):
+        """bitmath.format context mgr restores formatting if the block raises"""
+        with self.assertRaises(ZeroDivisionError):
+            with bitmath.format(fmt_str="{value:.1f}{unit}", plural=True):
+                1 / 0
+        self.assertEqual(str(bitmath.KiB(1.337)), "1.337 KiB")
+        self.assertEqual(bitmath.Byte(3).unit, "Byte")
+
+    def test_format_bestprefix(self):
+        """bitmath.format context mgr can print instances in their best prefix"""
+        with bitmath.format(bestprefix=True):
+            self.assertEqual(str(bitmath.KiB(2048)), "2.0 MiB")
+            self.assertEqual(repr(bitmath.KiB(2048)), "KiB(2048.0)")
+            with bitmath.format(fmt_str="{value:.1f}{unit}"):
+                self.assertEqual(str(bitmath.kB(1500)), "1.5MB")
+        self.assertEqual(str(bitmath.KiB(2048)), "2048.0 KiB")
+
+    def test_format_nested(self):
+        """Nested bitmath.format contexts inherit unset settings"""
+        with bitmath.format(fmt_str="{value:.0f} {unit}"):
+            with bitmath.format(plural=True):
+                self.assertEqual(str(bitmath.Byte(3)), "3 Bytes")
+            self.assertEqual(str(bitmath.Byte(3)), "3 Byte")
+        self.assertEqual(str(bitmath.Byte(3)), "3.0 Byte")
+
+    def test_format_nested_off(self):
+        """Nested bitmath.format contexts can switch settings off again"""
+        with bitmath.format(fmt_str="{value:.0f} {unit}", plural=True, bestprefix=True):
+            self.assertEqual(str(bitmath.Byte(3072)), "3 KiBs")
+            with bitmath.format(plural=False):
+                self.assertEqual(str(bitmath.Byte(3072)), "3 KiB")
+                self.assertEqual(bitmath.Byte(3).unit, "Byte")
+            with bitmath.format(bestprefix=False):
+                self.assertEqual(str(bitmath.Byte(3072)), "3072 Bytes")
+            self.assertEqual(str(bitmath.Byte(3072)), "3 KiBs")
+
+    def test_format_module_variables(self):
+        """Module format variables are the defaults, contexts override them"""
+        orig_fmt_str = bitmath.format_string
+        try:
+            bitmath.format_string = "[{value}]"
+            self.assertEqual(str(bitmath.Byte(3)), "[3.0]")
+            with bitmath.format(plural=True):
+                self.assertEqual(str(bitmath.Byte(3)), "[3.0]")
+                self.assertEqual(bitmath.Byte(3).unit, "Bytes")
+            with bitmath.format(fmt_str="{unit}"):
+                self.assertEqual(str(bitmath.Byte(3)), "Byte")
+            bitmath.format_plural = True
+            with bitmath.format(fmt_str="{unit}"):
+                self.assertEqual(str(bitmath.Byte(3)), "Bytes")
+                with bitmath.format(plural=False):
+                    self.assertEqual(str(bitmath.Byte(3)), "Byte")
+        finally:
+            bitmath.format_string = orig_fmt_str
+            bitmath.format_plural = False
+
+    def test_format_thread_isolation(self):
+        """bitmath.format settings don't leak into other threads"""
+        in_context = threading.Event()
+        checked = threading.Event()
+        results = []
+
+        def other_thread():
+            in_context.wait(5)
+            results.append(str(bitmath.Byte(3)))
+            checked.set()
+
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        with bitmath.format(fmt_str="{value:.0f}{unit}", plural=True):
+            in_context.set()
+            checked.wait(5)
+            self.assertEqual(str(bitmath.Byte(3)), "3Bytes")
+        thread.join()
+        self.assertEqual(results, ["3.0 Byte"])
+
+    def test_format_task_isolation(self):
+        """bitmath.format settings don't leak into other asyncio tasks"""
+        async def render(fmt_str, delay):
+            with bitmath.format(fmt_str=fmt_str):
+                await asyncio.sleep(delay)
+                return str(bitmath.KiB(1))
+
+        async def main():
+            return await asyncio.gather(render("{value:.0f}{unit}", 0.02),
+                                        render("<{unit}>", 0.01))
+
+        self.assertEqual(asyncio.run(main()), ["1KiB", "<KiB>"])
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Tests for bitmath.convert() and the generated to_THING() converters
+"""
+
+from . import TestCase
+import bitmath
+import fractions
+import random
+import sys
+
+
+class TestConvert(TestCase):
+    def test_convert_names_and_classes(self):
+        """convert() takes unit classes or their names"""
+        self.assertEqual(bitmath.convert(1.5, 'GiB', 'MB'), 1610.612736)
+        self.assertEqual(bitmath.convert(4096, bitmath.KiB, bitmath.MiB), 4.0)
+        self.assertEqual(bitmath.convert(1, 'kB', bitmath.Bit), 8000.0)
+        self.assertEqual(bitmath.convert(1, 'MiB', 'Kio'), 1024.0)
+
+    def test_convert_returns_float(self):
+        """convert() returns a float, even for int input"""
+        result = bitmath.convert(2, 'KiB', 'Byte')
+        self.assertIs(type(result), float)
+        self.assertEqual(result, 2048.0)
+
+    def test_convert_matches_instances(self):
+        """convert() agrees with converting instances for int input"""
+        for source in bitmath._UNITS:
+            for target in bitmath._UNITS:
+                self.assertEqual(
+                    bitmath.convert(3, source, target),
+                    getattr(source(3), 'to_%s' % target.__name__)().value)
+
+    def test_convert_correctly_rounded(self):
+        """convert() rounds the exact result once"""
+        rand = random.Random(4)
+        for _ in range(2000):
+            source = rand.choice(bitmath._UNITS)
+            target = rand.choice(bitmath._UNITS)
+            value = rand.random() * 10 ** rand.randint(-20, 20)
+            exact = fractions.Fraction(value) * fractions.Fraction(
+                source._unit_bits, target._unit_bits)
+            self.assertEqual(bitmath.convert(value, source, target), float(exact))
+
+    def test_convert_large_units(self):
+        """convert() is exact where a float can't hold the factor"""
+        self.assertEqual(bitmath.convert(10 ** 30, 'Bit', 'YB'), 125000.0)
+        self.assertEqual(bitmath.convert(1.0, 'YB', 'Bit'), 8e24)
+
+    def test_convert_fraction(self):
+        """convert() takes Fraction input"""
+        self.assertEqual(bitmath.convert(fractions.Fraction(1, 2), 'KiB', 'Byte'), 512.0)
+
+    def test_convert_special_floats(self):
+        """convert() passes inf and nan through"""
+        self.assertEqual(bitmath.convert(float('inf'), 'Yb', 'Bit'), float('inf'))
+        self.assertNotEqual(bitmath.convert(float('nan'), 'Yb', 'Bit'),
+                            bitmath.convert(float('nan'), 'Yb', 'Bit'))
+
+    def test_convert_overflow(self):
+        """convert() gives inf when the result is too large for a float"""
+        self.assertEqual(bitmath.convert(1e300, 'YB', 'Bit'), bitmath.YB(1e300).to_Bit().value)
+        self.assertEqual(bitmath.convert(1e300, 'YB', 'Bit'), float('inf'))
+        self.assertEqual(bitmath.convert(-1e300, 'ZB', 'Bit'), float('-inf'))
+        self.assertEqual(bitmath.convert(10 ** 400, 'Bit', 'YB'), float('inf'))
+        self.assertEqual(bitmath.convert(fractions.Fraction(-10 ** 400, 3), 'kB', 'Bit'), float('-inf'))
+
+    def test_convert_near_max_float(self):
+        """convert() handles near max floats which shrink in the conversion"""
+        for value, from_unit, to_unit in [(1e308, 'KiB', 'MB'), (-1.7e308, 'EiB', 'YB'),
+                                          (sys.float_info.max, 'Byte', 'kB')]:
+            factor = fractions.Fraction(bitmath._unit_class(from_unit)._unit_bits,
+                                        bitmath._unit_class(to_unit)._unit_bits)
+            self.assertEqual(bitmath.convert(value, from_unit, to_unit),
+                             float(fractions.Fraction(value) * factor))
+        self.assertEqual(bitmath.convert(1e308, 'KiB', 'MB'), 1.024e305)
+
+    def test_convert_bad_unit(self):
+        """convert() rejects things which aren't bitmath units"""
+        for unit in ['furlong', bitmath.Bitmath, int, None, ['KiB']]:
+            with self.assertRaises(ValueError):
+                bitmath.convert(1, unit, 'Byte')
+
+    def test_convert_bad_value(self):
+        """convert() rejects values which aren't numbers"""
+        with self.assertRaises(ValueError):
+            bitmath.convert('1', 'KiB', 'Byte')
+
+    def test_conversion_factors(self):
+        """The conversion factors are exact and in lowest terms"""
+        factors = bitmath._CONVERSION_FACTORS
+        self.assertEqual(factors[bitmath.KiB, bitmath.kB][:2], (128, 125))
+        self.assertEqual(factors['kB', 'KiB'][:2], (125, 128))
+        self.assertEqual(factors[bitmath.Byte, bitmath.Bit][:2], (8, 1))
+
+
+class TestGeneratedConverters(TestCase):
+    def test_converter_for_every_unit(self):
+        """Every unit has a to_THING() converter and a THING property"""
+        size = bitmath.MiB(3)
+        for name in bitmath.ALL_UNIT_TYPES:
+            converted = getattr(size, 'to_%s' % name)()
+            self.assertIs(type(converted), getattr(bitmath, name))
+            self.assertEqual(converted.bits, size.bits)
+            self.assertIs(type(getattr(size, name)), getattr(bitmath, name))
+
+    def test_converter_names(self):
+        """Generated converters are named after their unit"""
+        self.assertEqual(bitmath.Bitmath.to_KiB.__name__, 'to_KiB')
+        self.assertIn('KiB', bitmath.Bitmath.to_KiB.__doc__)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Tests for du(), disk usage totals per directory
+"""
+
+from . import TestCase
+import bitmath
+import os
+import shutil
+import tempfile
+
+
+class TestDu(TestCase):
+    def setUp(self):
+        # base/
+        # ├── a/
+        # │   ├── b/
+        # │   │   └── twok (2048 bytes)
+        # │   ├── ten (10 bytes)
+        # │   └── ten_link -> ten (hard link)
+        # ├── hundred (100 bytes)
+        # └── symlink -> a
+        self.base = tempfile.mkdtemp()
+        self.a = os.path.join(self.base, 'a')
+        self.b = os.path.join(self.a, 'b')
+        os.makedirs(self.b)
+        for path, size in ((os.path.join(self.b, 'twok'), 2048),
+                           (os.path.join(self.a, 'ten'), 10),
+                           (os.path.join(self.base, 'hundred'), 100)):
+            with open(path, 'wb') as f:
+                f.write(b'x' * size)
+        os.link(os.path.join(self.a, 'ten'), os.path.join(self.a, 'ten_link'))
+        os.symlink('a', os.path.join(self.base, 'symlink'))
+
+    def tearDown(self):
+        shutil.rmtree(self.base)
+
+    def apparent(self, *paths):
+        return sum(os.lstat(p).st_size for p in paths)
+
+    def test_du_apparent(self):
+        """du: apparent totals count every directory and file once"""
+        b = self.apparent(self.b, os.path.join(self.b, 'twok'))
+        a = b + self.apparent(self.a, os.path.join(self.a, 'ten'))
+        base = a + self.apparent(self.base,
+                                 os.path.join(self.base, 'hundred'),
+                                 os.path.join(self.base, 'symlink'))
+        result = bitmath.du(self.base, apparent=True)
+        self.assertEqual(list(result), [self.b, self.a, self.base])
+        self.assertEqual(result[self.b], bitmath.Byte(b))
+        self.assertEqual(result[self.a], bitmath.Byte(a))
+        self.assertEqual(result[self.base], bitmath.Byte(base))
+        self.assertIs(type(result[self.base]), bitmath.Byte)
+
+    def test_du_blocks(self):
+        """du: allocated totals count st_blocks"""
+        expected = 0
+        for root, dirs, files in os.walk(self.base):
+            paths = [root] + [os.path.join(root, f) for f in files if f != 'ten_link']
+            expected += sum(os.lstat(p).st_blocks * 512 for p in paths)
+        result = bitmath.du(self.base)
+        self.assertEqual(result[self.base], bitmath.Byte(expected))
+
+    def test_du_max_depth(self):
+        """du: max_depth limits the results, not the totals"""
+        full = bitmath.du(self.base, apparent=True)
+        result = bitmath.du(self.base, apparent=True, max_depth=1)
+        self.assertEqual(list(result), [self.a, self.base])
+        self.assertEqual(result[self.base], full[self.base])
+        self.assertEqual(list(bitmath.du(self.base, max_depth=0)), [self.base])
+
+    def test_du_file(self):
+        """du: a file on its own is its own total"""
+        path = os.path.join(self.base, 'hundred')
+        result = bitmath.du(path, apparent=True, bestprefix=True)
+        self.assertEqual(result, {path: bitmath.Byte(100)})
+
+    def test_du_bestprefix(self):
+        """du: bestprefix returns human-readable units"""
+        result = bitmath.du(self.b, apparent=True, bestprefix=True, system=bitmath.SI)
+        self.assertIs(type(result[self.b]), bitmath.kB)
+
+    def test_du_invalid(self):
+        """du: missing paths and bad max_depth raise errors"""
+        with self.assertRaises(OSError):
+            bitmath.du(os.path.join(self.base, 'nonexistent'))
+        with self.assertRaises(ValueError):
+            bitmath.du(self.base, max_depth=-1)
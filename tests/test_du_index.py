@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Tests for bitmath.index, the incremental disk usage index
+"""
+
+from . import TestCase
+import bitmath
+import bitmath.index
+import mock
+import os
+import shutil
+import tempfile
+
+
+class TestDiskUsageIndex(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db = os.path.join(self.tmp, 'index.db')
+        self.base = os.path.join(self.tmp, 'tree')
+        for d in ('a/b', 'a/c', 'd'):
+            os.makedirs(os.path.join(self.base, d))
+        for name, size in (('a/one', 100), ('a/b/two', 2000), ('a/c/three', 30000),
+                           ('d/four', 4)):
+            self.write(name, size)
+        os.link(os.path.join(self.base, 'a', 'b', 'two'),
+                os.path.join(self.base, 'd', 'two_link'))
+        # Directories changed within the last couple of seconds are
+        # always listed again, which would be every directory here
+        patcher = mock.patch.object(bitmath.index, '_RACY_NS', 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.index = bitmath.index.DiskUsageIndex(self.db, self.base)
+        self.addCleanup(self.index.close)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def write(self, name, size):
+        with open(os.path.join(self.base, name), 'wb') as f:
+            f.write(b'x' * size)
+
+    def assertMatchesDu(self):
+        self.assertEqual(self.index.du(), bitmath.du(self.base))
+        sub = os.path.join(self.base, 'a')
+        self.assertEqual(self.index.du(sub), bitmath.du(sub))
+        self.assertEqual(self.index.du(sub, max_depth=0, bestprefix=True),
+                         bitmath.du(sub, max_depth=0, bestprefix=True))
+
+    def test_index_matches_du(self):
+        """DiskUsageIndex: totals are the same as du()"""
+        self.assertEqual(self.index.update(), 5)
+        self.assertMatchesDu()
+        self.assertEqual(self.index.total(), bitmath.du(self.base)[self.base])
+
+    def test_index_unchanged(self):
+        """DiskUsageIndex: unchanged directories are not listed again"""
+        self.index.update()
+        self.assertEqual(self.index.update(), 0)
+        self.assertMatchesDu()
+        self.assertEqual(self.index.update(full=True), 5)
+
+    def test_index_changes(self):
+        """DiskUsageIndex: changed directories are listed again"""
+        self.index.update()
+        self.write('a/b/five', 5000)
+        shutil.rmtree(os.path.join(self.base, 'd'))
+        os.rename(os.path.join(self.base, 'a', 'c'), os.path.join(self.base, 'c'))
+        # The tree itself, a, a/b, and c at its new path
+        self.assertEqual(self.index.update(), 4)
+        self.assertMatchesDu()
+        with self.assertRaises(ValueError):
+            self.index.total(os.path.join(self.base, 'd'))
+
+    def test_index_reopen(self):
+        """DiskUsageIndex: the index persists between uses"""
+        self.index.update()
+        self.index.close()
+        self.index = bitmath.index.DiskUsageIndex(self.db, self.base)
+        self.assertEqual(self.index.update(), 0)
+        self.assertMatchesDu()
+
+    def test_index_racy(self):
+        """DiskUsageIndex: recently changed directories are always listed"""
+        with mock.patch.object(bitmath.index, '_RACY_NS', 60 * 10 ** 9):
+            self.index.update()
+            self.assertEqual(self.index.update(), 5)
+
+    def test_index_invalid(self):
+        """DiskUsageIndex: bad paths and settings raise ValueError"""
+        self.index.update()
+        with self.assertRaises(ValueError):
+            self.index.du(self.tmp)
+        with self.assertRaises(ValueError):
+            self.index.du(max_depth=-1)
+        with self.assertRaises(ValueError):
+            bitmath.index.DiskUsageIndex(self.db, self.base, apparent=True)
+        with self.assertRaises(ValueError):
+            bitmath.index.DiskUsageIndex(self.db, self.tmp)
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Tests to verify that sizes created from exact input stay exact
+"""
+
+from . import TestCase
+import bitmath
+import fractions
+import numpy
+
+
+class TestExactValues(TestCase):
+    def test_int_input_stores_int_bits(self):
+        """Integer input gives an integer number of bits"""
+        self.assertIs(type(bitmath.KiB(1).bits), int)
+        self.assertIs(type(bitmath.Byte(bytes=3).bits), int)
+        self.assertIs(type(bitmath.Byte(1337).bytes), int)
+
+    def test_float_input_stores_float_bits(self):
+        """Float input is still stored as a float"""
+        self.assertIs(type(bitmath.KiB(1.5).bits), float)
+
+    def test_exabyte_scale_addition_is_exact(self):
+        """Adding one Byte to an EiB is not lost to float rounding"""
+        big = bitmath.EiB(1)
+        bigger = big + bitmath.Byte(1)
+        self.assertNotEqual(big, bigger)
+        self.assertEqual(bigger.bytes, 2 ** 60 + 1)
+        self.assertTrue(big < bigger)
+
+    def test_yottabyte_bytes_are_exact(self):
+        """YB and ZB sizes report an exact number of bytes"""
+        self.assertEqual(bitmath.YB(3).bytes, 3 * 10 ** 24)
+        self.assertEqual(bitmath.ZB(7).to_Byte().bytes, 7 * 10 ** 21)
+
+    def test_sorting_large_values_is_exact(self):
+        """Sorting distinguishes petabyte values one byte apart"""
+        a = bitmath.PB(5)
+        b = bitmath.PB(5) + bitmath.Byte(1)
+        c = bitmath.PB(5) - bitmath.Byte(1)
+        self.assertEqual(sorted([b, a, c]), [c, a, b])
+        self.assertEqual([x.bytes for x in sorted([b, a, c])],
+                         [5 * 10 ** 15 - 1, 5 * 10 ** 15, 5 * 10 ** 15 + 1])
+
+    def test_fraction_input(self):
+        """Fraction input is stored exactly, value is still a float"""
+        third = bitmath.KiB(fractions.Fraction(1, 3))
+        self.assertEqual(third.bits, fractions.Fraction(8192, 3))
+        self.assertEqual(third * 3, bitmath.KiB(1))
+        self.assertIs(type(third.value), float)
+        self.assertAlmostEqual(third.value, 1 / 3.0)
+
+    def test_partial_byte_bytes(self):
+        """A number of bits that is not a whole number of bytes"""
+        self.assertEqual(bitmath.Bit(3).bytes, 0.375)
+
+    def test_bytes_and_bits_reject_strings(self):
+        """bytes= and bits= reject non-numbers like value does"""
+        for kwargs in ({'bytes': '5'}, {'bits': '5'}, {'bytes': [1]}):
+            with self.assertRaises(ValueError):
+                bitmath.Byte(**kwargs)
+
+    def test_numpy_int_input_is_exact(self):
+        """numpy integers are taken as exact Python ints"""
+        big = bitmath.Byte(bytes=numpy.int64(2 ** 61))
+        self.assertEqual(big.bits, 2 ** 64)
+        self.assertIs(type(big.bits), int)
+        self.assertEqual(bitmath.Byte(bits=numpy.uint64(2 ** 63)).bits, 2 ** 63)
+        self.assertEqual(bitmath.EiB(numpy.int64(4)).bits, 2 ** 65)
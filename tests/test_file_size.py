@@ -30,6 +30,7 @@ Tests to verify that string representations are accurate
 
 from . import TestCase
 import bitmath
+import mock
 import os
 
 
@@ -248,6 +249,15 @@ Same assumptions as test_listdir_nosymlinks."""
         # Ensure the measured size is what we expect
         self.assertEqual(contents[0][1], bitmath.KiB(1.0))
 
+    def test_listdir_filtering_normcase(self):
+        """listdir: the filter is normcased like the file names"""
+        with mock.patch('os.path.normcase', str.lower):
+            contents = list(bitmath.listdir('./tests/listdir_nosymlinks/',
+                                            relpath=True,
+                                            filter='1024_BYTE*'))
+        self.assertEqual([path for path, size in contents],
+                         ['tests/listdir_nosymlinks/depth1/depth2/1024_byte_file'])
+
     def test_listdir_filtering_empty_match_nosymlinks(self):
         """listdir: filtering with nosymlinks returns 0 matches for a filter
 
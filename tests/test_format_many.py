@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Tests for bitmath.format_many and BitmathArray.format
+"""
+
+from . import TestCase
+import bitmath
+from bitmath.array import BitmathArray
+import numpy
+
+
+class TestFormatMany(TestCase):
+    def setUp(self):
+        self.byte_counts = [0, 1, 7, 1023, 1024, 1536, 999999, 10 ** 9,
+                            3 * 1024 ** 3, 2 ** 62, -4096]
+
+    def expected(self, sizes, fmt, system=bitmath.NIST):
+        return [size.best_prefix(system=system).format(fmt) for size in sizes]
+
+    def test_format_many_byte_counts(self):
+        """format_many formats numbers of bytes in their best prefix"""
+        sizes = [bitmath.Byte(count) for count in self.byte_counts]
+        for fmt in ["{value} {unit}", "{value:.2f}{unit_plural}", "{unit_singular}({value})",
+                    "{base}^{power} {system}"]:
+            for system in (bitmath.NIST, bitmath.SI):
+                self.assertEqual(bitmath.format_many(self.byte_counts, fmt, system=system),
+                                 self.expected(sizes, fmt, system))
+                self.assertEqual(bitmath.format_many(numpy.array(self.byte_counts), fmt, system=system),
+                                 self.expected(sizes, fmt, system))
+
+    def test_format_many_large_byte_counts(self):
+        """Past 2**53 bytes each row still matches best_prefix().format()"""
+        byte_counts = [2 ** 60 - 1, 2 ** 60, 1000 ** 6 - 1, 1000 ** 6]
+        for system in (bitmath.NIST, bitmath.SI):
+            self.assertEqual(
+                bitmath.format_many(byte_counts, "{value} {unit}", system=system),
+                [bitmath.Byte(b).best_prefix(system=system).format("{value} {unit}")
+                 for b in byte_counts])
+
+    def test_format_many_instances(self):
+        """format_many formats bitmath instances, with or without best prefix"""
+        sizes = [bitmath.MiB(1.5), bitmath.kb(3), bitmath.Bit(4), bitmath.TB(1200)]
+        self.assertEqual(bitmath.format_many(sizes, "{value:.3f} {unit}"),
+                         self.expected(sizes, "{value:.3f} {unit}"))
+        self.assertEqual(bitmath.format_many(sizes, bestprefix=False),
+                         ['1.5 MiB', '3.0 kb', '4.0 Bit', '1200.0 TB'])
+        self.assertEqual(bitmath.format_many((size for size in sizes), "{unit}", system=bitmath.SI),
+                         ['MB', 'Byte', 'Bit', 'PB'])
+
+    def test_format_many_bitmath_array(self):
+        """format_many and BitmathArray.format agree with per instance formatting"""
+        array = BitmathArray([0.5, 1, 2.25, 4096, 1e-3], unit='KiB')
+        self.assertEqual(bitmath.format_many(array, "{value} {unit}"),
+                         self.expected(list(array), "{value} {unit}"))
+        self.assertEqual(array.format("{value} {unit}"),
+                         [size.format("{value} {unit}") for size in array])
+        self.assertEqual(array.format("{value} {unit}", bestprefix=True, system=bitmath.SI),
+                         self.expected(list(array), "{value} {unit}", bitmath.SI))
+
+    def test_format_many_instance_fields(self):
+        """Fields that need the instances still format correctly"""
+        fmt = "{bits:.0f} {bytes} {binary} {value!r:>12}"
+        self.assertEqual(bitmath.format_many([3, 4096], fmt),
+                         self.expected([bitmath.Byte(3), bitmath.Byte(4096)], fmt))
+        with self.assertRaises(KeyError):
+            bitmath.format_many([1, 2], "{nope}")
+
+    def test_format_many_settings(self):
+        """format_many follows the bitmath.format context by default"""
+        with bitmath.format(fmt_str="{value:.0f}{unit}", plural=True):
+            self.assertEqual(bitmath.format_many([1, 2048, 3 * 1024 ** 2]),
+                             ['1Byte', '2KiBs', '3MiBs'])
+        self.assertEqual(bitmath.format_many([1, 2048]), ['1.0 Byte', '2.0 KiB'])
+        self.assertEqual(bitmath.format_many([], "{value}"), [])
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Tests for bitmath.Formatter, the compiled format strings
+"""
+
+from . import TestCase
+import bitmath
+import mock
+
+
+class TestFormatter(TestCase):
+    def test_formatter_format(self):
+        """A Formatter formats instances like Bitmath.format does"""
+        fmt = bitmath.Formatter("{value:.2f} {unit}")
+        self.assertEqual(fmt.format(bitmath.KiB(1.5)), "1.50 KiB")
+        self.assertEqual(fmt(bitmath.Byte(3)), "3.00 Byte")
+        for template in ["{value!r} {unit!s:>8}", "{{literal}} {bits}", "{value.real:.1f}",
+                         "{unit[0]}", "{value:{power}.{power}f}", "{base}^{power} {system}",
+                         "{bin} {binary} {bytes} {unit_plural} {unit_singular}", "plain"]:
+            for size in [bitmath.MiB(1.5), bitmath.kb(0), bitmath.Byte(2 ** 70)]:
+                self.assertEqual(bitmath.Formatter(template).format(size),
+                                 template.format(**dict(
+                                     (name, getattr(size, name)) for name in
+                                     ['base', 'bin', 'binary', 'bits', 'bytes', 'power',
+                                      'system', 'unit', 'unit_plural', 'unit_singular', 'value'])))
+
+    def test_formatter_fields(self):
+        """A Formatter knows which fields it refers to"""
+        fmt = bitmath.Formatter("{value:>{power}} {unit!r} {value.real}")
+        self.assertEqual(fmt.fields, frozenset(['value', 'power', 'unit']))
+        self.assertEqual(fmt.fmt, "{value:>{power}} {unit!r} {value.real}")
+        self.assertEqual(repr(fmt), "Formatter('{value:>{power}} {unit!r} {value.real}')")
+
+    def test_formatter_computes_only_used_fields(self):
+        """A Formatter only computes the fields it refers to"""
+        with mock.patch.dict(bitmath._FORMAT_FIELDS):
+            binary = mock.Mock(return_value='0b0')
+            bitmath._FORMAT_FIELDS['binary'] = binary
+            self.assertEqual(bitmath.Formatter("{value} {unit}").format(bitmath.MiB(1)), "1.0 MiB")
+            self.assertFalse(binary.called)
+            self.assertEqual(bitmath.Formatter("{binary}").format(bitmath.MiB(1)), "0b0")
+            self.assertTrue(binary.called)
+
+    def test_formatter_errors(self):
+        """Bad format strings fail the same way str.format fails"""
+        with self.assertRaises(ValueError):
+            bitmath.Formatter("{value")
+        with self.assertRaises(KeyError):
+            bitmath.Formatter("{nope}").format(bitmath.KiB(1))
+        with self.assertRaises(IndexError):
+            bitmath.Formatter("{}").format(bitmath.KiB(1))
+        with self.assertRaises(KeyError):
+            bitmath.KiB(1).format("{value} {width}")
+
+    def test_instance_format_with_formatter(self):
+        """Bitmath.format accepts a Formatter"""
+        fmt = bitmath.Formatter("{value:.1f}{unit}")
+        self.assertEqual(bitmath.GiB(2).format(fmt), "2.0GiB")
+        with bitmath.format(plural=True):
+            self.assertEqual(bitmath.GiB(2).format(fmt), "2.0GiBs")
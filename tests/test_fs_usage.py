@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Tests for fs_usage() and all_mounts_usage(), filesystem capacities
+"""
+
+from . import TestCase
+import bitmath
+import mock
+import os
+
+MOUNTINFO = b"""23 28 0:22 / /proc rw,relatime - proc proc rw
+28 1 253:1 / / rw,relatime - ext4 /dev/vda1 rw
+40 28 253:2 / /mnt/my\\040disk rw,relatime shared:5 - xfs /dev/vdb rw
+41 28 0:50 / /mnt/gone rw,relatime - nfs server:/export rw
+"""
+
+
+def statvfs_result(blocks, bfree, bavail, files, ffree, frsize=4096):
+    return mock.Mock(f_blocks=blocks, f_bfree=bfree, f_bavail=bavail,
+                     f_files=files, f_ffree=ffree, f_frsize=frsize)
+
+
+def fake_statvfs(path):
+    if path == '/proc':
+        return statvfs_result(0, 0, 0, 0, 0)
+    if path == '/':
+        return statvfs_result(1000, 600, 550, 100, 40)
+    if path == '/mnt/my disk':
+        return statvfs_result(2 ** 20, 2 ** 19, 2 ** 19, 10, 10)
+    raise OSError(116, 'Stale file handle', path)
+
+
+class TestFsUsage(TestCase):
+    def setUp(self):
+        bitmath._FS_USAGE_CACHE.clear()
+        self.addCleanup(bitmath._FS_USAGE_CACHE.clear)
+
+    def test_fs_usage_real(self):
+        """fs_usage: sizes agree with os.statvfs"""
+        st = os.statvfs('.')
+        usage = bitmath.fs_usage('.', bestprefix=False)
+        self.assertEqual(usage.total, bitmath.Byte(st.f_blocks * st.f_frsize))
+        self.assertEqual(usage.inodes, st.f_files)
+        self.assertIs(type(usage.total), bitmath.Byte)
+
+    def test_fs_usage(self):
+        """fs_usage: total, used, free, available and inodes"""
+        with mock.patch('os.statvfs', side_effect=fake_statvfs):
+            usage = bitmath.fs_usage('/')
+        self.assertEqual(usage, bitmath.FsUsage(
+            bitmath.Byte(4096000), bitmath.Byte(1638400), bitmath.Byte(2457600),
+            bitmath.Byte(2252800), 100, 60, 40))
+        self.assertIs(type(usage.total), bitmath.MiB)
+        self.assertIs(type(usage.used), bitmath.MiB)
+        with mock.patch('os.statvfs', side_effect=fake_statvfs):
+            self.assertIs(type(bitmath.fs_usage('/', system=bitmath.SI).total), bitmath.MB)
+
+    def test_fs_usage_ttl(self):
+        """fs_usage: results are reused for ttl seconds"""
+        with mock.patch('os.statvfs', side_effect=fake_statvfs) as statvfs:
+            with mock.patch('time.monotonic', return_value=100.0) as monotonic:
+                first = bitmath.fs_usage('/', ttl=10)
+                self.assertEqual(bitmath.fs_usage('/', ttl=10), first)
+                self.assertEqual(statvfs.call_count, 1)
+                bitmath.fs_usage('/')
+                self.assertEqual(statvfs.call_count, 2)
+                monotonic.return_value = 110.0
+                bitmath.fs_usage('/', ttl=10)
+                self.assertEqual(statvfs.call_count, 3)
+
+    def test_fs_usage_ttl_prune_race(self):
+        """fs_usage: expired entries pruned by another thread meanwhile are fine"""
+        class RacingCache(dict):
+            def items(self):
+                snapshot = list(dict.items(self))
+                for key, (expires, _) in snapshot:
+                    if expires <= 100.0:
+                        dict.pop(self, key)
+                return snapshot
+
+        cache = RacingCache(((i, (50.0, None)) for i in range(bitmath._FS_USAGE_CACHE_PRUNE)))
+        with mock.patch('bitmath._FS_USAGE_CACHE', cache):
+            with mock.patch('os.statvfs', side_effect=fake_statvfs):
+                with mock.patch('time.monotonic', return_value=100.0):
+                    usage = bitmath.fs_usage('/', ttl=10)
+        self.assertEqual(usage.inodes, 100)
+        self.assertEqual(len(cache), 1)
+
+    def test_all_mounts_usage(self):
+        """all_mounts_usage: every real mount, by mount point"""
+        with mock.patch('bitmath.open', mock.mock_open(read_data=MOUNTINFO), create=True):
+            with mock.patch('os.statvfs', side_effect=fake_statvfs):
+                usage = bitmath.all_mounts_usage()
+                self.assertEqual(list(usage), ['/', '/mnt/my disk'])
+                self.assertEqual(usage['/mnt/my disk'].total, bitmath.GiB(4))
+                self.assertIs(type(usage['/mnt/my disk'].total), bitmath.GiB)
+                usage = bitmath.all_mounts_usage(pseudo=True, bestprefix=False)
+                self.assertEqual(list(usage), ['/proc', '/', '/mnt/my disk'])
+                self.assertEqual(usage['/proc'].total, bitmath.Byte(0))
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Tests to verify that instances are hashable and immutable
+"""
+
+from . import TestCase
+import bitmath
+import copy
+import pickle
+
+
+class TestHashing(TestCase):
+    def test_equal_instances_hash_equal(self):
+        """Equal instances of different units hash the same"""
+        self.assertEqual(hash(bitmath.KiB(1)), hash(bitmath.Byte(1024)))
+        self.assertEqual(hash(bitmath.kB(1)), hash(bitmath.Byte(1000)))
+        self.assertEqual(hash(bitmath.Byte(1)), hash(bitmath.Bit(8)))
+        self.assertEqual(hash(bitmath.MiB(0.5)), hash(bitmath.KiB(512)))
+
+    def test_instances_as_dict_keys(self):
+        """Instances can be used as dictionary keys"""
+        d = {bitmath.KiB(1): 'one kibibyte'}
+        self.assertEqual(d[bitmath.Byte(1024)], 'one kibibyte')
+        self.assertNotIn(bitmath.kB(1), d)
+
+    def test_instances_in_sets(self):
+        """Equal instances are deduplicated in a set"""
+        sizes = set([bitmath.KiB(1), bitmath.Byte(1024), bitmath.Bit(8192),
+                     bitmath.kB(1)])
+        self.assertEqual(len(sizes), 2)
+
+    def test_compare_to_other_types(self):
+        """Comparing to unrelated types doesn't raise"""
+        self.assertFalse(bitmath.KiB(1) == 'KiB(1)')
+        self.assertTrue(bitmath.KiB(1) != None)  # noqa: E711
+        with self.assertRaises(TypeError):
+            bitmath.KiB(1) < 'a string'
+
+
+class TestImmutable(TestCase):
+    def test_can_not_set_attributes(self):
+        """Attributes of an instance can not be set"""
+        kib = bitmath.KiB(1)
+        with self.assertRaises(AttributeError):
+            kib._bit_value = 42
+        with self.assertRaises(AttributeError):
+            kib.foo = 42
+        with self.assertRaises(AttributeError):
+            del kib._bit_value
+        self.assertEqual(kib, bitmath.KiB(1))
+
+    def test_pickle_round_trip(self):
+        """Instances survive pickling"""
+        for inst in (bitmath.KiB(1), bitmath.Gb(3.5), bitmath.Byte(0)):
+            unpickled = pickle.loads(pickle.dumps(inst))
+            self.assertIs(type(unpickled), type(inst))
+            self.assertEqual(unpickled, inst)
+
+    def test_copy_returns_same_instance(self):
+        """copy/deepcopy of an immutable instance is the instance"""
+        kib = bitmath.KiB(1)
+        self.assertIs(copy.copy(kib), kib)
+        self.assertIs(copy.deepcopy(kib), kib)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Tests that importing bitmath leaves the modules only some functions
+need unimported. tests/benchmarks/bench_import.py times the import.
+"""
+
+from . import TestCase
+import json
+import os
+import subprocess
+import sys
+
+TOP = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Imported by the functions which need them, never by ``import bitmath``
+LAZY = ['argparse', 'concurrent.futures', 'decimal', 'fcntl', 'fnmatch',
+        'fractions', 'heapq', 'logging', 'platform', 'progressbar',
+        'sqlite3', 'struct']
+
+
+def newly_imported(statement):
+    """The modules in LAZY which `statement` imports, run in a fresh
+interpreter"""
+    code = ("import sys, json\n"
+            "before = set(sys.modules)\n"
+            "%s\n"
+            "print(json.dumps(sorted(m for m in %r\n"
+            "                        if m in sys.modules and m not in before)))"
+            % (statement, LAZY))
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=TOP)
+    return json.loads(output.decode('utf-8'))
+
+
+class TestImportTime(TestCase):
+    def test_import_bitmath(self):
+        """import bitmath doesn't import what only some functions need"""
+        self.assertEqual(newly_imported('import bitmath'), [])
+
+    def test_import_integrations(self):
+        """importing the integrations package imports none of them"""
+        self.assertEqual(newly_imported('import bitmath.integrations'), [])
+
+    def test_cli_imports_argparse(self):
+        """the CLI still gets argparse when it needs it"""
+        self.assertIn(
+            'argparse',
+            newly_imported("import bitmath; bitmath.cli_script_main(['1'])"))
+
+    def test_integrations_lazy_names(self):
+        """the old bitmath.integrations names import on first use"""
+        import bitmath.integrations
+        from bitmath.integrations.bmargparse import BitmathType
+        self.assertIs(bitmath.integrations.BitmathType, BitmathType)
+        with self.assertRaises(AttributeError):
+            bitmath.integrations.NotAnIntegration
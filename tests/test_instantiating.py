@@ -96,6 +96,14 @@ class TestInstantiating(TestCase):
         with self.assertRaises(ValueError):
             bitmath.Byte(value=1, bytes=1, bits=1)
 
+    def test_init_internal_from_bits(self):
+        """The internal fast constructor matches the public one"""
+        fast = bitmath.KiB._from_bits_unchecked(8192)
+        slow = bitmath.KiB(bits=8192)
+        self.assertIs(type(fast), bitmath.KiB)
+        self.assertEqual(fast, slow)
+        self.assertEqual(fast.value, slow.value)
+
     ##################################################################
     # Double check we can't create rogue instances of bitmath.Bitmath
     def test_bitmath_Bitmath_cannot_be_instantiated(self):
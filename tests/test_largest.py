@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Tests for largest(), the top N largest files and directories
+"""
+
+from . import TestCase
+import bitmath
+import mock
+import os
+import shutil
+import tempfile
+
+
+class TestLargest(TestCase):
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+        self.sizes = {}
+        for i, name in enumerate(['a/one.txt', 'a/b/two.log', 'c/three.txt',
+                                  'c/four.log', 'five.txt', 'a/b/six.txt']):
+            path = os.path.join(self.base, name)
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with open(path, 'wb') as f:
+                f.write(b'x' * (1000 * (i + 1) ** 2))
+            self.sizes[os.path.realpath(path)] = 1000 * (i + 1) ** 2
+
+    def tearDown(self):
+        shutil.rmtree(self.base)
+
+    def test_largest_files(self):
+        """largest: the n largest files, largest first, in best prefix units"""
+        result = bitmath.largest(self.base, n=3)
+        expected = sorted(self.sizes.items(), key=lambda item: -item[1])[:3]
+        self.assertEqual([p for p, s in result], [p for p, s in expected])
+        self.assertEqual(result[0][1], bitmath.Byte(36000))
+        self.assertIs(type(result[0][1]), bitmath.KiB)
+        self.assertIs(type(bitmath.largest(self.base, 1, system=bitmath.SI)[0][1]),
+                      bitmath.kB)
+
+    def test_largest_files_filter(self):
+        """largest: filter applies to file names"""
+        result = bitmath.largest(self.base, filter='*.log')
+        self.assertEqual([os.path.basename(p) for p, s in result],
+                         ['four.log', 'two.log'])
+        self.assertEqual(bitmath.largest(self.base, n=0), [])
+
+    def test_largest_filter_normcase(self):
+        """largest: the filter is normcased like the names"""
+        with mock.patch('os.path.normcase', str.lower):
+            files = bitmath.largest(self.base, filter='*.LOG')
+            dirs = bitmath.largest(self.base, by='dir', filter='[AB]')
+        self.assertEqual([os.path.basename(p) for p, s in files],
+                         ['four.log', 'two.log'])
+        self.assertEqual([p for p, s in dirs],
+                         [os.path.join(self.base, 'a'), os.path.join(self.base, 'a', 'b')])
+
+    def test_largest_dirs(self):
+        """largest: the n largest directories match du"""
+        usage = bitmath.du(self.base, apparent=True)
+        expected = sorted(usage.items(), key=lambda item: -item[1])[:2]
+        self.assertEqual(bitmath.largest(self.base, n=2, by='dir'),
+                         [(p, s.best_prefix()) for p, s in expected])
+        result = bitmath.largest(self.base, by='dir', filter='[ab]')
+        self.assertEqual([p for p, s in result],
+                         [os.path.join(self.base, 'a'), os.path.join(self.base, 'a', 'b')])
+
+    def test_largest_invalid(self):
+        """largest: bad n and by raise ValueError"""
+        with self.assertRaises(ValueError):
+            bitmath.largest(self.base, n=-1)
+        with self.assertRaises(ValueError):
+            bitmath.largest(self.base, by='inode')
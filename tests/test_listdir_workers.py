@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Tests for listdir() walking the tree on a pool of threads
+"""
+
+from . import TestCase
+import bitmath
+import os
+import shutil
+import tempfile
+
+
+class TestListdirWorkers(TestCase):
+    def setUp(self):
+        # A few levels of directories, each holding files of distinct
+        # sizes, so any change in the order of results shows up
+        self.base = tempfile.mkdtemp()
+        size = 0
+        for i in range(4):
+            for j in range(3):
+                d = os.path.join(self.base, 'd%d' % i, 's%d' % j)
+                os.makedirs(d)
+                for k in range(2):
+                    size += 1
+                    with open(os.path.join(d, 'f%d.txt' % k), 'wb') as f:
+                        f.write(b'x' * size)
+            with open(os.path.join(self.base, 'd%d' % i, 'top'), 'wb') as f:
+                f.write(b'x' * i)
+
+    def tearDown(self):
+        shutil.rmtree(self.base)
+
+    def test_listdir_workers_same_order(self):
+        """listdir: workers give the same results in the same order"""
+        expected = list(bitmath.listdir(self.base))
+        self.assertEqual(len(expected), 28)
+        for workers in (1, 2, 8):
+            self.assertListEqual(
+                list(bitmath.listdir(self.base, workers=workers)), expected)
+
+    def test_listdir_workers_options(self):
+        """listdir: workers honor filter, relpath, bestprefix and followlinks"""
+        for kwargs in ({'filter': '*.txt', 'bestprefix': True},
+                       {'relpath': True, 'followlinks': True}):
+            expected = list(bitmath.listdir('./tests/listdir_symlinks/', **kwargs))
+            result = list(bitmath.listdir('./tests/listdir_symlinks/',
+                                          workers=4, **kwargs))
+            self.assertListEqual(result, expected)
+
+    def test_listdir_workers_unordered(self):
+        """listdir: unordered workers give the same results in any order"""
+        expected = sorted(bitmath.listdir(self.base))
+        result = sorted(bitmath.listdir(self.base, workers=4, ordered=False))
+        self.assertListEqual(result, expected)
+
+    def test_listdir_workers_stop_early(self):
+        """listdir: abandoning a threaded walk part way through is fine"""
+        walk = bitmath.listdir(self.base, workers=2)
+        self.assertEqual(next(walk), next(bitmath.listdir(self.base)))
+        walk.close()
+        with self.assertRaises(StopIteration):
+            next(walk)
+
+    def test_listdir_workers_broken_link(self):
+        """listdir: workers raise for broken links when following links"""
+        os.symlink('nowhere', os.path.join(self.base, 'broken'))
+        with self.assertRaises(OSError):
+            list(bitmath.listdir(self.base, followlinks=True, workers=2))
+
+    def test_listdir_workers_invalid(self):
+        """listdir: workers must be a positive integer"""
+        for workers in (0, -1, 2.5):
+            with self.assertRaises(ValueError):
+                list(bitmath.listdir(self.base, workers=workers))
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Tests for the pandas bitmath extension dtype
+"""
+
+from . import TestCase
+import bitmath
+from bitmath.integrations.bmpandas import BitmathDtype, BitmathExtensionArray
+import io
+import numpy
+import pandas
+
+
+class TestPandasDtype(TestCase):
+    def setUp(self):
+        self.sizes = pandas.Series(["1 KiB", "3 MiB", "2.5 GiB"], dtype="bitmath[MiB]")
+
+    def test_dtype_from_string(self):
+        """bitmath[UNIT] strings construct the dtype"""
+        self.assertEqual(pandas.api.types.pandas_dtype("bitmath[GiB]"),
+                         BitmathDtype(bitmath.GiB))
+        self.assertIs(BitmathDtype.construct_from_string("bitmath").unit, bitmath.Byte)
+        with self.assertRaises(TypeError):
+            BitmathDtype.construct_from_string("bitmath[furlong]")
+
+    def test_storage(self):
+        """Columns are stored as a float64 array of bits"""
+        array = self.sizes.array
+        self.assertIsInstance(array, BitmathExtensionArray)
+        self.assertEqual(array._bits.dtype, numpy.float64)
+        self.assertEqual(self.sizes[1], bitmath.MiB(3))
+        self.assertIs(type(self.sizes[1]), bitmath.MiB)
+
+    def test_reductions(self):
+        """sum/min/max/mean return bitmath instances"""
+        self.assertEqual(self.sizes.sum(), bitmath.KiB(1) + bitmath.MiB(3) + bitmath.GiB(2.5))
+        self.assertIs(type(self.sizes.sum()), bitmath.MiB)
+        self.assertEqual(self.sizes.min(), bitmath.KiB(1))
+        self.assertEqual(self.sizes.max(), bitmath.GiB(2.5))
+
+    def test_quantile(self):
+        """quantile() and describe() keep the column unit"""
+        sizes = pandas.Series(["1 MiB", "3 MiB", None], dtype="bitmath[MiB]")
+        median = sizes.quantile(0.5)
+        self.assertIs(type(median), bitmath.MiB)
+        self.assertEqual(median, bitmath.MiB(2))
+        quartiles = sizes.quantile([0.25, 0.5])
+        self.assertEqual(quartiles.dtype, BitmathDtype(bitmath.MiB))
+        self.assertEqual(quartiles.tolist(), [bitmath.MiB(1.5), bitmath.MiB(2)])
+        self.assertEqual(sizes.quantile(0.5, interpolation="lower"), bitmath.MiB(1))
+        summary = sizes.describe()
+        self.assertEqual(summary["50%"], 2.0)
+        self.assertEqual(summary["max"], 3.0)
+
+    def test_astype_unit(self):
+        """astype to another bitmath unit converts the column"""
+        gib = self.sizes.astype("bitmath[GiB]")
+        self.assertEqual(gib.dtype, BitmathDtype(bitmath.GiB))
+        self.assertEqual(gib[2], bitmath.GiB(2.5))
+        self.assertEqual(self.sizes.astype(float).tolist(), [1 / 1024.0, 3.0, 2560.0])
+
+    def test_accessor(self):
+        """.bm.best_prefix() and .bm.format() work row by row"""
+        self.assertEqual([type(x) for x in self.sizes.bm.best_prefix()],
+                         [bitmath.KiB, bitmath.MiB, bitmath.GiB])
+        self.assertEqual(self.sizes.bm.format("{value:.1f} {unit}").tolist(),
+                         ['1.0 KiB', '3.0 MiB', '2.5 GiB'])
+        self.assertEqual(self.sizes.bm.format("{value} {unit}", bestprefix=False).tolist(),
+                         ['0.0009765625 MiB', '3.0 MiB', '2560.0 MiB'])
+
+    def test_read_csv(self):
+        """read_csv parses size strings into a bitmath column"""
+        csv = io.StringIO("name,size\na,1 KiB\nb,2 MiB\na,4 MiB\nc,\nb,7\n")
+        df = pandas.read_csv(csv, dtype={"size": "bitmath[MiB]"})
+        self.assertEqual(df["size"].dtype, BitmathDtype(bitmath.MiB))
+        self.assertEqual(df["size"].isna().tolist(), [False, False, False, True, False])
+        # A unitless value is taken to be in the dtype unit
+        self.assertEqual(df["size"][4], bitmath.MiB(7))
+
+    def test_groupby_sum(self):
+        """groupby reductions stay in the bitmath dtype"""
+        df = pandas.DataFrame({
+            "name": ["a", "b", "a", "b"],
+            "size": pandas.array(["1 MiB", "2 MiB", "3 MiB", "1 GiB"], dtype="bitmath[MiB]"),
+        })
+        totals = df.groupby("name")["size"].sum()
+        self.assertEqual(totals.dtype, BitmathDtype(bitmath.MiB))
+        self.assertEqual(totals["a"], bitmath.MiB(4))
+        self.assertEqual(totals["b"], bitmath.MiB(1026))
+
+    def test_sort_and_compare(self):
+        """Sorting and comparisons use the sizes"""
+        unsorted = pandas.Series(["1 GiB", "1 KiB", "1 MiB"], dtype="bitmath")
+        self.assertEqual(unsorted.sort_values().tolist(),
+                         [bitmath.KiB(1), bitmath.MiB(1), bitmath.GiB(1)])
+        self.assertEqual((unsorted > bitmath.MiB(0.5)).tolist(), [True, False, True])
+
+    def test_arithmetic(self):
+        """Arithmetic follows the bitmath result types"""
+        doubled = self.sizes + self.sizes
+        self.assertEqual(doubled.dtype, self.sizes.dtype)
+        self.assertEqual(doubled[1], bitmath.MiB(6))
+        self.assertEqual((self.sizes * 2)[1], bitmath.MiB(6))
+        self.assertEqual((self.sizes / bitmath.MiB(1)).tolist(), [1 / 1024.0, 3.0, 2560.0])
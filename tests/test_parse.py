@@ -300,3 +300,23 @@ https://github.com/tbielawa/bitmath/issues/60
         self.assertEqual(
             _parsed3,
             expected_result3)
+
+    def test_parse_string_unusual_spacing(self):
+        """parse_string handles inputs outside the common number-unit shape"""
+        self.assertEqual(bitmath.parse_string("\t10\tMiB"), bitmath.MiB(10))
+        self.assertEqual(bitmath.parse_string("1_000 kB"), bitmath.kB(1000))
+        self.assertEqual(bitmath.parse_string("-.5Kio"), bitmath.KiB(-0.5))
+        with self.assertRaises(ValueError):
+            bitmath.parse_string("10 MiB ")
+
+    def test_parse_unsafe_matches_general_rules(self):
+        """parse_string_unsafe gives the same result for every spelling of a unit"""
+        for unit in ['k', 'K', 'kb', 'KB', 'kB', 'Kbb']:
+            self.assertEqual(bitmath.parse_string_unsafe("2" + unit), bitmath.kB(2))
+            self.assertEqual(bitmath.parse_string_unsafe("2" + unit, system=bitmath.NIST),
+                             bitmath.KiB(2))
+        for unit in ['ki', 'Ki', 'kib', 'KiB', 'kiBB']:
+            self.assertEqual(bitmath.parse_string_unsafe("2 " + unit), bitmath.KiB(2))
+        for bad in ['2 KI', '2 kIB', '2 x', '2 B', '2 iB']:
+            with self.assertRaises(ValueError):
+                bitmath.parse_string_unsafe(bad)
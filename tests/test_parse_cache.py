@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Tests for the parse cache
+"""
+
+from . import TestCase
+import bitmath
+
+
+class TestParseCache(TestCase):
+    def setUp(self):
+        bitmath.parse_cache_resize()
+
+    def tearDown(self):
+        bitmath.parse_cache_resize()
+
+    def test_cache_hits(self):
+        """Parsing the same string again is a cache hit"""
+        first = bitmath.parse_string("4.7 GiB")
+        second = bitmath.parse_string("4.7 GiB")
+        self.assertIs(first, second)
+        info = bitmath.parse_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+        self.assertEqual(info.maxsize, bitmath.PARSE_CACHE_SIZE)
+
+    def test_cache_keys(self):
+        """The parser and the unit system are part of the cache key"""
+        self.assertEqual(bitmath.parse_string("1 kB"), bitmath.kB(1))
+        self.assertEqual(bitmath.parse_string_unsafe("1 kB"), bitmath.kB(1))
+        self.assertEqual(bitmath.parse_string_unsafe("1 kB", system=bitmath.NIST), bitmath.KiB(1))
+        self.assertIs(type(bitmath.parse_string_unsafe("1 kB", system=bitmath.NIST)), bitmath.KiB)
+        self.assertEqual(bitmath.parse_cache_info().misses, 3)
+
+    def test_cached_result_immutable(self):
+        """Cached results can not be changed by callers"""
+        parsed = bitmath.parse_string("512 MiB")
+        with self.assertRaises(AttributeError):
+            parsed.bytes = 1
+        with self.assertRaises(AttributeError):
+            parsed._bit_value = 1
+        parsed += bitmath.MiB(1)
+        self.assertEqual(bitmath.parse_string("512 MiB"), bitmath.MiB(512))
+
+    def test_cache_errors_not_cached(self):
+        """Invalid strings raise every time and numbers skip the cache"""
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                bitmath.parse_string("1 furlong")
+        self.assertEqual(bitmath.parse_string_unsafe(1).bits, 8)
+        self.assertIsInstance(bitmath.parse_string_unsafe(1.0).bits, float)
+        self.assertEqual(bitmath.parse_cache_info().currsize, 0)
+
+    def test_cache_eviction(self):
+        """The least recently used strings are evicted first"""
+        bitmath.parse_cache_resize(2)
+        a = bitmath.parse_string("1 KiB")
+        bitmath.parse_string("2 KiB")
+        bitmath.parse_string("1 KiB")
+        bitmath.parse_string("3 KiB")
+        self.assertEqual(bitmath.parse_cache_info().currsize, 2)
+        self.assertIs(bitmath.parse_string("1 KiB"), a)
+        self.assertEqual(bitmath.parse_cache_info().hits, 2)
+        bitmath.parse_string("2 KiB")
+        self.assertEqual(bitmath.parse_cache_info().misses, 4)
+
+    def test_cache_clear_and_disable(self):
+        """The cache can be emptied, disabled, and resized"""
+        bitmath.parse_many(["1 KiB", "1 KiB", "2k"], strict=False)
+        self.assertEqual(bitmath.parse_cache_info().hits, 1)
+        bitmath.parse_cache_clear()
+        self.assertEqual(bitmath.parse_cache_info(), (0, 0, bitmath.PARSE_CACHE_SIZE, 0))
+        bitmath.parse_cache_resize(0)
+        self.assertEqual(bitmath.parse_many(["1 KiB", "1 KiB"]), [bitmath.KiB(1)] * 2)
+        self.assertEqual(bitmath.parse_cache_info().currsize, 0)
+        with self.assertRaises(ValueError):
+            bitmath.parse_cache_resize(-1)
+        with self.assertRaises(ValueError):
+            bitmath.parse_cache_resize(None)
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Tests for the bulk parsing functions, parse_many and iterparse
+"""
+
+from . import TestCase
+import bitmath
+import io
+
+
+class TestParseMany(TestCase):
+    def test_parse_many_strict(self):
+        """parse_many parses a list of strings with parse_string"""
+        self.assertEqual(bitmath.parse_many(["1 MiB", "2kB", "\t3 Kio"]),
+                         [bitmath.MiB(1), bitmath.kB(2), bitmath.KiB(3)])
+        with self.assertRaises(ValueError):
+            bitmath.parse_many(["1 MiB", "2k"])
+
+    def test_parse_many_unsafe(self):
+        """parse_many(strict=False) parses with parse_string_unsafe"""
+        inputs = ["4.0K", "512M", "1.5gib", "100"]
+        self.assertEqual(bitmath.parse_many(inputs, strict=False),
+                         [bitmath.kB(4), bitmath.MB(512), bitmath.GiB(1.5), bitmath.Byte(100)])
+        self.assertEqual(bitmath.parse_many(inputs, strict=False, system=bitmath.NIST),
+                         [bitmath.parse_string_unsafe(s, system=bitmath.NIST) for s in inputs])
+
+    def test_parse_many_same_as_single(self):
+        """parse_many gives exactly what the single string parsers give"""
+        inputs = ["1 MiB", "1_0 kB", "10 MiB ", "7", None, "2 Bitmath", "0.5 Yb"]
+        for strict, func in [(True, bitmath.parse_string),
+                             (False, bitmath.parse_string_unsafe)]:
+            errors = []
+            parsed = bitmath.parse_many(inputs, strict=strict, errors=errors)
+            expected = []
+            expected_errors = []
+            for index, s in enumerate(inputs):
+                try:
+                    expected.append(func(s))
+                except ValueError as e:
+                    expected_errors.append((index, s, str(e)))
+            self.assertEqual(parsed, expected)
+            self.assertEqual([type(x) for x in parsed], [type(x) for x in expected])
+            self.assertEqual([(i, s, str(e)) for (i, s, e) in errors], expected_errors)
+
+    def test_parse_many_array(self):
+        """parse_many with a unit returns a BitmathArray"""
+        from bitmath.array import BitmathArray
+        sizes = bitmath.parse_many(["1 KiB", "3 MiB", "nope"], unit='KiB', errors=[])
+        self.assertIsInstance(sizes, BitmathArray)
+        self.assertIs(sizes.unit, bitmath.KiB)
+        self.assertEqual(sizes.tolist(), [bitmath.KiB(1), bitmath.KiB(3072)])
+
+    def test_iterparse_lines(self):
+        """iterparse parses one size per line, skipping blank lines"""
+        fileobj = io.StringIO(u"1 KiB\n\n  2 MiB  \n3 GiB")
+        parsed = bitmath.iterparse(fileobj)
+        self.assertEqual(next(parsed), bitmath.KiB(1))
+        self.assertEqual(list(parsed), [bitmath.MiB(2), bitmath.GiB(3)])
+
+    def test_iterparse_field(self):
+        """iterparse can parse one field of du style output"""
+        fileobj = io.StringIO(u"4.0K\t./a\n512M\t./b\nbad\t./c\n\n1.5G\n")
+        errors = []
+        parsed = list(bitmath.iterparse(fileobj, strict=False, field=0, errors=errors))
+        self.assertEqual(parsed, [bitmath.kB(4), bitmath.MB(512), bitmath.GB(1.5)])
+        self.assertEqual([(lineno, s) for (lineno, s, e) in errors], [(3, 'bad')])
+        self.assertIsInstance(errors[0][2], ValueError)
+
+    def test_iterparse_delimited(self):
+        """iterparse with a delimiter parses every field"""
+        fileobj = io.StringIO(u"1 KiB, 2 MiB,\n3 GiB\n")
+        self.assertEqual(list(bitmath.iterparse(fileobj, delimiter=',')),
+                         [bitmath.KiB(1), bitmath.MiB(2), bitmath.GiB(3)])
+
+    def test_iterparse_missing_field(self):
+        """iterparse reports lines which don't have the requested field"""
+        with self.assertRaises(ValueError):
+            list(bitmath.iterparse(io.StringIO(u"1 KiB\n"), field=1))
+        errors = []
+        self.assertEqual(list(bitmath.iterparse(io.StringIO(u"1 KiB\n2 KiB x\n"), field=1, errors=errors)), [])
+        self.assertEqual([lineno for (lineno, s, e) in errors], [1, 2])
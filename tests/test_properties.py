@@ -56,3 +56,16 @@ class TestAttributeProperties(TestCase):
         """bitmath type's properties are read-only"""
         with self.assertRaises(AttributeError):
             self.kib.value += 42
+
+    def test_instances_have_no_dict(self):
+        """bitmath instances only store their size, no per-instance __dict__"""
+        for inst in (self.kib, bitmath.Byte(1), bitmath.Bit(1), bitmath.Yb(1)):
+            self.assertFalse(hasattr(inst, '__dict__'))
+
+    def test_unit_constants_are_class_attributes(self):
+        """Per-unit constants are shared class attributes"""
+        self.assertEqual(bitmath.KiB._unit_value, 1024)
+        self.assertEqual(bitmath.KiB._unit_bits, 8192)
+        self.assertEqual(bitmath.kb._unit_bits, 1000)
+        self.assertEqual(self.kib.base, 2)
+        self.assertEqual(self.kib.power, 10)
@@ -31,7 +31,10 @@ Test reading block device capacities
 from . import TestCase
 import bitmath
 import mock
+import os
+import shutil
 import struct
+import tempfile
 
 try:
     # Python 3.3+
@@ -133,3 +136,59 @@ class TestQueryDeviceCapacity(TestCase):
             os_name.return_value = 'nt'
             with self.assertRaises(NotImplementedError):
                 bitmath.query_device_capacity(device)
+
+
+class TestQueryAllDeviceCapacities(TestCase):
+    def setUp(self):
+        # A fake /sys/block
+        self.sysfs = tempfile.mkdtemp()
+        for name, size in (('sda', '1953525168\n'), ('cciss!c0d0', '2048\n'),
+                           ('loop0', '0\n'), ('null', None)):
+            os.mkdir(os.path.join(self.sysfs, name))
+            if size is not None:
+                with open(os.path.join(self.sysfs, name, 'size'), 'w') as f:
+                    f.write(size)
+
+    def tearDown(self):
+        shutil.rmtree(self.sysfs)
+
+    def test_query_all_device_capacities_sysfs(self):
+        """query all device capacities reads sizes from sysfs, falling back to ioctls"""
+        with mock.patch('bitmath.query_device_capacity') as query:
+            query.return_value = bitmath.Byte(5)
+            capacities = bitmath.query_all_device_capacities(self.sysfs)
+        self.assertEqual(capacities, {
+            'sda': bitmath.Byte(1953525168 * 512),
+            'cciss/c0d0': bitmath.MiB(1),
+            'loop0': bitmath.Byte(0),
+            # No size in sysfs, so opened and asked
+            'null': bitmath.Byte(5),
+        })
+        self.assertEqual(query.call_count, 1)
+        self.assertEqual(query.call_args[0][0].name, '/dev/null')
+
+    def test_query_all_device_capacities_no_sysfs(self):
+        """query all device capacities asks whole disks when there's no sysfs"""
+        def listdir(path):
+            if path == '/dev':
+                return ['disk1', 'disk0', 'disk0s1', 'null']
+            raise OSError(2, 'No such file or directory', path)
+
+        with nested(
+            mock.patch('os.listdir'),
+            mock.patch('bitmath.open', mock.mock_open(), create=True),
+            mock.patch('bitmath.query_device_capacity'),
+        ) as (os_listdir, bitmath_open, query):
+            os_listdir.side_effect = listdir
+            query.return_value = bitmath.TB(1)
+            capacities = bitmath.query_all_device_capacities()
+            self.assertEqual(capacities, {'disk0': bitmath.TB(1), 'disk1': bitmath.TB(1)})
+            self.assertEqual([c[0][0] for c in bitmath_open.call_args_list],
+                             ['/dev/disk0', '/dev/disk1'])
+
+    def test_query_all_device_capacities_non_posix_system_fails(self):
+        """query all device capacities fails on a non-posix host"""
+        with mock.patch('bitmath.os_name') as os_name:
+            os_name.return_value = 'nt'
+            with self.assertRaises(NotImplementedError):
+                bitmath.query_all_device_capacities()
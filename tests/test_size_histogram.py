@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# The MIT License (MIT)
+#
+# Copyright © 2014 Tim Bielawa <timbielawa@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation files
+# (the "Software"), to deal in the Software without restriction,
+# including without limitation the rights to use, copy, modify, merge,
+# publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so,
+# subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Tests for SizeHistogram, log bucketed counts of sizes
+"""
+
+from . import TestCase
+import bitmath
+from bitmath.array import BitmathArray
+
+
+class TestSizeHistogram(TestCase):
+    def test_histogram_nist_buckets(self):
+        """SizeHistogram: NIST buckets are powers of two"""
+        hist = bitmath.SizeHistogram()
+        hist.update([0, 1, 3, 4, 4095, 4096, bitmath.KiB(6)])
+        self.assertEqual(hist.count, 7)
+        self.assertEqual(hist.total, bitmath.Byte(0 + 1 + 3 + 4 + 4095 + 4096 + 6144))
+        buckets = hist.buckets()
+        self.assertEqual(len(buckets), 14)
+        self.assertEqual(buckets[0], (bitmath.Byte(0), bitmath.Byte(1), 1, bitmath.Byte(0)))
+        self.assertEqual(buckets[2], (bitmath.Byte(2), bitmath.Byte(4), 1, bitmath.Byte(3)))
+        self.assertEqual(buckets[3][2], 1)
+        self.assertEqual(buckets[4][2], 0)
+        self.assertEqual(buckets[-1], (bitmath.KiB(4), bitmath.KiB(8), 2, bitmath.KiB(10)))
+        self.assertIs(type(buckets[-1][0]), bitmath.KiB)
+
+    def test_histogram_si_step(self):
+        """SizeHistogram: SI buckets are powers of ten, step widens them"""
+        hist = bitmath.SizeHistogram(system=bitmath.SI, step=3)
+        hist.update([999, 1000, 999999, bitmath.MB(1)])
+        self.assertEqual([(lower, upper, count) for lower, upper, count, total in hist.buckets()],
+                         [(bitmath.Byte(1), bitmath.kB(1), 1),
+                          (bitmath.kB(1), bitmath.MB(1), 2),
+                          (bitmath.MB(1), bitmath.GB(1), 1)])
+
+    def test_histogram_listdir(self):
+        """SizeHistogram: listdir results can be counted directly"""
+        hist = bitmath.SizeHistogram()
+        hist.update(bitmath.listdir('./tests/listdir_nosymlinks'))
+        self.assertEqual(hist.count, 2)
+        self.assertEqual(hist.total, bitmath.Byte(1034))
+
+    def test_histogram_array(self):
+        """SizeHistogram: a BitmathArray counts the same as its elements"""
+        sizes = [0, 5, 17, 1023, 1024, 2 ** 40, 123456789]
+        expected = bitmath.SizeHistogram(step=2)
+        expected.update(sizes)
+        for array in (BitmathArray.from_bytes(sizes),
+                      BitmathArray.from_bytes([s + 0.5 for s in sizes])):
+            hist = bitmath.SizeHistogram(step=2)
+            hist.update(array)
+            self.assertEqual(hist.buckets(), expected.buckets())
+
+    def test_histogram_array_huge(self):
+        """SizeHistogram: huge BitmathArray sizes count like their elements"""
+        for sizes in ([2 ** 61], [1, 2 ** 60], [2 ** 70, 5]):
+            expected = bitmath.SizeHistogram(step=10)
+            expected.update(sizes)
+            hist = bitmath.SizeHistogram(step=10)
+            hist.update(BitmathArray.from_bytes(sizes))
+            self.assertEqual(hist.buckets(), expected.buckets())
+
+    def test_decimal_digits(self):
+        """SizeHistogram: SI digit counts are right for very big sizes"""
+        self.assertEqual(bitmath._decimal_digits(0), 0)
+        for bits in (1, 64, 681, 877, 1166, 4000):
+            for n in (2 ** bits - 1, 2 ** (bits - 1), 10 ** (bits // 4)):
+                self.assertEqual(bitmath._decimal_digits(n), len(str(n)))
+
+    def test_histogram_merge(self):
+        """SizeHistogram: merging adds up counts"""
+        first = bitmath.SizeHistogram()
+        first.update([1, 10, 100])
+        second = bitmath.SizeHistogram()
+        second.update([10, 1000])
+        first.merge(second)
+        combined = bitmath.SizeHistogram()
+        combined.update([1, 10, 100, 10, 1000])
+        self.assertEqual(first.buckets(), combined.buckets())
+        with self.assertRaises(ValueError):
+            first.merge(bitmath.SizeHistogram(system=bitmath.SI))
+
+    def test_histogram_format(self):
+        """SizeHistogram: printing uses the format string"""
+        hist = bitmath.SizeHistogram()
+        hist.update([1024, 1536])
+        self.assertEqual(str(hist), "[1.0 KiB, 2.0 KiB)  2  2.5 KiB")
+        with bitmath.format(fmt_str="{value:.0f}{unit}"):
+            self.assertEqual(str(hist), "[1KiB, 2KiB)  2  2KiB")
+        self.assertEqual(str(bitmath.SizeHistogram()), "")
+
+    def test_histogram_invalid(self):
+        """SizeHistogram: bad parameters and negative sizes raise ValueError"""
+        with self.assertRaises(ValueError):
+            bitmath.SizeHistogram(system=3)
+        with self.assertRaises(ValueError):
+            bitmath.SizeHistogram(step=0)
+        with self.assertRaises(ValueError):
+            bitmath.SizeHistogram().add(-1)
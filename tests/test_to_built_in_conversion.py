@@ -25,16 +25,11 @@
 
 
 """
-Test to verify the int/float/long conversions work correctly
+Test to verify the int/float conversions work correctly
 """
 
 from . import TestCase
 import bitmath
-import sys
-
-# Python 3.x compat
-if sys.version > '3':
-    long = int
 
 
 class TestToBuiltInConversion(TestCase):
@@ -48,8 +43,3 @@ class TestToBuiltInConversion(TestCase):
         """float(bitmath) returns a float"""
         gib = bitmath.GiB(1337.8)
         self.assertIs(type(float(gib)), float)
-
-    def test_to_long(self):
-        """long(bitmath) returns a long"""
-        gib = bitmath.GiB(1337.8)
-        self.assertIs(type(long(gib)), long)